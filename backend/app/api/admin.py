@@ -3,18 +3,35 @@
 
 admin ロールのみアクセス可能
 """
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlmodel import Session, select
+from sqlalchemy import exists, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload, raiseload
 from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, EmailStr
 from app.core.database import get_session
 from app.core.security import get_password_hash
 from app.models.user import User, Department
 from app.models.business_unit import BusinessUnit, BusinessUnitType
 from app.models.tenant import Tenant
-from app.api.deps import get_current_user, require_admin
+from app.api.deps import require_admin
+from app.repositories.organization_repository import (
+    get_department_cached,
+    get_business_unit_cached,
+    invalidate_organization_cache,
+)
 
-router = APIRouter()
+# レスポンスはorjsonでシリアライズする
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# 指定可能なロール（表示順を保つためタプルから生成）
+_ROLE_CHOICES = ("staff", "manager", "head", "admin")
+_ALLOWED_ROLES = frozenset(_ROLE_CHOICES)
+_ALLOWED_ROLES_STR = ", ".join(_ROLE_CHOICES)
 
 
 # リクエスト/レスポンスモデル
@@ -50,10 +67,9 @@ class UserResponse(BaseModel):
     tenant_id: Optional[int] = None
     role: str
     is_active: bool
-    created_at: str
+    created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BusinessUnitResponse(BaseModel):
@@ -65,8 +81,7 @@ class BusinessUnitResponse(BaseModel):
     description: Optional[str] = None
     tenant_id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DepartmentResponse(BaseModel):
@@ -75,8 +90,41 @@ class DepartmentResponse(BaseModel):
     name: str
     code: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+def _user_payload(
+    user: User,
+    department: Optional[Department],
+    business_unit: Optional[BusinessUnit],
+) -> dict:
+    """UserResponse形式のレスポンスdictを構築"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "department_id": user.department_id,
+        "department_name": department.name if department else None,
+        "department_code": department.code if department else None,
+        "business_unit_id": user.business_unit_id,
+        "business_unit_name": business_unit.name if business_unit else None,
+        "tenant_id": user.tenant_id,
+        "role": user.role,
+        "is_active": user.is_active,
+        "created_at": user.created_at,  # orjson がISO 8601形式に変換する
+    }
+
+
+def _business_unit_payload(business_unit: BusinessUnit) -> dict:
+    """BusinessUnitResponse形式のレスポンスdictを構築"""
+    return {
+        "id": business_unit.id,
+        "name": business_unit.name,
+        "code": business_unit.code,
+        "type": business_unit.type,  # str Enum のため orjson が値の文字列に変換する
+        "description": business_unit.description,
+        "tenant_id": business_unit.tenant_id,
+    }
 
 
 @router.get("/users", response_model=List[UserResponse])
@@ -95,8 +143,19 @@ async def list_users(
     - role: ロール（staff, manager, head, admin）
     - is_active: 有効/無効
     """
-    statement = select(User)
+    # 部門・事業部門はselectinloadでまとめて取得（ユーザーごとのN+1クエリを避ける）
+    statement = select(User).options(
+        selectinload(User.department),
+        selectinload(User.business_unit),
+        raiseload("*"),
+    )
     
+    # テナントで絞り込み（tenant_id 未設定の既存ユーザーも含める）
+    if current_user.tenant_id:
+        statement = statement.where(
+            or_(User.tenant_id == current_user.tenant_id, User.tenant_id.is_(None))
+        )
+
     # 絞り込み条件を追加
     if department_id is not None:
         statement = statement.where(User.department_id == department_id)
@@ -107,29 +166,9 @@ async def list_users(
     
     users = session.exec(statement).all()
 
-    # 部門情報と事業部門情報を取得してレスポンスに含める
-    result = []
-    for user in users:
-        department = session.get(Department, user.department_id)
-        business_unit = None
-        if user.business_unit_id:
-            business_unit = session.get(BusinessUnit, user.business_unit_id)
-        result.append(UserResponse(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            department_id=user.department_id,
-            department_name=department.name if department else None,
-            department_code=department.code if department else None,
-            business_unit_id=user.business_unit_id,
-            business_unit_name=business_unit.name if business_unit else None,
-            tenant_id=user.tenant_id,
-            role=user.role,
-            is_active=user.is_active,
-            created_at=user.created_at.isoformat() if user.created_at else ""
-        ))
-
-    return result
+    result = [_user_payload(user, user.department, user.business_unit) for user in users]
+
+    return ORJSONResponse(result)
 
 
 @router.get("/departments", response_model=List[DepartmentResponse])
@@ -142,7 +181,9 @@ async def list_departments(
     """
     statement = select(Department)
     departments = session.exec(statement).all()
-    return departments
+    return ORJSONResponse([
+        {"id": d.id, "name": d.name, "code": d.code} for d in departments
+    ])
 
 
 @router.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -157,24 +198,21 @@ async def create_user(
     初期パスワードは別途安全な方法で共有してください。
     """
     # ロールのバリデーション
-    allowed_roles = ["staff", "manager", "head", "admin"]
-    if user_data.role not in allowed_roles:
+    if user_data.role not in _ALLOWED_ROLES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"ロールは {', '.join(allowed_roles)} のいずれかを指定してください"
+            detail=f"ロールは {_ALLOWED_ROLES_STR} のいずれかを指定してください"
         )
     
-    # 既存ユーザーをチェック
-    statement = select(User).where(User.email == user_data.email)
-    existing_user = session.exec(statement).first()
-    if existing_user:
+    # 既存ユーザーをチェック（行を取得せずEXISTSで判定）
+    if session.scalar(select(exists().where(User.email == user_data.email))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="このメールアドレスは既に登録されています"
         )
     
     # 部門の存在確認
-    department = session.get(Department, user_data.department_id)
+    department = get_department_cached(session, user_data.department_id)
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -185,7 +223,7 @@ async def create_user(
     business_unit = None
     tenant_id = None
     if user_data.business_unit_id:
-        business_unit = session.get(BusinessUnit, user_data.business_unit_id)
+        business_unit = get_business_unit_cached(session, user_data.business_unit_id)
         if not business_unit:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -193,8 +231,8 @@ async def create_user(
             )
         tenant_id = business_unit.tenant_id
 
-    # パスワードをハッシュ化
-    hashed_password = get_password_hash(user_data.password)
+    # パスワードをハッシュ化（bcryptはCPUを占有するため、イベントループを塞がないようスレッドで実行）
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
 
     # ユーザーを作成
     user = User(
@@ -209,21 +247,10 @@ async def create_user(
     )
     session.add(user)
     session.commit()
-    session.refresh(user)
-
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        full_name=user.full_name,
-        department_id=user.department_id,
-        department_name=department.name if department else None,
-        department_code=department.code if department else None,
-        business_unit_id=user.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        tenant_id=user.tenant_id,
-        role=user.role,
-        is_active=user.is_active,
-        created_at=user.created_at.isoformat() if user.created_at else ""
+
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content=_user_payload(user, department, business_unit)
     )
 
 
@@ -250,35 +277,43 @@ async def update_user(
             detail="ユーザーが見つかりません"
         )
     
-    # 更新可能な項目を更新
-    if user_data.full_name is not None:
-        user.full_name = user_data.full_name
+    # 変更を加える前にすべての入力を検証する
+    # （検証エラー時に途中まで変更されたユーザーがセッションに残らないようにし、
+    #   更新はリクエストのトランザクション内で1回のコミットにまとめる）
+    if user_data.role is not None and user_data.role not in _ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ロールは {_ALLOWED_ROLES_STR} のいずれかを指定してください"
+        )
     if user_data.department_id is not None:
         # 部門の存在確認
-        department = session.get(Department, user_data.department_id)
+        department = get_department_cached(session, user_data.department_id)
         if not department:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="指定された部門が見つかりません"
             )
-        user.department_id = user_data.department_id
-    if user_data.role is not None:
-        # ロールのバリデーション
-        allowed_roles = ["staff", "manager", "head", "admin"]
-        if user_data.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"ロールは {', '.join(allowed_roles)} のいずれかを指定してください"
-            )
-        user.role = user_data.role
+    else:
+        department = get_department_cached(session, user.department_id)
     if user_data.business_unit_id is not None:
         # 事業部門の存在確認
-        business_unit = session.get(BusinessUnit, user_data.business_unit_id)
+        business_unit = get_business_unit_cached(session, user_data.business_unit_id)
         if not business_unit:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="指定された事業部門が見つかりません"
             )
+    else:
+        business_unit = get_business_unit_cached(session, user.business_unit_id)
+
+    # 更新可能な項目を更新
+    if user_data.full_name is not None:
+        user.full_name = user_data.full_name
+    if user_data.department_id is not None:
+        user.department_id = user_data.department_id
+    if user_data.role is not None:
+        user.role = user_data.role
+    if user_data.business_unit_id is not None:
         user.business_unit_id = user_data.business_unit_id
         user.tenant_id = business_unit.tenant_id
     if user_data.is_active is not None:
@@ -286,30 +321,8 @@ async def update_user(
 
     session.add(user)
     session.commit()
-    session.refresh(user)
 
-    # 部門情報を取得
-    department = session.get(Department, user.department_id)
-
-    # 事業部門情報を取得
-    business_unit = None
-    if user.business_unit_id:
-        business_unit = session.get(BusinessUnit, user.business_unit_id)
-
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        full_name=user.full_name,
-        department_id=user.department_id,
-        department_name=department.name if department else None,
-        department_code=department.code if department else None,
-        business_unit_id=user.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        tenant_id=user.tenant_id,
-        role=user.role,
-        is_active=user.is_active,
-        created_at=user.created_at.isoformat() if user.created_at else ""
-    )
+    return ORJSONResponse(_user_payload(user, department, business_unit))
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
@@ -328,28 +341,11 @@ async def get_user(
             detail="ユーザーが見つかりません"
         )
 
-    # 部門情報を取得
-    department = session.get(Department, user.department_id)
+    # 部門・事業部門情報を取得（キャッシュ経由）
+    department = get_department_cached(session, user.department_id)
+    business_unit = get_business_unit_cached(session, user.business_unit_id)
 
-    # 事業部門情報を取得
-    business_unit = None
-    if user.business_unit_id:
-        business_unit = session.get(BusinessUnit, user.business_unit_id)
-
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        full_name=user.full_name,
-        department_id=user.department_id,
-        department_name=department.name if department else None,
-        department_code=department.code if department else None,
-        business_unit_id=user.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        tenant_id=user.tenant_id,
-        role=user.role,
-        is_active=user.is_active,
-        created_at=user.created_at.isoformat() if user.created_at else ""
-    )
+    return ORJSONResponse(_user_payload(user, department, business_unit))
 
 
 @router.get("/business-units", response_model=List[BusinessUnitResponse])
@@ -364,7 +360,7 @@ async def list_business_units(
     if current_user.tenant_id:
         statement = statement.where(BusinessUnit.tenant_id == current_user.tenant_id)
     business_units = session.exec(statement).all()
-    return business_units
+    return ORJSONResponse([_business_unit_payload(bu) for bu in business_units])
 
 
 @router.post("/init-business-units", response_model=List[BusinessUnitResponse])
@@ -384,8 +380,7 @@ async def init_business_units(
     if not tenant:
         tenant = Tenant(name="mikamo", display_name="株式会社ミカモ")
         session.add(tenant)
-        session.commit()
-        session.refresh(tenant)
+        session.flush()
 
     # 5つの事業部門の定義
     business_units_data = [
@@ -421,38 +416,38 @@ async def init_business_units(
         },
     ]
 
-    created_units = []
-    for bu_data in business_units_data:
-        # 既存の事業部門を確認
-        statement = select(BusinessUnit).where(
-            BusinessUnit.code == bu_data["code"],
-            BusinessUnit.tenant_id == tenant.id
-        )
-        existing = session.exec(statement).first()
-
-        if not existing:
-            business_unit = BusinessUnit(
-                tenant_id=tenant.id,
-                name=bu_data["name"],
-                code=bu_data["code"],
-                type=bu_data["type"],
-                description=bu_data["description"]
-            )
-            session.add(business_unit)
-            session.commit()
-            session.refresh(business_unit)
-            created_units.append(business_unit)
-        else:
-            # 既存の事業部門を更新
-            existing.name = bu_data["name"]
-            existing.type = bu_data["type"]
-            existing.description = bu_data["description"]
-            session.add(existing)
-            session.commit()
-            session.refresh(existing)
-            created_units.append(existing)
-
-    return created_units
+    # 1回のUPSERT（INSERT ... ON CONFLICT DO UPDATE）で作成・更新し、1トランザクションでコミット
+    now = datetime.utcnow()
+    stmt = pg_insert(BusinessUnit).values([
+        {
+            "tenant_id": tenant.id,
+            "name": bu_data["name"],
+            "code": bu_data["code"],
+            "type": bu_data["type"],
+            "description": bu_data["description"],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for bu_data in business_units_data
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BusinessUnit.code],
+        set_={
+            "name": stmt.excluded.name,
+            "type": stmt.excluded.type,
+            "description": stmt.excluded.description,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        # 他テナントの同一コードは上書きしない
+        where=BusinessUnit.tenant_id == stmt.excluded.tenant_id,
+    ).returning(BusinessUnit)
+    business_units = session.scalars(
+        stmt, execution_options={"populate_existing": True}
+    ).all()
+    session.commit()
+    invalidate_organization_cache()
+
+    return ORJSONResponse([_business_unit_payload(bu) for bu in business_units])
 
 
 @router.patch("/users/{user_id}/business-unit", response_model=UserResponse)
@@ -473,7 +468,7 @@ async def update_user_business_unit(
         )
 
     # 事業部門の存在確認
-    business_unit = session.get(BusinessUnit, business_unit_id)
+    business_unit = get_business_unit_cached(session, business_unit_id)
     if not business_unit:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -485,23 +480,9 @@ async def update_user_business_unit(
     user.tenant_id = business_unit.tenant_id
     session.add(user)
     session.commit()
-    session.refresh(user)
 
     # 部門情報を取得
-    department = session.get(Department, user.department_id)
-
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        full_name=user.full_name,
-        department_id=user.department_id,
-        department_name=department.name if department else None,
-        department_code=department.code if department else None,
-        business_unit_id=user.business_unit_id,
-        business_unit_name=business_unit.name,
-        tenant_id=user.tenant_id,
-        role=user.role,
-        is_active=user.is_active,
-        created_at=user.created_at.isoformat() if user.created_at else ""
-    )
+    department = get_department_cached(session, user.department_id)
+
+    return ORJSONResponse(_user_payload(user, department, business_unit))
 
@@ -4,17 +4,28 @@ AIチャットAPI（v2: ナレッジ連携・会話履歴対応）
 既存のエンドポイントは後方互換性のため残しつつ、
 新しい会話履歴管理機能を追加
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, or_
-from typing import List, Optional
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import exists, false
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select, or_, and_, func
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
-from app.core.database import get_session
+from app.core.config import settings
+from app.core.database import get_session, engine
 from app.models.ai_chat_log import AIChatLog
 from app.models.user import User, Department
+from app.models.daily_log import DailyLog
 from app.models.conversation import Conversation, Message
 from app.models.business_unit import BusinessUnit
+from app.models.tenant import Tenant, TenantSettings
 from app.api.deps import get_current_user, get_current_user_with_department
-from app.services.ai_service import AIService  # 既存（後方互換性）
+from app.services.ai_service import AIService, get_department_suggestions  # 既存（後方互換性）
 from app.services.ai_service_v2 import AIServiceV2  # 新規（ナレッジ連携対応）
 from app.repositories.daily_log_repository import (
     get_recent_daily_logs_by_department,
@@ -22,12 +33,15 @@ from app.repositories.daily_log_repository import (
     get_today_daily_log
 )
 from app.repositories.knowledge_repository import get_knowledge_context
-from pydantic import BaseModel
+from app.services.ai.answer_cache import get_cached_answer, cache_answer
+from pydantic import BaseModel, ConfigDict
 import structlog
 
 logger = structlog.get_logger()
 
-router = APIRouter()
+# DBアクセスのみのハンドラーは def で定義し、FastAPIのスレッドプールで実行させる
+# AI呼び出し（await）を含むハンドラーは async def のまま、同期DB処理を run_in_threadpool で実行する
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # 既存のリクエスト/レスポンスモデル（後方互換性）
@@ -42,8 +56,7 @@ class AIChatResponse(BaseModel):
     answer: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # 新しいリクエスト/レスポンスモデル（v2）
@@ -61,8 +74,7 @@ class AIChatResponseV2(BaseModel):
     reply: str  # AIからの応答
     message_id: int  # 作成されたメッセージID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ConversationResponse(BaseModel):
@@ -75,8 +87,7 @@ class ConversationResponse(BaseModel):
     updated_at: str
     message_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MessageResponse(BaseModel):
@@ -86,8 +97,291 @@ class MessageResponse(BaseModel):
     content: str
     created_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+@dataclass
+class ChatContext:
+    """AIチャットの実行コンテキスト（テナント・事業部門・部署・テナント設定）"""
+    tenant_id: Optional[int]
+    business_unit_id: Optional[int]
+    business_unit: Optional[BusinessUnit]
+    department: Optional[Department]  # 後方互換性: 旧Department経由で解決した場合のみ
+    department_for_logs: Optional[Department]  # 日報コンテキスト用の部署
+    tenant_settings: Optional[TenantSettings]
+
+
+def _resolve_chat_context(
+    session: Session,
+    current_user: User,
+    requested_business_unit_id: Optional[int],
+) -> ChatContext:
+    """
+    チャットに必要なテナント・事業部門・部署・テナント設定を1回のクエリで解決
+
+    事業部門の決定ルール:
+    1. リクエストで指定された事業部門ID
+    2. ユーザーの所属事業部門
+    3. ユーザーの所属Department（後方互換性）のcodeと一致する事業部門
+
+    1, 2 のIDに該当する事業部門がない場合は、同じIDのDepartmentとして扱う（後方互換性）。
+    どちらも存在しない場合は404を返す。
+    """
+    business_unit_id = requested_business_unit_id or current_user.business_unit_id
+
+    user_dept = aliased(Department)
+    bu_dept = aliased(Department)
+    legacy_dept = aliased(Department)
+
+    if business_unit_id:
+        bu_condition = BusinessUnit.id == business_unit_id
+        legacy_condition = legacy_dept.id == business_unit_id
+    else:
+        bu_condition = BusinessUnit.code == user_dept.code
+        legacy_condition = false()
+
+    statement = (
+        select(BusinessUnit, user_dept, bu_dept, legacy_dept, Tenant.id, TenantSettings)
+        .select_from(User)
+        .outerjoin(user_dept, user_dept.id == User.department_id)
+        .outerjoin(BusinessUnit, bu_condition)
+        .outerjoin(bu_dept, bu_dept.code == BusinessUnit.code)
+        .outerjoin(legacy_dept, legacy_condition)
+        .outerjoin(
+            Tenant,
+            or_(
+                Tenant.id == User.tenant_id,
+                and_(User.tenant_id.is_(None), Tenant.name == "mikamo"),
+            ),
+        )
+        .outerjoin(TenantSettings, TenantSettings.tenant_id == Tenant.id)
+        .where(User.id == current_user.id)
+    )
+    row = session.exec(statement).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="ユーザーが見つかりません"
+        )
+    (
+        business_unit,
+        user_department,
+        business_unit_department,
+        legacy_department,
+        tenant_id,
+        tenant_settings,
+    ) = row
+
+    department = None
+    if business_unit_id:
+        if not business_unit:
+            # 後方互換性のため、Departmentもチェック
+            department = legacy_department
+            if not department:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="事業部門が見つかりません"
+                )
+    else:
+        # 未指定かつ所属事業部門もない場合は、所属DepartmentのcodeからBusinessUnitを検索
+        department = user_department
+        business_unit_id = business_unit.id if business_unit else None
+
+    return ChatContext(
+        tenant_id=tenant_id,
+        business_unit_id=business_unit_id,
+        business_unit=business_unit,
+        department=department,
+        department_for_logs=department or business_unit_department,
+        tenant_settings=tenant_settings,
+    )
+
+
+def _prepare_conversation(
+    session: Session,
+    current_user: User,
+    chat_data: AIChatRequestV2,
+) -> tuple[ChatContext, Conversation]:
+    """チャットコンテキストを解決し、会話を取得または作成"""
+    context = _resolve_chat_context(session, current_user, chat_data.business_unit_id)
+    if not context.tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="テナントが見つかりません"
+        )
+
+    if chat_data.conversation_id:
+        conversation = session.get(Conversation, chat_data.conversation_id)
+        if not conversation or conversation.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="会話が見つかりません"
+            )
+    else:
+        # 新規会話を作成
+        conversation = Conversation(
+            tenant_id=context.tenant_id,
+            user_id=current_user.id,
+            business_unit_id=context.business_unit.id if context.business_unit else None,
+            title=chat_data.message[:50]  # 最初の50文字をタイトルに
+        )
+        session.add(conversation)
+        # IDだけ確定させ、コミットはリクエストの最後にまとめて行う
+        session.flush()
+    return context, conversation
+
+
+def _with_own_session(func, *args, **kwargs):
+    """独立したセッションで処理を実行（レスポンスのストリーミング中など、リクエストのセッションを使えない場合用）"""
+    with Session(engine, expire_on_commit=False) as own_session:
+        return func(own_session, *args, **kwargs)
+
+
+def _load_conversation_history(session: Session, conversation_id: int) -> List[dict]:
+    """直近の会話履歴（AI_CHAT_HISTORY_LIMIT件まで）を時系列順にAI Client用の形式で取得"""
+    statement = select(Message).where(
+        Message.conversation_id == conversation_id
+    ).order_by(Message.created_at.desc()).limit(settings.AI_CHAT_HISTORY_LIMIT)
+    recent_messages = session.exec(statement).all()
+    return [
+        {"role": msg.role, "content": msg.content}
+        for msg in reversed(recent_messages)
+    ]
+
+
+def _load_daily_log_context(
+    session: Session,
+    department: Optional[Department],
+    user_id: int,
+) -> tuple[List[DailyLog], dict, Optional[DailyLog]]:
+    """日報コンテキスト（直近ログ・サマリー・今日のログ）を取得"""
+    if not department:
+        return [], {}, None
+    recent_logs = get_recent_daily_logs_by_department(session, department.id, days=14)
+    summary = get_daily_logs_summary_by_department(session, department.id, days=14)
+    today_log = get_today_daily_log(session, user_id)
+    return recent_logs, summary, today_log
+
+
+def _save_chat_turn(
+    session: Session,
+    *,
+    conversation: Conversation,
+    question: str,
+    answer: str,
+) -> Message:
+    """
+    ユーザー/AIのメッセージを保存してコミット
+
+    Returns:
+        保存したAIのメッセージ
+    """
+    session.add(Message(
+        conversation_id=conversation.id,
+        role="user",
+        content=question
+    ))
+    assistant_message = Message(
+        conversation_id=conversation.id,
+        role="assistant",
+        content=answer
+    )
+    session.add(assistant_message)
+
+    # 会話の更新日時を更新
+    conversation.updated_at = datetime.utcnow()
+
+    # 会話・メッセージ・利用ログを1回のコミットで保存
+    session.commit()
+    return assistant_message
+
+
+def _create_issue_insight_from_reply(
+    *,
+    tenant_id: int,
+    business_unit_id: Optional[int],
+    user_id: int,
+    conversation_id: int,
+    question: str,
+    answer: str,
+) -> None:
+    """
+    AIレスポンスからIssue/Insightを抽出・作成（バックグラウンドタスク）
+
+    レスポンス返却後に実行されるため、リクエストのセッションとは別のセッションを使う。
+    失敗してもチャット自体には影響させず、ログに記録するのみ。
+    """
+    from app.services.issue_insight_extractor import extract_issue_insight_from_ai_response
+    from app.models.issue import Issue, IssueStatus
+    from app.models.insight import Insight
+
+    extracted = extract_issue_insight_from_ai_response(answer, question)
+    if not extracted.get("issue") and not (
+        extracted.get("insight") and extracted["insight"]["score"] >= 60
+    ):
+        return
+
+    try:
+        with Session(engine, expire_on_commit=False) as session:
+            # Issueを作成（重要度が高い場合のみ）
+            if extracted.get("issue"):
+                issue_data = extracted["issue"]
+                # 既に同じようなIssueが存在しないかチェック（簡易版）
+                # 部分一致検索は pg_trgm のGINインデックス（ix_issue_*_trgm）で高速化される
+                # 行を取得せずEXISTSで判定する
+                if business_unit_id:
+                    same_business_unit = Issue.business_unit_id == business_unit_id
+                else:
+                    same_business_unit = Issue.business_unit_id.is_(None)
+                issue_exists = session.scalar(
+                    select(exists().where(
+                        Issue.tenant_id == tenant_id,
+                        same_business_unit,
+                        or_(
+                            Issue.title.contains(issue_data["title"][:50]),
+                            Issue.description.contains(issue_data["description"][:100])
+                        )
+                    ))
+                )
+
+                if not issue_exists:
+                    issue = Issue(
+                        tenant_id=tenant_id,
+                        business_unit_id=business_unit_id,
+                        title=issue_data["title"],
+                        description=issue_data["description"],
+                        status=IssueStatus.OPEN,
+                        topic=issue_data["topic"],
+                        created_by_user_id=user_id,
+                        conversation_id=conversation_id
+                    )
+                    session.add(issue)
+                    session.flush()
+                    logger.info("Issue created from AI response", issue_id=issue.id, conversation_id=conversation_id)
+
+            # Insightを作成（重要度スコアが60以上の場合のみ）
+            if extracted.get("insight") and extracted["insight"]["score"] >= 60:
+                insight_data = extracted["insight"]
+                insight = Insight(
+                    tenant_id=tenant_id,
+                    business_unit_id=business_unit_id,
+                    title=insight_data["title"],
+                    content=insight_data["content"],
+                    type=insight_data["type"],
+                    score=insight_data["score"],
+                    created_by=None  # AIが作成
+                )
+                session.add(insight)
+                session.flush()
+                logger.info("Insight created from AI response", insight_id=insight.id, score=insight.score)
+
+            session.commit()
+    except Exception as e:
+        logger.error(
+            "Failed to create issue/insight from AI response",
+            error=str(e),
+            conversation_id=conversation_id,
+        )
 
 
 # 既存のエンドポイント（後方互換性のため残す）
@@ -100,14 +394,10 @@ async def create_ai_chat(
     """AI相談ログを作成（v0.2: OpenAI API統合、コンテキスト付き回答）"""
     current_user, department = user_dept
     
-    # コンテキストデータを取得
-    recent_logs = get_recent_daily_logs_by_department(
-        session, department.id, days=14
-    )
-    summary = get_daily_logs_summary_by_department(
-        session, department.id, days=14
+    # コンテキストデータを取得（同期DB処理はイベントループを塞がないようスレッドプールで実行する）
+    recent_logs, summary, today_log = await run_in_threadpool(
+        _load_daily_log_context, session, department, current_user.id
     )
-    today_log = get_today_daily_log(session, current_user.id)
     
     # AIサービスで回答を生成
     ai_service = AIService()
@@ -126,15 +416,210 @@ async def create_ai_chat(
         answer=answer
     )
     session.add(chat_log)
-    session.commit()
-    session.refresh(chat_log)
+    await run_in_threadpool(session.commit)
     return chat_log
 
 
+@dataclass
+class ChatTurn:
+    """AIチャット1往復分の準備結果（コンテキスト・会話・AIに渡す材料）"""
+    context: ChatContext
+    conversation: Conversation
+    messages: List[dict]
+    knowledge_context: Optional[str]
+    recent_logs: List[DailyLog]
+    summary: dict
+    today_log: Optional[DailyLog]
+    use_staff_qa: bool
+    use_answer_cache: bool
+    cached_answer: Optional[str]
+
+    @property
+    def record_business_unit_id(self) -> Optional[int]:
+        """Issue/Insight・利用ログに記録する事業部門ID"""
+        business_unit = self.context.business_unit
+        return business_unit.id if business_unit else None
+
+
+def _load_chat_turn_context(
+    session: Session,
+    current_user: User,
+    chat_data: AIChatRequestV2,
+) -> tuple[
+    ChatContext,
+    Conversation,
+    List[dict],
+    Optional[str],
+    tuple[List[DailyLog], dict, Optional[DailyLog]],
+]:
+    """
+    会話の取得・作成と、会話履歴・ナレッジ・日報コンテキストの取得をリクエストのセッションで順に行う
+
+    最後にコミットして接続をプールに返し、AI呼び出しの間は接続・行ロックを保持しない
+    （新規会話はこの時点で確定する。AI呼び出しが失敗した場合も会話は残る）。
+    """
+    context, conversation = _prepare_conversation(session, current_user, chat_data)
+    messages = (
+        _load_conversation_history(session, conversation.id)
+        if chat_data.conversation_id
+        else []
+    )
+    knowledge_context = get_knowledge_context(
+        session,
+        query=chat_data.message,
+        business_unit_id=context.business_unit_id,
+        limit=3
+    )
+    daily_log_context = _load_daily_log_context(
+        session, context.department_for_logs, current_user.id
+    )
+    session.commit()
+    return context, conversation, messages, knowledge_context, daily_log_context
+
+
+async def _prepare_chat_turn(
+    session: Session,
+    current_user: User,
+    chat_data: AIChatRequestV2,
+) -> ChatTurn:
+    """
+    会話の取得・作成とAIに渡すコンテキストの収集、モード判定、回答キャッシュの確認を行う
+    """
+    # 同期DB処理はイベントループを塞がないようスレッドプールで実行する
+    # 1リクエストで使う接続を1本に抑えるため、読み取りは並列にせずリクエストのセッションで順に行う
+    (
+        context,
+        conversation,
+        messages,
+        knowledge_context,
+        (recent_logs, summary, today_log),
+    ) = await run_in_threadpool(_load_chat_turn_context, session, current_user, chat_data)
+
+    # ユーザーメッセージを追加
+    messages.append({
+        "role": "user",
+        "content": chat_data.message
+    })
+
+    # スタッフQAモードかどうかを判定
+    use_staff_qa = False
+    if chat_data.mode == "staff_qa":
+        use_staff_qa = True
+    elif current_user.role in ["staff", "manager"]:
+        # スタッフ・マネージャーの場合はデフォルトでスタッフQAモード
+        use_staff_qa = True
+
+    turn = ChatTurn(
+        context=context,
+        conversation=conversation,
+        messages=messages,
+        knowledge_context=knowledge_context,
+        recent_logs=recent_logs,
+        summary=summary,
+        today_log=today_log,
+        use_staff_qa=use_staff_qa,
+        # スタッフQAモードの新規会話は、同じ質問への回答キャッシュを先に確認する
+        use_answer_cache=use_staff_qa and not chat_data.conversation_id,
+        cached_answer=None,
+    )
+    if turn.use_answer_cache:
+        turn.cached_answer = get_cached_answer(
+            context.tenant_id, turn.record_business_unit_id, chat_data.message
+        )
+        if turn.cached_answer is not None:
+            logger.info(
+                "AI answer served from cache",
+                tenant_id=context.tenant_id,
+                business_unit_id=turn.record_business_unit_id
+            )
+    return turn
+
+
+def _department_for_ai(context: ChatContext) -> Optional[Department]:
+    """通常モード（AIServiceV2）に渡す部署を決定"""
+    # Departmentオブジェクトを構築（既存のAIServiceV2のインターフェースに合わせる）
+    dept_obj = context.department_for_logs
+    if not dept_obj and context.business_unit:
+        # フォールバック: 仮のDepartmentオブジェクトを作成
+        dept_obj = Department(name=context.business_unit.name, code=context.business_unit.code)
+    return dept_obj
+
+
+def _token_usage(ai_client) -> tuple[Optional[int], Optional[int]]:
+    """直近のAI呼び出しのトークン使用量を取得（AnthropicClientの場合のみ）"""
+    if hasattr(ai_client, 'get_last_response_metadata'):
+        metadata = ai_client.get_last_response_metadata()
+        if metadata:
+            return metadata.tokens_input, metadata.tokens_output
+    return None, None
+
+
+def _ai_error_detail(error_msg: str) -> tuple[int, dict]:
+    """「エラーコード:メッセージ」形式のAIエラーをステータスコードとエラー詳細に変換"""
+    if ":" in error_msg:
+        error_code, message = error_msg.split(":", 1)
+        return status.HTTP_503_SERVICE_UNAVAILABLE, {
+            "error_code": error_code,
+            "message": message
+        }
+    return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+        "error_code": "ai_error",
+        "message": error_msg
+    }
+
+
+def _end_transaction_after(session: Session, func, *args):
+    """
+    読み取り処理を実行し、トランザクションを終えて接続をプールに返す
+
+    続くAI呼び出し（数秒かかる）の間、リクエストのセッションが接続を保持しないようにする。
+    """
+    try:
+        result = func(*args)
+    except Exception:
+        session.rollback()
+        raise
+    session.commit()
+    return result
+
+
+async def _build_chat_prompt(
+    session: Session,
+    service,
+    turn: ChatTurn,
+    user: User,
+    question: str,
+) -> Optional[tuple[str, List[dict]]]:
+    """
+    AIに渡すプロンプトを構築（/chat と /chat/stream で共通）
+
+    テナント設定・ナレッジ・会話履歴の取得に同期DBアクセスを含むため、スレッドプールで実行する。
+    失敗時の扱いは answer_staff_question / generate_answer と同じ:
+    - スタッフQAモード: 「エラーコード:メッセージ」形式の ValueError を送出
+    - 通常モード: None を返す（呼び出し側はフォールバック応答を返す）
+    """
+    if turn.use_staff_qa:
+        return await run_in_threadpool(
+            _end_transaction_after,
+            session,
+            service.prepare_staff_prompt,
+            session, user, turn.context.business_unit, question,
+            turn.conversation.id if turn.conversation else None
+        )
+    return await run_in_threadpool(
+        _end_transaction_after,
+        session,
+        service.prepare_prompt,
+        session, question, user, _department_for_ai(turn.context),
+        turn.recent_logs, turn.summary, turn.today_log, turn.knowledge_context or None
+    )
+
+
 # 新しいエンドポイント（v2: ナレッジ連携・会話履歴対応）
 @router.post("/chat", response_model=AIChatResponseV2, status_code=status.HTTP_201_CREATED)
 async def create_ai_chat_v2(
     chat_data: AIChatRequestV2,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -148,123 +633,13 @@ async def create_ai_chat_v2(
     4. AI Clientで応答を生成
     5. 会話履歴に保存
     """
-    # テナントIDを取得
-    tenant_id = current_user.tenant_id
-    if not tenant_id:
-        from app.models.tenant import Tenant
-        statement = select(Tenant).where(Tenant.name == "mikamo")
-        tenant = session.exec(statement).first()
-        if tenant:
-            tenant_id = tenant.id
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="テナントが見つかりません"
-            )
-    
-    # 事業部門を取得
-    business_unit_id = chat_data.business_unit_id
-    department = None
-    if not business_unit_id:
-        # 未指定の場合はユーザーの所属部門を使用
-        business_unit_id = current_user.business_unit_id
-        if not business_unit_id:
-            # 後方互換性のため、Departmentもチェック
-            department = session.get(Department, current_user.department_id)
-            if department:
-                # DepartmentのcodeからBusinessUnitを検索
-                statement = select(BusinessUnit).where(BusinessUnit.code == department.code)
-                business_unit = session.exec(statement).first()
-                if business_unit:
-                    business_unit_id = business_unit.id
-    
-    business_unit = None
-    if business_unit_id:
-        business_unit = session.get(BusinessUnit, business_unit_id)
-        if not business_unit:
-            # 後方互換性のため、Departmentもチェック
-            department = session.get(Department, business_unit_id)
-            if not department:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="事業部門が見つかりません"
-                )
-    
-    # 会話を取得または作成
-    conversation = None
-    if chat_data.conversation_id:
-        conversation = session.get(Conversation, chat_data.conversation_id)
-        if not conversation or conversation.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="会話が見つかりません"
-            )
-    else:
-        # 新規会話を作成
-        conversation = Conversation(
-            tenant_id=tenant_id,
-            user_id=current_user.id,
-            business_unit_id=business_unit_id if business_unit else None,
-            title=chat_data.message[:50]  # 最初の50文字をタイトルに
-        )
-        session.add(conversation)
-        session.commit()
-        session.refresh(conversation)
-    
-    # 既存の会話履歴を取得
-    statement = select(Message).where(
-        Message.conversation_id == conversation.id
-    ).order_by(Message.created_at.asc())
-    existing_messages = session.exec(statement).all()
-    
-    # 会話履歴を構築（AI Client用の形式）
-    messages = []
-    for msg in existing_messages:
-        messages.append({
-            "role": msg.role,
-            "content": msg.content
-        })
-    
-    # ユーザーメッセージを追加
-    messages.append({
-        "role": "user",
-        "content": chat_data.message
-    })
-    
-    # ナレッジベースから関連情報を検索
-    knowledge_context = get_knowledge_context(
-        session,
-        query=chat_data.message,
-        business_unit_id=business_unit_id,
-        limit=3
-    )
-    
-    # 日報データからコンテキストを構築
-    department_for_logs = department or (business_unit and session.exec(
-        select(Department).where(Department.code == business_unit.code)
-    ).first())
-    
-    if department_for_logs:
-        recent_logs = get_recent_daily_logs_by_department(
-            session, department_for_logs.id, days=14
-        )
-        summary = get_daily_logs_summary_by_department(
-            session, department_for_logs.id, days=14
-        )
-        today_log = get_today_daily_log(session, current_user.id)
-    else:
-        recent_logs = []
-        summary = {}
-        today_log = None
-    
-    # スタッフQAモードかどうかを判定
-    use_staff_qa = False
-    if chat_data.mode == "staff_qa":
-        use_staff_qa = True
-    elif current_user.role in ["staff", "manager"]:
-        # スタッフ・マネージャーの場合はデフォルトでスタッフQAモード
-        use_staff_qa = True
-    
+    turn = await _prepare_chat_turn(session, current_user, chat_data)
+    context = turn.context
+    tenant_id = context.tenant_id
+    business_unit = context.business_unit
+    record_business_unit_id = turn.record_business_unit_id
+    conversation = turn.conversation
+
     # AI利用ログ用の変数
     ai_purpose = None
     ai_tier = None
@@ -273,104 +648,63 @@ async def create_ai_chat_v2(
     ai_tokens_output = None
     ai_error = None
 
+    if turn.cached_answer is not None:
+        # キャッシュヒット: AI APIを呼ばない（利用ログも記録しない）
+        answer = turn.cached_answer
     # スタッフQAモードの場合は軽量モデルを使用
-    if use_staff_qa:
+    elif turn.use_staff_qa:
         from app.services.staff_qa_service import StaffQAService
-        from app.models.tenant import TenantSettings
         try:
-            # テナント設定を取得（ティアポリシー適用用）
-            tenant_settings = None
-            if tenant_id:
-                stmt = select(TenantSettings).where(TenantSettings.tenant_id == tenant_id)
-                tenant_settings = session.exec(stmt).first()
-
-            staff_qa_service = StaffQAService(tenant_settings=tenant_settings)
+            # テナント設定（ティアポリシー適用用）
+            staff_qa_service = StaffQAService(tenant_settings=context.tenant_settings)
 
             # ログ用にメタデータを保存
             ai_purpose = staff_qa_service.purpose
             ai_tier = staff_qa_service.effective_tier
             ai_model = staff_qa_service.model_name
 
-            answer = await staff_qa_service.answer_staff_question(
-                session=session,
-                user=current_user,
-                business_unit=business_unit,
-                user_question=chat_data.message,
-                conversation_id=conversation.id if conversation else None
+            system_prompt, prompt_messages = await _build_chat_prompt(
+                session, staff_qa_service, turn, current_user, chat_data.message
+            )
+            answer = await staff_qa_service.generate_staff_answer(
+                system_prompt,
+                prompt_messages,
+                user_id=current_user.id,
+                business_unit_id=business_unit.id if business_unit else None
             )
+            if turn.use_answer_cache:
+                cache_answer(tenant_id, record_business_unit_id, chat_data.message, answer)
 
-            # トークン使用量を取得（AnthropicClientの場合）
-            if hasattr(staff_qa_service.ai_client, 'get_last_response_metadata'):
-                metadata = staff_qa_service.ai_client.get_last_response_metadata()
-                if metadata:
-                    ai_tokens_input = metadata.tokens_input
-                    ai_tokens_output = metadata.tokens_output
+            ai_tokens_input, ai_tokens_output = _token_usage(staff_qa_service.ai_client)
 
         except ValueError as e:
             error_msg = str(e)
             ai_error = error_msg[:200]  # エラーログ用
-            # エラーコード:メッセージ の形式でパース
-            if ":" in error_msg:
-                error_code, message = error_msg.split(":", 1)
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail={
-                        "error_code": error_code,
-                        "message": message
-                    }
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail={
-                        "error_code": "ai_error",
-                        "message": error_msg
-                    }
-                )
+            status_code, detail = _ai_error_detail(error_msg)
+            raise HTTPException(status_code=status_code, detail=detail)
     else:
         # 通常モード（経営判断用・デフォルト）
-        # テナント設定を取得（ティアポリシー適用用）
-        from app.models.tenant import TenantSettings as TS
-        tenant_settings_for_ai = None
-        if tenant_id:
-            stmt = select(TS).where(TS.tenant_id == tenant_id)
-            tenant_settings_for_ai = session.exec(stmt).first()
-
-        ai_service = AIServiceV2(tenant_settings=tenant_settings_for_ai)
+        # テナント設定（ティアポリシー適用用）
+        ai_service = AIServiceV2(tenant_settings=context.tenant_settings)
 
         # ログ用にメタデータを保存
         ai_purpose = ai_service.purpose
         ai_tier = ai_service.effective_tier
         ai_model = ai_service.model_name
 
-        # Departmentオブジェクトを構築（既存のAIServiceV2のインターフェースに合わせる）
-        dept_obj = department
-        if not dept_obj and business_unit:
-            # BusinessUnitからDepartmentを取得または作成
-            dept_obj = session.exec(
-                select(Department).where(Department.code == business_unit.code)
-            ).first()
-            if not dept_obj:
-                # フォールバック: 仮のDepartmentオブジェクトを作成
-                dept_obj = Department(name=business_unit.name, code=business_unit.code)
-
-        answer = await ai_service.generate_answer(
-            session=session,  # SaaS対応: テナント設定取得用
-            question=chat_data.message,
-            user=current_user,
-            department=dept_obj,
-            recent_logs=recent_logs,
-            summary=summary,
-            today_log=today_log,
-            knowledge_context=knowledge_context if knowledge_context else None
+        department_code = _department_for_ai(context).code
+        prompt = await _build_chat_prompt(
+            session, ai_service, turn, current_user, chat_data.message
         )
+        if prompt is None:
+            answer = ai_service.fallback_response(chat_data.message, department_code)
+        else:
+            system_prompt, prompt_messages = prompt
+            answer = await ai_service.generate_answer_from_prompt(
+                system_prompt, prompt_messages, department_code
+            )
 
-        # トークン使用量を取得（AnthropicClientの場合）
-        if hasattr(ai_service.ai_client, 'get_last_response_metadata'):
-            metadata = ai_service.ai_client.get_last_response_metadata()
-            if metadata:
-                ai_tokens_input = metadata.tokens_input
-                ai_tokens_output = metadata.tokens_output
+        ai_tokens_input, ai_tokens_output = _token_usage(ai_service.ai_client)
 
     # AI利用ログを記録
     from app.services.ai.usage_logger import log_ai_usage
@@ -379,7 +713,7 @@ async def create_ai_chat_v2(
             session=session,
             tenant_id=tenant_id,
             user_id=current_user.id,
-            business_unit_id=business_unit_id if business_unit else None,
+            business_unit_id=record_business_unit_id,
             purpose=ai_purpose,
             tier=ai_tier,
             model=ai_model,
@@ -388,79 +722,27 @@ async def create_ai_chat_v2(
             error=ai_error,
             conversation_id=conversation.id if conversation else None,
         )
-    
-    # メッセージを保存
-    user_message = Message(
-        conversation_id=conversation.id,
-        role="user",
-        content=chat_data.message
+
+    # メッセージ・Issue/Insightを保存してコミット
+    assistant_message = await run_in_threadpool(
+        _save_chat_turn,
+        session,
+        conversation=conversation,
+        question=chat_data.message,
+        answer=answer,
     )
-    session.add(user_message)
-    
-    assistant_message = Message(
+
+    # Issue/Insightの抽出・作成はレスポンス返却後に実行
+    background_tasks.add_task(
+        _create_issue_insight_from_reply,
+        tenant_id=tenant_id,
+        business_unit_id=record_business_unit_id,
+        user_id=current_user.id,
         conversation_id=conversation.id,
-        role="assistant",
-        content=answer
+        question=chat_data.message,
+        answer=answer,
     )
-    session.add(assistant_message)
-    
-    # 会話の更新日時を更新
-    conversation.updated_at = datetime.utcnow()
-    session.add(conversation)
-    
-    # AIレスポンスからIssue/Insightを抽出・作成
-    from app.services.issue_insight_extractor import extract_issue_insight_from_ai_response
-    from app.models.issue import Issue, IssueStatus
-    from app.models.insight import Insight
-    
-    extracted = extract_issue_insight_from_ai_response(answer, chat_data.message)
-    
-    # Issueを作成（重要度が高い場合のみ）
-    if extracted.get("issue"):
-        issue_data = extracted["issue"]
-        # 既に同じようなIssueが存在しないかチェック（簡易版）
-        existing_issue = session.exec(
-            select(Issue).where(
-                Issue.business_unit_id == business_unit_id if business_unit else None,
-                or_(
-                    Issue.title.contains(issue_data["title"][:50]),
-                    Issue.description.contains(issue_data["description"][:100])
-                )
-            )
-        ).first()
-        
-        if not existing_issue:
-            issue = Issue(
-                tenant_id=tenant_id,
-                business_unit_id=business_unit_id if business_unit else None,
-                title=issue_data["title"],
-                description=issue_data["description"],
-                status=IssueStatus.OPEN,
-                topic=issue_data["topic"],
-                created_by_user_id=current_user.id,
-                conversation_id=conversation.id
-            )
-            session.add(issue)
-            logger.info("Issue created from AI response", issue_id=issue.id, conversation_id=conversation.id)
-    
-    # Insightを作成（重要度スコアが60以上の場合のみ）
-    if extracted.get("insight") and extracted["insight"]["score"] >= 60:
-        insight_data = extracted["insight"]
-        insight = Insight(
-            tenant_id=tenant_id,
-            business_unit_id=business_unit_id if business_unit else None,
-            title=insight_data["title"],
-            content=insight_data["content"],
-            type=insight_data["type"],
-            score=insight_data["score"],
-            created_by=None  # AIが作成
-        )
-        session.add(insight)
-        logger.info("Insight created from AI response", insight_id=insight.id, score=insight.score)
-    
-    session.commit()
-    session.refresh(assistant_message)
-    
+
     return AIChatResponseV2(
         conversation_id=conversation.id,
         reply=answer,
@@ -468,44 +750,187 @@ async def create_ai_chat_v2(
     )
 
 
+def _sse_event(data: dict) -> str:
+    """Server-Sent Events の1イベント分の文字列を作成"""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _cached_stream(answer: str) -> AsyncIterator[str]:
+    """確定済みの回答（回答キャッシュ・フォールバック応答）を1回で返す"""
+    yield answer
+
+
+def _save_streamed_turn(
+    session: Session,
+    *,
+    conversation_id: int,
+    question: str,
+    answer: str,
+    usage: Optional[dict],
+) -> int:
+    """ストリーミング完了後に利用ログとメッセージを保存し、AIのメッセージIDを返す"""
+    from app.services.ai.usage_logger import log_ai_usage
+
+    conversation = session.get(Conversation, conversation_id)
+    if usage:
+        log_ai_usage(session=session, conversation_id=conversation_id, **usage)
+    assistant_message = _save_chat_turn(
+        session,
+        conversation=conversation,
+        question=question,
+        answer=answer,
+    )
+    return assistant_message.id
+
+
+@router.post("/chat/stream")
+async def create_ai_chat_stream(
+    chat_data: AIChatRequestV2,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    AIチャット（ストリーミング版）
+
+    /chat と同じ処理で、AIの応答を Server-Sent Events で生成された順に返す。
+
+    イベント（data: に JSON）:
+    - {"delta": "..."}: 応答テキストの差分
+    - {"done": true, "conversation_id": ..., "message_id": ...}: 完了（メッセージ保存後）
+    - {"error_code": "...", "message": "..."}: AIエラー（メッセージは保存しない）
+
+    応答が完了した場合のみメッセージ・利用ログを保存する。
+    途中で接続が切れた場合、そのやり取りは保存されない。
+    """
+    turn = await _prepare_chat_turn(session, current_user, chat_data)
+    context = turn.context
+    tenant_id = context.tenant_id
+    record_business_unit_id = turn.record_business_unit_id
+    conversation_id = turn.conversation.id
+    user_id = current_user.id
+    question = chat_data.message
+
+    # プロンプト構築（DBアクセスを含む）はストリーミング開始前に済ませる
+    service = None
+    if turn.cached_answer is not None:
+        answer_stream = _cached_stream(turn.cached_answer)
+    elif turn.use_staff_qa:
+        from app.services.staff_qa_service import StaffQAService
+        service = StaffQAService(tenant_settings=context.tenant_settings)
+        try:
+            system_prompt, prompt_messages = await _build_chat_prompt(
+                session, service, turn, current_user, question
+            )
+        except ValueError as e:
+            status_code, detail = _ai_error_detail(str(e))
+            raise HTTPException(status_code=status_code, detail=detail)
+        answer_stream = service.stream_staff_answer(system_prompt, prompt_messages, user_id)
+    else:
+        service = AIServiceV2(tenant_settings=context.tenant_settings)
+        department_code = _department_for_ai(context).code
+        prompt = await _build_chat_prompt(session, service, turn, current_user, question)
+        if prompt is None:
+            answer_stream = _cached_stream(service.fallback_response(question, department_code))
+        else:
+            system_prompt, prompt_messages = prompt
+            answer_stream = service.stream_answer(system_prompt, prompt_messages, department_code)
+
+    # 新規会話は _prepare_chat_turn で確定済み（ストリーミング中の保存は独立したセッションで行う）
+
+    async def event_stream():
+        chunks: List[str] = []
+        try:
+            async for delta in answer_stream:
+                chunks.append(delta)
+                yield _sse_event({"delta": delta})
+        except ValueError as e:
+            _, detail = _ai_error_detail(str(e))
+            yield _sse_event(detail)
+            return
+        answer = "".join(chunks)
+
+        usage = None
+        if service is not None:
+            if turn.use_answer_cache:
+                cache_answer(tenant_id, record_business_unit_id, question, answer)
+            tokens_input, tokens_output = _token_usage(service.ai_client)
+            usage = {
+                "tenant_id": tenant_id,
+                "user_id": user_id,
+                "business_unit_id": record_business_unit_id,
+                "purpose": service.purpose,
+                "tier": service.effective_tier,
+                "model": service.model_name,
+                "tokens_input": tokens_input,
+                "tokens_output": tokens_output,
+            }
+
+        message_id = await run_in_threadpool(
+            _with_own_session,
+            _save_streamed_turn,
+            conversation_id=conversation_id,
+            question=question,
+            answer=answer,
+            usage=usage,
+        )
+        yield _sse_event({"done": True, "conversation_id": conversation_id, "message_id": message_id})
+
+        # Issue/Insightの抽出・作成は完了イベント送信後に実行
+        await run_in_threadpool(
+            _create_issue_insight_from_reply,
+            tenant_id=tenant_id,
+            business_unit_id=record_business_unit_id,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            question=question,
+            answer=answer,
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/conversations", response_model=List[ConversationResponse])
-async def get_conversations(
+def get_conversations(
     skip: int = 0,
     limit: int = 50,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """会話一覧を取得"""
-    statement = select(Conversation).where(
-        Conversation.user_id == current_user.id
-    ).order_by(Conversation.updated_at.desc()).offset(skip).limit(limit)
-    conversations = session.exec(statement).all()
-    
-    result = []
-    for conv in conversations:
-        # メッセージ数を取得
-        msg_statement = select(Message).where(Message.conversation_id == conv.id)
-        msg_count = len(session.exec(msg_statement).all())
-        
-        business_unit = None
-        if conv.business_unit_id:
-            business_unit = session.get(BusinessUnit, conv.business_unit_id)
-        
-        result.append(ConversationResponse(
-            id=conv.id,
-            title=conv.title,
-            business_unit_id=conv.business_unit_id,
-            business_unit_name=business_unit.name if business_unit else None,
-            created_at=conv.created_at.isoformat() if conv.created_at else "",
-            updated_at=conv.updated_at.isoformat() if conv.updated_at else "",
-            message_count=msg_count
-        ))
-    
-    return result
+    # メッセージ数と事業部門名を1回のクエリでまとめて取得
+    statement = (
+        select(Conversation, BusinessUnit.name, func.count(Message.id))
+        .join(Message, Message.conversation_id == Conversation.id, isouter=True)
+        .join(BusinessUnit, BusinessUnit.id == Conversation.business_unit_id, isouter=True)
+        .where(Conversation.user_id == current_user.id)
+        .group_by(Conversation.id, BusinessUnit.name)
+        .order_by(Conversation.updated_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = session.exec(statement).all()
+
+    # 自前で組み立てた値なので、レスポンスモデルでの再検証を省いてそのまま返す
+    return ORJSONResponse([
+        {
+            "id": conv.id,
+            "title": conv.title,
+            "business_unit_id": conv.business_unit_id,
+            "business_unit_name": business_unit_name,
+            "created_at": conv.created_at.isoformat() if conv.created_at else "",
+            "updated_at": conv.updated_at.isoformat() if conv.updated_at else "",
+            "message_count": msg_count,
+        }
+        for conv, business_unit_name, msg_count in rows
+    ])
 
 
 @router.get("/conversations/{conversation_id}/messages", response_model=List[MessageResponse])
-async def get_conversation_messages(
+def get_conversation_messages(
     conversation_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
@@ -523,19 +948,19 @@ async def get_conversation_messages(
     ).order_by(Message.created_at.asc())
     messages = session.exec(statement).all()
     
-    return [
-        MessageResponse(
-            id=msg.id,
-            role=msg.role,
-            content=msg.content,
-            created_at=msg.created_at.isoformat() if msg.created_at else ""
-        )
+    return ORJSONResponse([
+        {
+            "id": msg.id,
+            "role": msg.role,
+            "content": msg.content,
+            "created_at": msg.created_at.isoformat() if msg.created_at else "",
+        }
         for msg in messages
-    ]
+    ])
 
 
 @router.get("/logs", response_model=List[AIChatResponse])
-async def get_ai_chat_logs(
+def get_ai_chat_logs(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
@@ -546,27 +971,16 @@ async def get_ai_chat_logs(
         AIChatLog.user_id == current_user.id
     ).order_by(AIChatLog.created_at.desc()).offset(skip).limit(limit)
     logs = session.exec(statement).all()
-    return logs
-
-
-@router.get("/{log_id}", response_model=AIChatResponse)
-async def get_ai_chat_log(
-    log_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
-):
-    """AI相談ログを取得"""
-    statement = select(AIChatLog).where(
-        AIChatLog.id == log_id,
-        AIChatLog.user_id == current_user.id
-    )
-    log = session.exec(statement).first()
-    if not log:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ログが見つかりません"
-        )
-    return log
+    return ORJSONResponse([
+        {
+            "id": log.id,
+            "user_id": log.user_id,
+            "question": log.question,
+            "answer": log.answer,
+            "created_at": log.created_at,
+        }
+        for log in logs
+    ])
 
 
 @router.get("/suggestions", response_model=List[str])
@@ -575,9 +989,8 @@ async def get_suggestions(
 ):
     """部署に応じた質問サジェストを取得"""
     current_user, department = user_dept
-    ai_service = AIService()
-    suggestions = await ai_service.get_suggestions(department.code)
-    return suggestions
+    # サジェストは固定の一覧なので、AIService（OpenAIクライアント）は生成しない
+    return get_department_suggestions(department.code)
 
 
 class AIHealthResponse(BaseModel):
@@ -596,6 +1009,12 @@ class AIErrorResponse(BaseModel):
     detail: Optional[str] = None
 
 
+# ヘルスチェック結果のキャッシュ（監視からの頻繁なアクセスでAI APIを叩かないため）
+_HEALTH_TTL_SECONDS = 30.0
+_health_cache: Optional[tuple[float, AIHealthResponse]] = None
+_health_lock = asyncio.Lock()
+
+
 @router.get("/health", response_model=AIHealthResponse)
 async def check_ai_health():
     """
@@ -603,12 +1022,27 @@ async def check_ai_health():
 
     Anthropic API に軽量なテストリクエストを送信し、
     設定ミスやAPIキーの問題を早期に検出します。
+    結果は30秒間キャッシュし、同時アクセスは1回のリクエストにまとめます。
 
     認証不要（デプロイ時の動作確認用）
     """
-    from app.core.config import settings
+    global _health_cache
+
+    if _health_cache and time.monotonic() - _health_cache[0] < _HEALTH_TTL_SECONDS:
+        return _health_cache[1]
+
+    async with _health_lock:
+        # ロック待ちの間に他のリクエストが更新していればそれを返す
+        if _health_cache and time.monotonic() - _health_cache[0] < _HEALTH_TTL_SECONDS:
+            return _health_cache[1]
+        result = await _probe_ai_health()
+        _health_cache = (time.monotonic(), result)
+        return result
+
+
+async def _probe_ai_health() -> AIHealthResponse:
+    """AI APIに軽量なテストリクエストを送信して状態を判定"""
     from app.services.ai.client import AiClientFactory
-    import time
 
     provider = getattr(settings, "AI_PROVIDER_STAFF", "anthropic")
     model = getattr(settings, "AI_MODEL_STAFF", "claude-3-haiku-20240307")
@@ -660,3 +1094,25 @@ async def check_ai_health():
             model=model,
             message=f"AI service error: {str(e)}"
         )
+
+
+# パスパラメータのルートは最後に登録する
+# （先に登録すると /suggestions, /health などが /{log_id} にマッチしてしまう）
+@router.get("/{log_id}", response_model=AIChatResponse)
+def get_ai_chat_log(
+    log_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """AI相談ログを取得"""
+    statement = select(AIChatLog).where(
+        AIChatLog.id == log_id,
+        AIChatLog.user_id == current_user.id
+    )
+    log = session.exec(statement).first()
+    if not log:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="ログが見つかりません"
+        )
+    return log
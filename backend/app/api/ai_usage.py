@@ -3,19 +3,26 @@ AI利用状況API
 
 管理者向けのAI利用統計情報を提供する。
 テナント単位・ティア単位の利用状況を集計し、コスト可視化に活用。
+集計は前日までを日次集計テーブル（ai_usage_daily、バックグラウンドで定期的に再集計）、当日分のみ生ログ（ai_usage_logs）から行う。
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, tuple_
+from sqlmodel import Session, func
 from typing import List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
+from app.core.cache import TTLCache
 from app.core.database import get_session
-from app.models.ai_usage_log import AiUsageLog
 from app.models.user import User
 from app.api.deps import get_current_user
+from app.services.ai.usage_rollup import ai_usage_daily_source
 
 router = APIRouter()
 
+# 集計結果のキャッシュ（ダッシュボードの定期ポーリングで毎回集計しないため）
+# キー: (エンドポイント, テナントID, 集計日数)
+_usage_response_cache = TTLCache(maxsize=1024, ttl=60)
+
 
 # ============================================================
 # レスポンスモデル
@@ -72,7 +79,7 @@ class AiUsageDetailResponse(BaseModel):
 
 @router.get("/summary", response_model=AiUsageSummaryResponse)
 async def get_ai_usage_summary(
-    days: int = 7,
+    days: int = Query(7, ge=1, le=366, description="集計期間（日数、最大366日）"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -99,87 +106,76 @@ async def get_ai_usage_summary(
             detail="テナントが設定されていません"
         )
 
-    # 集計期間
+    # 集計期間（日次集計テーブルを参照するため日単位）
     end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
-
-    # 合計値を取得
-    total_query = select(
-        func.count(AiUsageLog.id).label("call_count"),
-        func.coalesce(func.sum(AiUsageLog.tokens_input), 0).label("tokens_input"),
-        func.coalesce(func.sum(AiUsageLog.tokens_output), 0).label("tokens_output")
-    ).where(
-        AiUsageLog.tenant_id == tenant_id,
-        AiUsageLog.created_at >= start_date,
-        AiUsageLog.created_at <= end_date
-    )
-    total_result = session.exec(total_query).first()
-
-    # ティア別集計
-    tier_query = select(
-        AiUsageLog.tier,
-        func.count(AiUsageLog.id).label("call_count"),
-        func.coalesce(func.sum(AiUsageLog.tokens_input), 0).label("tokens_input"),
-        func.coalesce(func.sum(AiUsageLog.tokens_output), 0).label("tokens_output")
-    ).where(
-        AiUsageLog.tenant_id == tenant_id,
-        AiUsageLog.created_at >= start_date,
-        AiUsageLog.created_at <= end_date
-    ).group_by(AiUsageLog.tier)
-    tier_results = session.exec(tier_query).all()
-
-    by_tier = [
-        TierUsageSummary(
-            tier=row[0] or "unknown",
-            call_count=row[1],
-            tokens_input_total=row[2],
-            tokens_output_total=row[3]
-        )
-        for row in tier_results
-    ]
-
-    # 日別・ティア別集計
-    daily_query = select(
-        func.date(AiUsageLog.created_at).label("date"),
-        AiUsageLog.tier,
-        func.count(AiUsageLog.id).label("call_count"),
-        func.coalesce(func.sum(AiUsageLog.tokens_input), 0).label("tokens_input"),
-        func.coalesce(func.sum(AiUsageLog.tokens_output), 0).label("tokens_output")
-    ).where(
-        AiUsageLog.tenant_id == tenant_id,
-        AiUsageLog.created_at >= start_date,
-        AiUsageLog.created_at <= end_date
+    start_day = (end_date - timedelta(days=days)).date()
+    start_date = datetime.combine(start_day, datetime.min.time())
+
+    cache_key = ("summary", tenant_id, days)
+    cached = _usage_response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    usage = ai_usage_daily_source(tenant_id, start_day)
+
+    # ティア別・日別ティア別を GROUPING SETS で1回のクエリにまとめて集計
+    # grouping(day) が 1 の行はティア別、0 の行は日別・ティア別の集計
+    summary_query = select(
+        func.grouping(usage.c.day).label("is_tier_total"),
+        usage.c.day,
+        usage.c.tier,
+        func.sum(usage.c.call_count).label("call_count"),
+        func.sum(usage.c.tokens_input).label("tokens_input"),
+        func.sum(usage.c.tokens_output).label("tokens_output")
     ).group_by(
-        func.date(AiUsageLog.created_at),
-        AiUsageLog.tier
-    ).order_by(func.date(AiUsageLog.created_at).desc())
-    daily_results = session.exec(daily_query).all()
-
-    by_day = [
-        DailyUsageSummary(
-            date=str(row[0]) if row[0] else "",
-            tier=row[1] or "unknown",
-            call_count=row[2],
-            tokens_input_total=row[3],
-            tokens_output_total=row[4]
+        func.grouping_sets(
+            tuple_(usage.c.tier),
+            tuple_(usage.c.day, usage.c.tier),
         )
-        for row in daily_results
-    ]
-
-    return AiUsageSummaryResponse(
+    ).order_by(usage.c.day.desc())
+    # 集計値のみのため、ORMの行処理を通さず列名→値のdictとして受け取る
+    summary_results = session.execute(summary_query).mappings().all()
+
+    by_tier = []
+    by_day = []
+    for row in summary_results:
+        if row["is_tier_total"]:
+            by_tier.append(TierUsageSummary(
+                tier=row["tier"] or "unknown",
+                call_count=row["call_count"],
+                tokens_input_total=row["tokens_input"],
+                tokens_output_total=row["tokens_output"]
+            ))
+        else:
+            by_day.append(DailyUsageSummary(
+                date=str(row["day"]) if row["day"] else "",
+                tier=row["tier"] or "unknown",
+                call_count=row["call_count"],
+                tokens_input_total=row["tokens_input"],
+                tokens_output_total=row["tokens_output"]
+            ))
+
+    # 合計値はティア別の集計結果から算出（全件の再集計を避ける）
+    total_calls = sum(s.call_count for s in by_tier)
+    total_tokens_input = sum(s.tokens_input_total for s in by_tier)
+    total_tokens_output = sum(s.tokens_output_total for s in by_tier)
+
+    response = AiUsageSummaryResponse(
         period_start=start_date.isoformat(),
         period_end=end_date.isoformat(),
-        total_calls=total_result[0] if total_result else 0,
-        total_tokens_input=total_result[1] if total_result else 0,
-        total_tokens_output=total_result[2] if total_result else 0,
+        total_calls=total_calls,
+        total_tokens_input=total_tokens_input,
+        total_tokens_output=total_tokens_output,
         by_tier=by_tier,
         by_day=by_day
     )
+    _usage_response_cache.set(cache_key, response)
+    return response
 
 
 @router.get("/detail", response_model=AiUsageDetailResponse)
 async def get_ai_usage_detail(
-    days: int = 7,
+    days: int = Query(7, ge=1, le=366, description="集計期間（日数、最大366日）"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -206,57 +202,75 @@ async def get_ai_usage_detail(
             detail="テナントが設定されていません"
         )
 
-    # 集計期間
+    # 集計期間（日次集計テーブルを参照するため日単位）
     end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
+    start_day = (end_date - timedelta(days=days)).date()
+    start_date = datetime.combine(start_day, datetime.min.time())
 
-    # 用途別集計
-    purpose_query = select(
-        AiUsageLog.purpose,
-        func.count(AiUsageLog.id).label("call_count"),
-        func.coalesce(func.sum(AiUsageLog.tokens_input), 0).label("tokens_input"),
-        func.coalesce(func.sum(AiUsageLog.tokens_output), 0).label("tokens_output")
-    ).where(
-        AiUsageLog.tenant_id == tenant_id,
-        AiUsageLog.created_at >= start_date,
-        AiUsageLog.created_at <= end_date
-    ).group_by(AiUsageLog.purpose)
-    purpose_results = session.exec(purpose_query).all()
-
-    by_purpose = [
-        PurposeUsageSummary(
-            purpose=row[0] or "unknown",
-            call_count=row[1],
-            tokens_input_total=row[2],
-            tokens_output_total=row[3]
-        )
-        for row in purpose_results
-    ]
-
-    # エラー数を取得
-    error_query = select(func.count(AiUsageLog.id)).where(
-        AiUsageLog.tenant_id == tenant_id,
-        AiUsageLog.created_at >= start_date,
-        AiUsageLog.created_at <= end_date,
-        AiUsageLog.error != None
-    )
-    error_count = session.exec(error_query).first() or 0
+    cache_key = ("detail", tenant_id, days)
+    cached = _usage_response_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    # 総呼び出し数
-    total_query = select(func.count(AiUsageLog.id)).where(
-        AiUsageLog.tenant_id == tenant_id,
-        AiUsageLog.created_at >= start_date,
-        AiUsageLog.created_at <= end_date
-    )
-    total_count = session.exec(total_query).first() or 0
+    usage = ai_usage_daily_source(tenant_id, start_day)
+
+    # 用途別集計と全体の合計（エラー数を含む）を ROLLUP で1回のクエリにまとめて集計
+    # grouping(purpose) が 1 の行は全体の合計（purpose が NULL の用途別の行と区別するため）
+    purpose_query = select(
+        func.grouping(usage.c.purpose).label("is_total"),
+        usage.c.purpose,
+        func.sum(usage.c.call_count).label("call_count"),
+        func.sum(usage.c.tokens_input).label("tokens_input"),
+        func.sum(usage.c.tokens_output).label("tokens_output"),
+        func.sum(usage.c.error_count).label("error_count")
+    ).group_by(func.rollup(usage.c.purpose))
+    # 集計値のみのため、ORMの行処理を通さず列名→値のdictとして受け取る
+    purpose_results = session.execute(purpose_query).mappings().all()
+
+    by_purpose = []
+    total_count = 0
+    error_count = 0
+    for row in purpose_results:
+        if row["is_total"]:
+            # 対象期間にデータがない場合も合計行は返る（SUM は NULL）
+            total_count = row["call_count"] or 0
+            error_count = row["error_count"] or 0
+        else:
+            by_purpose.append(PurposeUsageSummary(
+                purpose=row["purpose"] or "unknown",
+                call_count=row["call_count"],
+                tokens_input_total=row["tokens_input"],
+                tokens_output_total=row["tokens_output"]
+            ))
 
     # 成功率を計算
     success_rate = ((total_count - error_count) / total_count * 100) if total_count > 0 else 100.0
 
-    return AiUsageDetailResponse(
+    response = AiUsageDetailResponse(
         period_start=start_date.isoformat(),
         period_end=end_date.isoformat(),
         by_purpose=by_purpose,
         error_count=error_count,
         success_rate=round(success_rate, 2)
     )
+    _usage_response_cache.set(cache_key, response)
+    return response
+
+
+@router.post("/cache/invalidate", status_code=status.HTTP_204_NO_CONTENT)
+async def invalidate_ai_usage_cache(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    AI利用状況の集計キャッシュを破棄（管理者向け）
+
+    直近の利用をすぐにダッシュボードへ反映したい場合に使用する。
+    """
+    # 管理者ロールのみアクセス可
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="管理者ロールが必要です"
+        )
+
+    _usage_response_cache.clear()
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import exists, lambda_stmt
 from sqlmodel import Session, select
 from datetime import timedelta
 from app.core.database import get_session
 from app.core.security import verify_password, get_password_hash, create_access_token
 from app.core.config import settings
-from app.models.user import User, Department
-from app.models.business_unit import BusinessUnit
+from app.models.user import User
 from app.api.deps import get_current_user
-from pydantic import BaseModel, EmailStr
+from app.repositories.organization_repository import get_department_cached, get_business_unit_cached
+from pydantic import BaseModel, EmailStr, ConfigDict
 from typing import Optional
 
+# DBアクセス（とパスワードハッシュ計算）が同期処理のため、ハンドラーは def で定義し
+# FastAPIのスレッドプールで実行させる（async def だとイベントループを塞いでしまう）
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -35,8 +38,7 @@ class UserResponse(BaseModel):
     role: str
     is_active: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -49,12 +51,10 @@ class TokenData(BaseModel):
 
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, session: Session = Depends(get_session)):
+def register(user_data: UserCreate, session: Session = Depends(get_session)):
     """ユーザー登録"""
-    # 既存ユーザーをチェック
-    statement = select(User).where(User.email == user_data.email)
-    existing_user = session.exec(statement).first()
-    if existing_user:
+    # 既存ユーザーをチェック（行を取得せずEXISTSで判定）
+    if session.scalar(select(exists().where(User.email == user_data.email))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="このメールアドレスは既に登録されています"
@@ -70,19 +70,22 @@ async def register(user_data: UserCreate, session: Session = Depends(get_session
     )
     session.add(user)
     session.commit()
-    session.refresh(user)
     return user
 
 
 @router.post("/login", response_model=Token)
-async def login(
+def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: Session = Depends(get_session)
 ):
     """ログイン"""
-    statement = select(User).where(User.email == form_data.username)
-    user = session.exec(statement).first()
+    email = form_data.username
+    # lambda_stmt でSQL構築・キャッシュキー生成を初回のみにする
+    statement = lambda_stmt(lambda: select(User).where(User.email == email))
+    user = session.scalars(statement).first()
     
+    # bcrypt の検証はCPUを使うが、このハンドラーはスレッドプールで実行され（bcrypt は計算中に
+    # GILを解放する）、イベントループや他のリクエストを塞がない
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -96,9 +99,8 @@ async def login(
             detail="このアカウントは無効です"
         )
     
-    # 部署情報を取得
-    statement = select(Department).where(Department.id == user.department_id)
-    department = session.exec(statement).first()
+    # 部署情報を取得（ほとんど変更されないためキャッシュ経由）
+    department = get_department_cached(session, user.department_id)
     department_code = department.code if department else ""
     
     # JWTトークンに user_id, role, department_code を含める
@@ -116,19 +118,14 @@ async def login(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(
+def get_me(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """現在のユーザー情報を取得（部門情報を含む）"""
-    # 部門情報を取得
-    statement = select(Department).where(Department.id == current_user.department_id)
-    department = session.exec(statement).first()
-
-    # 事業部門情報を取得
-    business_unit = None
-    if current_user.business_unit_id:
-        business_unit = session.get(BusinessUnit, current_user.business_unit_id)
+    # 部門・事業部門はほとんど変更されないため、キャッシュ経由で取得（キャッシュ済みならクエリなし）
+    department = get_department_cached(session, current_user.department_id)
+    business_unit = get_business_unit_cached(session, current_user.business_unit_id)
 
     return UserResponse(
         id=current_user.id,
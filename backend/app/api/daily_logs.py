@@ -1,4 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import exists, literal, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select, func
 from typing import List, Optional
 from datetime import date, datetime, timedelta
@@ -10,9 +13,11 @@ from app.repositories.daily_log_repository import (
     get_department_daily_logs_for_chart,
     get_all_departments_today_summary
 )
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
-router = APIRouter()
+# DBアクセスが同期処理のため、ハンドラーは def で定義し
+# FastAPIのスレッドプールで実行させる（async def だとイベントループを塞いでしまう）
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class DailyLogCreate(BaseModel):
@@ -54,8 +59,7 @@ class DailyLogResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SummaryResponse(BaseModel):
@@ -67,49 +71,80 @@ class SummaryResponse(BaseModel):
     week_end: date
 
 
+def _daily_log_payload(log: DailyLog) -> dict:
+    """DailyLogResponse形式のレスポンスdictを構築"""
+    return {
+        "id": log.id,
+        "date": log.log_date,  # orjson がISO 8601形式に変換する
+        "department_id": log.department_id,
+        "user_id": log.user_id,
+        "weather": log.weather,
+        "sales_amount": log.sales_amount,
+        "customers_count": log.customers_count,
+        "transaction_count": log.transaction_count,
+        "highlight": log.highlight,
+        "problem": log.problem,
+        "memo": log.memo,
+        "manager_comment": log.manager_comment,
+        "reaction_count": log.reaction_count,
+        "created_at": log.created_at,
+        "updated_at": log.updated_at,
+    }
+
+
 class ManagerCommentRequest(BaseModel):
     comment: str = Field(..., max_length=1000, description="承認＋次の一歩のヒントを書いてください")
 
 
 @router.post("", response_model=DailyLogResponse, status_code=status.HTTP_201_CREATED)
-async def create_daily_log(
+def create_daily_log(
     log_data: DailyLogCreate,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """日次ログを作成"""
-    # 同じ日付のログが既に存在するかチェック
-    statement = select(DailyLog).where(
-        DailyLog.log_date == log_data.date,
-        DailyLog.user_id == current_user.id
+    # 同じ日付のログが既にあれば挿入しない（事前のSELECTを省き、1回の INSERT ... SELECT で判定）
+    # 一意インデックス uq_daily_logs_user_date_cov があれば ON CONFLICT で同時リクエストの重複も防ぐ
+    # （既存データの重複でインデックスが未作成の環境でも NOT EXISTS の判定で動作する）
+    columns = DailyLog.__table__.c
+    new_log = {
+        "date": log_data.date,
+        "department_id": current_user.department_id,
+        "user_id": current_user.id,
+        "weather": log_data.weather,
+        "sales_amount": log_data.sales_amount,
+        "customers_count": log_data.customers_count,
+        "transaction_count": log_data.transaction_count,
+        "highlight": log_data.highlight,
+        "problem": log_data.problem,
+        "memo": log_data.memo,
+    }
+    statement = (
+        pg_insert(DailyLog)
+        .from_select(
+            list(new_log),
+            select(*(literal(value, columns[name].type) for name, value in new_log.items())).where(
+                ~exists().where(
+                    DailyLog.user_id == current_user.id,
+                    DailyLog.log_date == log_data.date
+                )
+            )
+        )
+        .on_conflict_do_nothing()
+        .returning(DailyLog)
     )
-    existing_log = session.exec(statement).first()
-    if existing_log:
+    daily_log = session.scalars(statement).first()
+    if daily_log is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="この日付のログは既に存在します"
         )
-    
-    daily_log = DailyLog(
-        log_date=log_data.date,
-        department_id=current_user.department_id,
-        user_id=current_user.id,
-        weather=log_data.weather,
-        sales_amount=log_data.sales_amount,
-        customers_count=log_data.customers_count,
-        transaction_count=log_data.transaction_count,
-        highlight=log_data.highlight,
-        problem=log_data.problem,
-        memo=log_data.memo
-    )
-    session.add(daily_log)
     session.commit()
-    session.refresh(daily_log)
     return daily_log
 
 
 @router.get("", response_model=List[DailyLogResponse])
-async def get_daily_logs(
+def get_daily_logs(
     skip: int = 0,
     limit: int = 100,
     start_date: Optional[date] = None,
@@ -126,12 +161,14 @@ async def get_daily_logs(
         statement = statement.where(DailyLog.log_date <= end_date)
     
     statement = statement.order_by(DailyLog.log_date.desc()).offset(skip).limit(limit)
-    logs = session.exec(statement).all()
-    return logs
+    # 件数が多い場合もORMオブジェクトを一度に全件保持しないよう、少しずつ読み込んでdictに変換する
+    # 自前で組み立てた値なので、レスポンスモデルでの再検証を省いてそのまま返す
+    logs = session.exec(statement.execution_options(yield_per=200))
+    return ORJSONResponse([_daily_log_payload(log) for log in logs])
 
 
 @router.get("/{log_id}", response_model=DailyLogResponse)
-async def get_daily_log(
+def get_daily_log(
     log_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
@@ -151,7 +188,7 @@ async def get_daily_log(
 
 
 @router.patch("/{log_id}", response_model=DailyLogResponse)
-async def update_daily_log(
+def update_daily_log(
     log_id: int,
     log_data: DailyLogUpdate,
     current_user: User = Depends(get_current_user),
@@ -176,12 +213,11 @@ async def update_daily_log(
     log.updated_at = datetime.utcnow()
     session.add(log)
     session.commit()
-    session.refresh(log)
     return log
 
 
 @router.delete("/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_daily_log(
+def delete_daily_log(
     log_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
@@ -203,7 +239,7 @@ async def delete_daily_log(
 
 
 @router.get("/summary/week", response_model=SummaryResponse)
-async def get_weekly_summary(
+def get_weekly_summary(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -211,6 +247,7 @@ async def get_weekly_summary(
     today = date.today()
     week_start = today - timedelta(days=6)  # 今日を含めて7日間
     
+    # 日次ログは1ユーザー1日1件のため、一意インデックス (user_id, date) で最大7行を読むだけで済む
     statement = select(
         func.sum(DailyLog.sales_amount).label("total_sales"),
         func.sum(DailyLog.customers_count).label("total_customers"),
@@ -224,9 +261,10 @@ async def get_weekly_summary(
     
     result = session.exec(statement).first()
     
+    # 集計値から組み立てるため model_construct で検証を省く（返却時にレスポンスモデルで検証される）
     # 結果がNoneの場合（データがない場合）の処理
     if result is None:
-        return SummaryResponse(
+        return SummaryResponse.model_construct(
             total_sales=0,
             total_customers=0,
             total_transactions=0,
@@ -235,7 +273,7 @@ async def get_weekly_summary(
             week_end=today
         )
     
-    return SummaryResponse(
+    return SummaryResponse.model_construct(
         total_sales=result.total_sales or 0,
         total_customers=result.total_customers or 0,
         total_transactions=result.total_transactions or 0,
@@ -246,7 +284,7 @@ async def get_weekly_summary(
 
 
 @router.post("/{log_id}/react", response_model=DailyLogResponse)
-async def react_to_daily_log(
+def react_to_daily_log(
     log_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
@@ -255,25 +293,25 @@ async def react_to_daily_log(
     日次ログに「いいね」をつける（エンゲージメント機能）
     v0.2では単純にreaction_countを+1する実装
     """
-    statement = select(DailyLog).where(DailyLog.id == log_id)
-    log = session.exec(statement).first()
+    # いいねを追加（同時に押されても取りこぼさないよう、DB側でアトミックに+1する）
+    statement = (
+        update(DailyLog)
+        .where(DailyLog.id == log_id)
+        .values(reaction_count=DailyLog.reaction_count + 1, updated_at=datetime.utcnow())
+        .returning(DailyLog)
+    )
+    log = session.scalars(statement).first()
     if not log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="ログが見つかりません"
         )
-    
-    # いいねを追加
-    log.reaction_count += 1
-    log.updated_at = datetime.utcnow()
-    session.add(log)
     session.commit()
-    session.refresh(log)
     return log
 
 
 @router.put("/{log_id}/manager-comment", response_model=DailyLogResponse)
-async def update_manager_comment(
+def update_manager_comment(
     log_id: int,
     comment_data: ManagerCommentRequest,
     current_user: User = Depends(get_current_user),
@@ -291,25 +329,25 @@ async def update_manager_comment(
             detail="この操作にはマネージャー以上の権限が必要です"
         )
     
-    statement = select(DailyLog).where(DailyLog.id == log_id)
-    log = session.exec(statement).first()
+    # コメントを更新（承認＋次の一歩のヒントを重視）
+    statement = (
+        update(DailyLog)
+        .where(DailyLog.id == log_id)
+        .values(manager_comment=comment_data.comment, updated_at=datetime.utcnow())
+        .returning(DailyLog)
+    )
+    log = session.scalars(statement).first()
     if not log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="ログが見つかりません"
         )
-    
-    # コメントを更新（承認＋次の一歩のヒントを重視）
-    log.manager_comment = comment_data.comment
-    log.updated_at = datetime.utcnow()
-    session.add(log)
     session.commit()
-    session.refresh(log)
     return log
 
 
 @router.get("/chart/trend", response_model=List[dict])
-async def get_trend_chart_data(
+def get_trend_chart_data(
     department_id: Optional[int] = None,
     days: int = 14,
     current_user: User = Depends(get_current_user),
@@ -336,7 +374,7 @@ async def get_trend_chart_data(
 
 
 @router.get("/chart/departments-comparison", response_model=List[dict])
-async def get_departments_comparison_data(
+def get_departments_comparison_data(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
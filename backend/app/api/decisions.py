@@ -4,17 +4,25 @@ Decision API
 経営・マネージャー側の意思決定ログを管理するAPI
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Integer, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select
+from dataclasses import dataclass
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.core.database import get_session
-from app.models.decision import Decision, DecisionStatus
+from app.models.decision import Decision, DecisionStatus, InsightDecisionLink
+from app.models.insight import Insight
 from app.models.user import User
 from app.models.business_unit import BusinessUnit
-from app.api.deps import get_current_user, require_role
+from app.repositories.organization_repository import get_business_unit_cached
+from app.api.deps import get_current_tenant_id, get_current_user, require_role
 from datetime import datetime
 
-router = APIRouter()
+# DBアクセスが同期処理のため、ハンドラーは def で定義し
+# FastAPIのスレッドプールで実行させる（async def だとイベントループを塞いでしまう）
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class DecisionCreate(BaseModel):
@@ -46,12 +54,53 @@ class DecisionResponse(BaseModel):
     created_at: str
     updated_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+@dataclass(slots=True)
+class _DecisionRow:
+    """
+    一覧レスポンスの1行（DecisionResponse と同じ項目）
+
+    orjson がdataclassを直接シリアライズするため、行ごとのdict構築を省ける。
+    フィールドの順序は list_decisions の select の列順（末尾の total を除く）と一致させること。
+    """
+    id: int
+    tenant_id: int
+    business_unit_id: Optional[int]
+    business_unit_name: Optional[str]
+    title: str
+    content: str
+    status: DecisionStatus  # str Enum のため orjson が値の文字列に変換する
+    created_by_user_id: int
+    created_by_name: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+def _decision_payload(
+    decision: Decision,
+    business_unit_name: Optional[str],
+    created_by_name: Optional[str],
+) -> dict:
+    """DecisionResponse形式のレスポンスdictを構築"""
+    return {
+        "id": decision.id,
+        "tenant_id": decision.tenant_id,
+        "business_unit_id": decision.business_unit_id,
+        "business_unit_name": business_unit_name,
+        "title": decision.title,
+        "content": decision.content,
+        "status": decision.status,  # str Enum のため orjson が値の文字列に変換する
+        "created_by_user_id": decision.created_by_user_id,
+        "created_by_name": created_by_name,
+        "created_at": decision.created_at,  # orjson がISO 8601形式に変換する
+        "updated_at": decision.updated_at,
+    }
 
 
 @router.get("", response_model=List[DecisionResponse])
-async def list_decisions(
+def list_decisions(
     business_unit_id: Optional[int] = Query(None, description="事業部門IDで絞り込み"),
     status: Optional[DecisionStatus] = Query(None, description="ステータスで絞り込み"),
     skip: int = Query(0, ge=0),
@@ -65,7 +114,27 @@ async def list_decisions(
 
     権限: head/admin のみ
     """
-    statement = select(Decision)
+    # 事業部門名・作成者名は JOIN で同じクエリから取得し、レスポンスに必要な列だけを読む
+    # （ORMオブジェクトを生成しないため、行数に比例するハイドレーションのコストがかからない）
+    statement = select(
+        Decision.id,
+        Decision.tenant_id,
+        Decision.business_unit_id,
+        BusinessUnit.name.label("business_unit_name"),
+        Decision.title,
+        Decision.content,
+        Decision.status,
+        Decision.created_by_user_id,
+        User.full_name.label("created_by_name"),
+        Decision.created_at,
+        Decision.updated_at,
+        # 絞り込み後の総件数（ページングとは別のCOUNTクエリを発行せずに同じ結果から取得する）
+        func.count().over().label("total"),
+    ).select_from(Decision).outerjoin(
+        BusinessUnit, BusinessUnit.id == Decision.business_unit_id
+    ).outerjoin(
+        User, User.id == Decision.created_by_user_id
+    )
     
     # テナントで絞り込み
     if current_user.tenant_id:
@@ -80,37 +149,31 @@ async def list_decisions(
     # 新着順でソート
     statement = statement.order_by(Decision.created_at.desc()).offset(skip).limit(limit)
     
-    decisions = session.exec(statement).all()
+    rows = session.execute(statement).all()
+    
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # 範囲外のページでは行がなく総件数も得られないため、件数だけを取り直す
+        total = session.scalar(
+            statement.with_only_columns(func.count()).order_by(None).offset(None).limit(None)
+        )
+    else:
+        total = 0
     
-    result = []
-    for decision in decisions:
-        business_unit = None
-        if decision.business_unit_id:
-            business_unit = session.get(BusinessUnit, decision.business_unit_id)
-        
-        created_by = session.get(User, decision.created_by_user_id)
-        
-        result.append(DecisionResponse(
-            id=decision.id,
-            tenant_id=decision.tenant_id,
-            business_unit_id=decision.business_unit_id,
-            business_unit_name=business_unit.name if business_unit else None,
-            title=decision.title,
-            content=decision.content,
-            status=decision.status.value,
-            created_by_user_id=decision.created_by_user_id,
-            created_by_name=created_by.full_name if created_by else None,
-            created_at=decision.created_at.isoformat() if decision.created_at else "",
-            updated_at=decision.updated_at.isoformat() if decision.updated_at else ""
-        ))
+    # select の列順が _DecisionRow のフィールド順と同じため、行をそのまま展開して渡す（末尾の total は除く）
+    result = [_DecisionRow(*row[:-1]) for row in rows]
     
-    return result
+    # 自前で組み立てた値なので、レスポンスモデルでの再検証を省いてそのまま返す
+    # 総件数はレスポンス形式を変えないよう X-Total-Count ヘッダーで返す
+    return ORJSONResponse(result, headers={"X-Total-Count": str(total)})
 
 
 @router.post("", response_model=DecisionResponse, status_code=status.HTTP_201_CREATED)
-async def create_decision(
+def create_decision(
     decision_data: DecisionCreate,
     current_user: User = Depends(get_current_user),
+    tenant_id: int = Depends(get_current_tenant_id),
     session: Session = Depends(get_session),
     _: None = Depends(require_role("head", "admin"))
 ):
@@ -119,29 +182,14 @@ async def create_decision(
 
     権限: head/admin のみ
     """
-    # テナントIDを取得
-    tenant_id = current_user.tenant_id
-    if not tenant_id:
-        from app.models.tenant import Tenant
-        statement = select(Tenant).where(Tenant.name == "mikamo")
-        tenant = session.exec(statement).first()
-        if tenant:
-            tenant_id = tenant.id
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="テナントが見つかりません"
-            )
-    
     # 事業部門の確認
     business_unit_id = decision_data.business_unit_id
-    if business_unit_id:
-        business_unit = session.get(BusinessUnit, business_unit_id)
-        if not business_unit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="事業部門が見つかりません"
-            )
+    business_unit = get_business_unit_cached(session, business_unit_id)
+    if business_unit_id and not business_unit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="事業部門が見つかりません"
+        )
     
     # Decisionを作成
     decision = Decision(
@@ -153,35 +201,35 @@ async def create_decision(
         created_by_user_id=current_user.id
     )
     session.add(decision)
-    session.commit()
-    session.refresh(decision)
-    
-    # 関連Insightとの紐づけ（将来的に中間テーブルで実装）
-    # 今回は一旦スキップ
+    session.flush()
     
-    # レスポンスを構築
-    business_unit = None
-    if decision.business_unit_id:
-        business_unit = session.get(BusinessUnit, decision.business_unit_id)
-    created_by = session.get(User, decision.created_by_user_id)
+    # 関連Insightとの紐づけ（1回の INSERT ... SELECT でまとめて登録）
+    # 同じテナントに存在するInsightのみ紐づけ、重複したIDは無視する
+    if decision_data.related_insight_ids:
+        session.execute(
+            pg_insert(InsightDecisionLink).from_select(
+                ["insight_id", "decision_id"],
+                select(Insight.id, literal(decision.id, Integer)).where(
+                    Insight.id.in_(set(decision_data.related_insight_ids)),
+                    Insight.tenant_id == tenant_id
+                )
+            ).on_conflict_do_nothing()
+        )
+    session.commit()
     
-    return DecisionResponse(
-        id=decision.id,
-        tenant_id=decision.tenant_id,
-        business_unit_id=decision.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=decision.title,
-        content=decision.content,
-        status=decision.status.value,
-        created_by_user_id=decision.created_by_user_id,
-        created_by_name=created_by.full_name if created_by else None,
-        created_at=decision.created_at.isoformat() if decision.created_at else "",
-        updated_at=decision.updated_at.isoformat() if decision.updated_at else ""
+    # レスポンスを構築（事業部門は存在確認で取得済み、作成者は現在のユーザー）
+    return ORJSONResponse(
+        _decision_payload(
+            decision,
+            business_unit.name if business_unit else None,
+            current_user.full_name
+        ),
+        status_code=status.HTTP_201_CREATED
     )
 
 
 @router.patch("/{decision_id}", response_model=DecisionResponse)
-async def update_decision(
+def update_decision(
     decision_id: int,
     decision_data: DecisionUpdate,
     current_user: User = Depends(get_current_user),
@@ -205,28 +253,21 @@ async def update_decision(
     for key, value in update_data.items():
         setattr(decision, key, value)
     
-    decision.updated_at = datetime.utcnow()
+    # 変更がないPATCHでもUPDATEを発行して更新日時を進める（onupdateはUPDATE時のみ発火するため）
+    decision.updated_at = func.timezone("utc", func.now())
     session.add(decision)
     session.commit()
-    session.refresh(decision)
     
-    # レスポンスを構築
-    business_unit = None
-    if decision.business_unit_id:
-        business_unit = session.get(BusinessUnit, decision.business_unit_id)
-    created_by = session.get(User, decision.created_by_user_id)
+    # レスポンスを構築（事業部門はキャッシュ経由、作成者が自分ならユーザーの再取得を省く）
+    business_unit = get_business_unit_cached(session, decision.business_unit_id)
+    if decision.created_by_user_id == current_user.id:
+        created_by = current_user
+    else:
+        created_by = session.get(User, decision.created_by_user_id) if decision.created_by_user_id else None
     
-    return DecisionResponse(
-        id=decision.id,
-        tenant_id=decision.tenant_id,
-        business_unit_id=decision.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=decision.title,
-        content=decision.content,
-        status=decision.status.value,
-        created_by_user_id=decision.created_by_user_id,
-        created_by_name=created_by.full_name if created_by else None,
-        created_at=decision.created_at.isoformat() if decision.created_at else "",
-        updated_at=decision.updated_at.isoformat() if decision.updated_at else ""
-    )
+    return ORJSONResponse(_decision_payload(
+        decision,
+        business_unit.name if business_unit else None,
+        created_by.full_name if created_by else None
+    ))
 
@@ -1,18 +1,24 @@
 """
 認証・権限チェックの依存関係
 """
+from functools import lru_cache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import lambda_stmt
 from sqlmodel import Session, select
 from typing import Optional
 from app.core.database import get_session
 from app.core.security import decode_access_token
 from app.models.user import User, Department
+from app.repositories.organization_repository import get_department_cached, get_tenant_id_by_name_cached
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# DBを参照する依存関数は同期セッションを使うため def で定義し、FastAPIのスレッドプールで実行させる
+# （DBを参照しない check_role は async def のままにして、スレッド切り替えを省く）
 
-async def get_current_user(
+
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     session: Session = Depends(get_session)
 ) -> User:
@@ -25,6 +31,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    # 署名の検証結果は decode_access_token 側で有効期限までキャッシュされる
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
@@ -39,8 +46,10 @@ async def get_current_user(
     except (ValueError, TypeError):
         raise credentials_exception
     
-    statement = select(User).where(User.id == user_id)
-    user = session.exec(statement).first()
+    # ロール・所属・有効/無効の変更をすぐに反映するため、ユーザーはキャッシュせず毎回主キーで取得する
+    # 全リクエストで実行されるため lambda_stmt でSQL構築・キャッシュキー生成を省く
+    statement = lambda_stmt(lambda: select(User).where(User.id == user_id))
+    user = session.scalars(statement).first()
     if user is None:
         raise credentials_exception
     
@@ -53,15 +62,35 @@ async def get_current_user(
     return user
 
 
-async def get_current_user_with_department(
+def get_current_tenant_id(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+) -> int:
+    """
+    作成するデータの所属テナントIDを取得
+
+    テナントIDが未設定のユーザーはデフォルトでmikamoテナントを使用する（IDはキャッシュ経由で取得）。
+    依存関係としてリクエスト内で1度だけ解決される。
+    """
+    tenant_id = current_user.tenant_id or get_tenant_id_by_name_cached(session, "mikamo")
+    if not tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="テナントが見つかりません"
+        )
+    return tenant_id
+
+
+def get_current_user_with_department(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ) -> tuple[User, Department]:
     """
     現在のユーザーと部署を取得
+
+    部署はほとんど変更されないため、キャッシュ経由で取得する（読み取り専用として扱うこと）
     """
-    statement = select(Department).where(Department.id == current_user.department_id)
-    department = session.exec(statement).first()
+    department = get_department_cached(session, current_user.department_id)
     if department is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -70,27 +99,31 @@ async def get_current_user_with_department(
     return current_user, department
 
 
+@lru_cache(maxsize=None)
 def require_department(*allowed_codes: str):
     """
     部署コードによる権限チェックデコレータ
     使用例: @router.get("/", dependencies=[Depends(require_department("head", "mnet"))])
     """
-    async def check_department(
+    allowed = frozenset(allowed_codes)
+    detail = f"この操作には {', '.join(allowed_codes)} の権限が必要です"
+
+    def check_department(
         current_user: User = Depends(get_current_user),
         session: Session = Depends(get_session)
     ) -> User:
-        statement = select(Department).where(Department.id == current_user.department_id)
-        department = session.exec(statement).first()
+        # 全リクエストで参照するため、キャッシュ経由で取得する
+        department = get_department_cached(session, current_user.department_id)
         if department is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="部署が見つかりません"
             )
         
-        if department.code not in allowed_codes:
+        if department.code not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"この操作には {', '.join(allowed_codes)} の権限が必要です"
+                detail=detail
             )
         
         return current_user
@@ -98,6 +131,15 @@ def require_department(*allowed_codes: str):
     return check_department
 
 
+_ROLE_NAMES = {
+    "staff": "スタッフ",
+    "manager": "マネージャー",
+    "head": "本部",
+    "admin": "管理者"
+}
+
+
+@lru_cache(maxsize=None)
 def require_role(*allowed_roles: str):
     """
     ロールによる権限チェックデコレータ
@@ -111,21 +153,20 @@ def require_role(*allowed_roles: str):
     - manager: 部門責任者（自分の部門全体を見られる）
     - head: 本部（全部門を横断して見られる）
     - admin: システム管理者（全機能にアクセス可能）
+    
+    同じロールの組み合わせでは同じ依存関数を返す（lru_cache）。
+    ロールの集合とエラーメッセージは生成時に1度だけ組み立てる。
     """
+    allowed = frozenset(allowed_roles)
+    detail = f"この操作には {', '.join(_ROLE_NAMES.get(r, r) for r in allowed_roles)} の権限が必要です"
+
     async def check_role(
         current_user: User = Depends(get_current_user)
     ) -> User:
-        if current_user.role not in allowed_roles:
-            role_names = {
-                "staff": "スタッフ",
-                "manager": "マネージャー",
-                "head": "本部",
-                "admin": "管理者"
-            }
-            allowed_names = [role_names.get(r, r) for r in allowed_roles]
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"この操作には {', '.join(allowed_names)} の権限が必要です"
+                detail=detail
             )
         return current_user
     
@@ -133,17 +174,22 @@ def require_role(*allowed_roles: str):
 
 
 # よく使う権限チェックのショートカット
+# 依存関数はモジュール読み込み時に1度だけ生成し、全ルートで同じインスタンスを共有する
+_admin_only = require_role("admin")
+_manager_or_head = require_role("manager", "head", "admin")
+_head_or_admin = require_role("head", "admin")
+
+
 def require_admin():
     """管理者のみアクセス可能"""
-    return require_role("admin")
+    return _admin_only
 
 
 def require_manager_or_head():
     """マネージャーまたは本部のみアクセス可能"""
-    return require_role("manager", "head", "admin")
+    return _manager_or_head
 
 
 def require_head_or_admin():
     """本部または管理者のみアクセス可能"""
-    return require_role("head", "admin")
-
+    return _head_or_admin
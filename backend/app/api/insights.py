@@ -4,17 +4,23 @@ Insight API
 AIによる分析・提案を管理するAPI
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
 from sqlmodel import Session, select
+from dataclasses import dataclass
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from app.core.database import get_session
 from app.models.insight import Insight, InsightType
 from app.models.user import User
 from app.models.business_unit import BusinessUnit
-from app.api.deps import get_current_user, require_role
+from app.repositories.organization_repository import get_business_unit_cached
+from app.api.deps import get_current_tenant_id, get_current_user, require_role
 from datetime import datetime
 
-router = APIRouter()
+# DBアクセスが同期処理のため、ハンドラーは def で定義し
+# FastAPIのスレッドプールで実行させる（async def だとイベントループを塞いでしまう）
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class InsightCreate(BaseModel):
@@ -49,16 +55,55 @@ class InsightResponse(BaseModel):
     created_at: str
     updated_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-# Fieldをインポート
-from pydantic import Field
+@dataclass(slots=True)
+class _InsightRow:
+    """
+    一覧レスポンスの1行（InsightResponse と同じ項目）
+
+    orjson がdataclassを直接シリアライズするため、行ごとのdict構築を省ける。
+    フィールドの順序は list_insights の select の列順と一致させること。
+    """
+    id: int
+    tenant_id: int
+    business_unit_id: Optional[int]
+    business_unit_name: Optional[str]
+    title: str
+    content: str
+    type: InsightType  # str Enum のため orjson が値の文字列に変換する
+    score: int
+    created_by: Optional[int]
+    created_by_name: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+def _insight_payload(
+    insight: Insight,
+    business_unit_name: Optional[str],
+    created_by_name: Optional[str],
+) -> dict:
+    """InsightResponse形式のレスポンスdictを構築"""
+    return {
+        "id": insight.id,
+        "tenant_id": insight.tenant_id,
+        "business_unit_id": insight.business_unit_id,
+        "business_unit_name": business_unit_name,
+        "title": insight.title,
+        "content": insight.content,
+        "type": insight.type,  # str Enum のため orjson が値の文字列に変換する
+        "score": insight.score,
+        "created_by": insight.created_by,
+        "created_by_name": created_by_name,
+        "created_at": insight.created_at,  # orjson がISO 8601形式に変換する
+        "updated_at": insight.updated_at,
+    }
 
 
 @router.get("", response_model=List[InsightResponse])
-async def list_insights(
+def list_insights(
     business_unit_id: Optional[int] = Query(None, description="事業部門IDで絞り込み"),
     type: Optional[InsightType] = Query(None, description="タイプで絞り込み"),
     min_score: Optional[int] = Query(None, ge=0, le=100, description="最小スコア"),
@@ -74,7 +119,26 @@ async def list_insights(
     - staff/manager: 自分の事業部門 + 全社共通のInsightのみ閲覧可能
     - head/admin: 全部門のInsightを閲覧可能
     """
-    statement = select(Insight)
+    # 事業部門名・作成者名は JOIN で同じクエリから取得し、レスポンスに必要な列だけを読む
+    # （ORMオブジェクトを生成しないため、行数に比例するハイドレーションのコストがかからない）
+    statement = select(
+        Insight.id,
+        Insight.tenant_id,
+        Insight.business_unit_id,
+        BusinessUnit.name.label("business_unit_name"),
+        Insight.title,
+        Insight.content,
+        Insight.type,
+        Insight.score,
+        Insight.created_by,
+        User.full_name.label("created_by_name"),
+        Insight.created_at,
+        Insight.updated_at,
+    ).select_from(Insight).outerjoin(
+        BusinessUnit, BusinessUnit.id == Insight.business_unit_id
+    ).outerjoin(
+        User, User.id == Insight.created_by
+    )
     
     # テナントで絞り込み
     if current_user.tenant_id:
@@ -105,40 +169,20 @@ async def list_insights(
     # スコアの高い順でソート
     statement = statement.order_by(Insight.score.desc(), Insight.created_at.desc()).offset(skip).limit(limit)
     
-    insights = session.exec(statement).all()
-    
-    result = []
-    for insight in insights:
-        business_unit = None
-        if insight.business_unit_id:
-            business_unit = session.get(BusinessUnit, insight.business_unit_id)
-        
-        created_by = None
-        if insight.created_by:
-            created_by = session.get(User, insight.created_by)
-        
-        result.append(InsightResponse(
-            id=insight.id,
-            tenant_id=insight.tenant_id,
-            business_unit_id=insight.business_unit_id,
-            business_unit_name=business_unit.name if business_unit else None,
-            title=insight.title,
-            content=insight.content,
-            type=insight.type.value,
-            score=insight.score,
-            created_by=insight.created_by,
-            created_by_name=created_by.full_name if created_by else None,
-            created_at=insight.created_at.isoformat() if insight.created_at else "",
-            updated_at=insight.updated_at.isoformat() if insight.updated_at else ""
-        ))
+    rows = session.execute(statement).all()
+
+    # select の列順が _InsightRow のフィールド順と同じため、行をそのまま展開して渡す
+    result = [_InsightRow(*row) for row in rows]
     
-    return result
+    # 自前で組み立てた値なので、レスポンスモデルでの再検証を省いてそのまま返す
+    return ORJSONResponse(result)
 
 
 @router.post("", response_model=InsightResponse, status_code=status.HTTP_201_CREATED)
-async def create_insight(
+def create_insight(
     insight_data: InsightCreate,
     current_user: User = Depends(get_current_user),
+    tenant_id: int = Depends(get_current_tenant_id),
     session: Session = Depends(get_session)
 ):
     """
@@ -146,29 +190,14 @@ async def create_insight(
     
     権限: head/admin のみ
     """
-    # テナントIDを取得
-    tenant_id = current_user.tenant_id
-    if not tenant_id:
-        from app.models.tenant import Tenant
-        statement = select(Tenant).where(Tenant.name == "mikamo")
-        tenant = session.exec(statement).first()
-        if tenant:
-            tenant_id = tenant.id
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="テナントが見つかりません"
-            )
-    
     # 事業部門の確認
     business_unit_id = insight_data.business_unit_id
-    if business_unit_id:
-        business_unit = session.get(BusinessUnit, business_unit_id)
-        if not business_unit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="事業部門が見つかりません"
-            )
+    business_unit = get_business_unit_cached(session, business_unit_id)
+    if business_unit_id and not business_unit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="事業部門が見つかりません"
+        )
     
     # Insightを作成
     insight = Insight(
@@ -182,34 +211,20 @@ async def create_insight(
     )
     session.add(insight)
     session.commit()
-    session.refresh(insight)
     
-    # レスポンスを構築
-    business_unit = None
-    if insight.business_unit_id:
-        business_unit = session.get(BusinessUnit, insight.business_unit_id)
-    created_by = None
-    if insight.created_by:
-        created_by = session.get(User, insight.created_by)
-    
-    return InsightResponse(
-        id=insight.id,
-        tenant_id=insight.tenant_id,
-        business_unit_id=insight.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=insight.title,
-        content=insight.content,
-        type=insight.type.value,
-        score=insight.score,
-        created_by=insight.created_by,
-        created_by_name=created_by.full_name if created_by else None,
-        created_at=insight.created_at.isoformat() if insight.created_at else "",
-        updated_at=insight.updated_at.isoformat() if insight.updated_at else ""
+    # レスポンスを構築（事業部門は存在確認で取得済み、作成者は現在のユーザー）
+    return ORJSONResponse(
+        _insight_payload(
+            insight,
+            business_unit.name if business_unit else None,
+            current_user.full_name
+        ),
+        status_code=status.HTTP_201_CREATED
     )
 
 
 @router.patch("/{insight_id}", response_model=InsightResponse)
-async def update_insight(
+def update_insight(
     insight_id: int,
     insight_data: InsightUpdate,
     current_user: User = Depends(get_current_user),
@@ -233,31 +248,21 @@ async def update_insight(
     for key, value in update_data.items():
         setattr(insight, key, value)
     
-    insight.updated_at = datetime.utcnow()
+    # 変更がないPATCHでもUPDATEを発行して更新日時を進める（onupdateはUPDATE時のみ発火するため）
+    insight.updated_at = func.timezone("utc", func.now())
     session.add(insight)
     session.commit()
-    session.refresh(insight)
     
-    # レスポンスを構築
-    business_unit = None
-    if insight.business_unit_id:
-        business_unit = session.get(BusinessUnit, insight.business_unit_id)
-    created_by = None
-    if insight.created_by:
-        created_by = session.get(User, insight.created_by)
+    # レスポンスを構築（事業部門はキャッシュ経由、作成者が自分ならユーザーの再取得を省く）
+    business_unit = get_business_unit_cached(session, insight.business_unit_id)
+    if insight.created_by == current_user.id:
+        created_by = current_user
+    else:
+        created_by = session.get(User, insight.created_by) if insight.created_by else None
     
-    return InsightResponse(
-        id=insight.id,
-        tenant_id=insight.tenant_id,
-        business_unit_id=insight.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=insight.title,
-        content=insight.content,
-        type=insight.type.value,
-        score=insight.score,
-        created_by=insight.created_by,
-        created_by_name=created_by.full_name if created_by else None,
-        created_at=insight.created_at.isoformat() if insight.created_at else "",
-        updated_at=insight.updated_at.isoformat() if insight.updated_at else ""
-    )
+    return ORJSONResponse(_insight_payload(
+        insight,
+        business_unit.name if business_unit else None,
+        created_by.full_name if created_by else None
+    ))
 
@@ -4,17 +4,25 @@ Issue API
 現場での"困りごと"・トピックを管理するAPI
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import lambda_stmt
+from sqlalchemy.orm import raiseload, selectinload
 from sqlmodel import Session, select, or_
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.core.database import get_session
 from app.models.issue import Issue, IssueStatus, IssueTopic
 from app.models.user import User
 from app.models.business_unit import BusinessUnit
-from app.api.deps import get_current_user, require_role
+from app.repositories.organization_repository import get_business_unit_cached
+from app.api.deps import get_current_tenant_id, get_current_user, require_role
 from datetime import datetime
 
-router = APIRouter()
+# ハンドラーは組み立て済みの ORJSONResponse を返すため、レスポンスモデルは response_model ではなく
+# responses でOpenAPIのスキーマとしてのみ指定する（ルートごとの検証用フィールドの生成を省く）
+# DBアクセスが同期処理のため、ハンドラーは def で定義し
+# FastAPIのスレッドプールで実行させる（async def だとイベントループを塞いでしまう）
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class IssueCreate(BaseModel):
@@ -50,12 +58,50 @@ class IssueResponse(BaseModel):
     created_at: str
     updated_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-@router.get("", response_model=List[IssueResponse])
-async def list_issues(
+def _issue_payload(
+    issue: Issue,
+    business_unit_name: Optional[str],
+    created_by_name: Optional[str],
+) -> dict:
+    """IssueResponse形式のレスポンスdictを構築"""
+    return {
+        "id": issue.id,
+        "tenant_id": issue.tenant_id,
+        "business_unit_id": issue.business_unit_id,
+        "business_unit_name": business_unit_name,
+        "title": issue.title,
+        "description": issue.description,
+        # str Enum のため orjson が値の文字列に変換する
+        "status": issue.status,
+        "topic": issue.topic,
+        "created_by_user_id": issue.created_by_user_id,
+        "created_by_name": created_by_name,
+        "conversation_id": issue.conversation_id,
+        "created_at": issue.created_at,  # orjson がISO 8601形式に変換する
+        "updated_at": issue.updated_at,
+    }
+
+
+def _issue_detail_payload(session: Session, issue: Issue, current_user: User) -> dict:
+    """単体の取得・更新用に、事業部門名・作成者名を解決してレスポンスdictを構築"""
+    business_unit = get_business_unit_cached(session, issue.business_unit_id)
+    # 作成者が自分ならユーザーの取得を省く
+    if issue.created_by_user_id == current_user.id:
+        created_by = current_user
+    else:
+        created_by = session.get(User, issue.created_by_user_id)
+    return _issue_payload(
+        issue,
+        business_unit.name if business_unit else None,
+        created_by.full_name if created_by else None
+    )
+
+
+@router.get("", responses={200: {"model": List[IssueResponse]}})
+def list_issues(
     business_unit_id: Optional[int] = Query(None, description="事業部門IDで絞り込み"),
     status: Optional[IssueStatus] = Query(None, description="ステータスで絞り込み"),
     topic: Optional[IssueTopic] = Query(None, description="トピックで絞り込み"),
@@ -71,95 +117,79 @@ async def list_issues(
     - staff/manager: 自分の事業部門のIssueのみ閲覧可能
     - head/admin: 全部門のIssueを閲覧可能
     """
-    statement = select(Issue)
+    # 事業部門・作成者はselectinloadでまとめて取得（Issueごとのクエリを避け、IN句の2クエリにする）
+    # レスポンスには名前しか使わないため、読み込む列も絞る
+    # 一覧は頻繁に呼ばれるため lambda_stmt で組み立て、絞り込みの組み合わせごとにSQL構築・キャッシュキー生成を省く
+    # （ラムダ内で参照する値はバインドパラメータになるため、ローカル変数に取り出してから使う）
+    statement = lambda_stmt(lambda: select(Issue).options(
+        selectinload(Issue.business_unit).load_only(BusinessUnit.name),
+        selectinload(Issue.created_by).load_only(User.full_name),
+        raiseload("*"),  # それ以外のリレーションへのアクセスは遅延読み込みせずエラーにする
+    ))
     
     # テナントで絞り込み
-    if current_user.tenant_id:
-        statement = statement.where(Issue.tenant_id == current_user.tenant_id)
+    tenant_id = current_user.tenant_id
+    if tenant_id:
+        statement += lambda s: s.where(Issue.tenant_id == tenant_id)
     
     # ロールに応じた権限チェック
     if current_user.role in ["staff", "manager"]:
         # 自分の事業部門のみ
-        if current_user.business_unit_id:
-            statement = statement.where(Issue.business_unit_id == current_user.business_unit_id)
+        own_business_unit_id = current_user.business_unit_id
+        if own_business_unit_id:
+            statement += lambda s: s.where(Issue.business_unit_id == own_business_unit_id)
         else:
             return []
     
     # フィルター
     if business_unit_id:
-        statement = statement.where(Issue.business_unit_id == business_unit_id)
+        statement += lambda s: s.where(Issue.business_unit_id == business_unit_id)
     if status:
-        statement = statement.where(Issue.status == status)
+        statement += lambda s: s.where(Issue.status == status)
     if topic:
-        statement = statement.where(Issue.topic == topic)
+        statement += lambda s: s.where(Issue.topic == topic)
     
     # 新着順でソート
-    statement = statement.order_by(Issue.created_at.desc()).offset(skip).limit(limit)
+    statement += lambda s: s.order_by(Issue.created_at.desc()).offset(skip).limit(limit)
     
-    issues = session.exec(statement).all()
+    issues = session.scalars(statement).all()
     
     result = []
     for issue in issues:
-        business_unit = None
-        if issue.business_unit_id:
-            business_unit = session.get(BusinessUnit, issue.business_unit_id)
-        
-        created_by = session.get(User, issue.created_by_user_id)
+        business_unit = issue.business_unit
+        created_by = issue.created_by
         
-        result.append(IssueResponse(
-            id=issue.id,
-            tenant_id=issue.tenant_id,
-            business_unit_id=issue.business_unit_id,
-            business_unit_name=business_unit.name if business_unit else None,
-            title=issue.title,
-            description=issue.description,
-            status=issue.status.value,
-            topic=issue.topic.value,
-            created_by_user_id=issue.created_by_user_id,
-            created_by_name=created_by.full_name if created_by else None,
-            conversation_id=issue.conversation_id,
-            created_at=issue.created_at.isoformat() if issue.created_at else "",
-            updated_at=issue.updated_at.isoformat() if issue.updated_at else ""
+        result.append(_issue_payload(
+            issue,
+            business_unit.name if business_unit else None,
+            created_by.full_name if created_by else None,
         ))
     
-    return result
+    # 自前で組み立てた値なので、レスポンスモデルでの再検証を省いてそのまま返す
+    return ORJSONResponse(result)
 
 
-@router.post("", response_model=IssueResponse, status_code=status.HTTP_201_CREATED)
-async def create_issue(
+@router.post("", status_code=status.HTTP_201_CREATED, responses={201: {"model": IssueResponse}})
+def create_issue(
     issue_data: IssueCreate,
     current_user: User = Depends(get_current_user),
+    tenant_id: int = Depends(get_current_tenant_id),
     session: Session = Depends(get_session)
 ):
     """
     Issueを作成
     """
-    # テナントIDを取得
-    tenant_id = current_user.tenant_id
-    if not tenant_id:
-        from app.models.tenant import Tenant
-        statement = select(Tenant).where(Tenant.name == "mikamo")
-        tenant = session.exec(statement).first()
-        if tenant:
-            tenant_id = tenant.id
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="テナントが見つかりません"
-            )
-    
     # 事業部門の確認
     business_unit_id = issue_data.business_unit_id
     if not business_unit_id:
         business_unit_id = current_user.business_unit_id
     
-    if business_unit_id:
-        business_unit = session.get(BusinessUnit, business_unit_id)
-        if not business_unit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="事業部門が見つかりません"
-            )
+    business_unit = get_business_unit_cached(session, business_unit_id)
+    if business_unit_id and not business_unit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="事業部門が見つかりません"
+        )
     
     # Issueを作成
     issue = Issue(
@@ -174,33 +204,22 @@ async def create_issue(
     )
     session.add(issue)
     session.commit()
-    session.refresh(issue)
     
-    # レスポンスを構築
-    business_unit = None
-    if issue.business_unit_id:
-        business_unit = session.get(BusinessUnit, issue.business_unit_id)
-    created_by = session.get(User, issue.created_by_user_id)
+    # レスポンスを構築（事業部門は存在確認で取得済み、作成者は現在のユーザー）
+    created_by = current_user
     
-    return IssueResponse(
-        id=issue.id,
-        tenant_id=issue.tenant_id,
-        business_unit_id=issue.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=issue.title,
-        description=issue.description,
-        status=issue.status.value,
-        topic=issue.topic.value,
-        created_by_user_id=issue.created_by_user_id,
-        created_by_name=created_by.full_name if created_by else None,
-        conversation_id=issue.conversation_id,
-        created_at=issue.created_at.isoformat() if issue.created_at else "",
-        updated_at=issue.updated_at.isoformat() if issue.updated_at else ""
+    return ORJSONResponse(
+        _issue_payload(
+            issue,
+            business_unit.name if business_unit else None,
+            created_by.full_name if created_by else None,
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
-@router.get("/{issue_id}", response_model=IssueResponse)
-async def get_issue(
+@router.get("/{issue_id}", responses={200: {"model": IssueResponse}})
+def get_issue(
     issue_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
@@ -223,30 +242,11 @@ async def get_issue(
                 detail="このIssueを閲覧する権限がありません"
             )
     
-    business_unit = None
-    if issue.business_unit_id:
-        business_unit = session.get(BusinessUnit, issue.business_unit_id)
-    created_by = session.get(User, issue.created_by_user_id)
-    
-    return IssueResponse(
-        id=issue.id,
-        tenant_id=issue.tenant_id,
-        business_unit_id=issue.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=issue.title,
-        description=issue.description,
-        status=issue.status.value,
-        topic=issue.topic.value,
-        created_by_user_id=issue.created_by_user_id,
-        created_by_name=created_by.full_name if created_by else None,
-        conversation_id=issue.conversation_id,
-        created_at=issue.created_at.isoformat() if issue.created_at else "",
-        updated_at=issue.updated_at.isoformat() if issue.updated_at else ""
-    )
+    return ORJSONResponse(_issue_detail_payload(session, issue, current_user))
 
 
-@router.patch("/{issue_id}", response_model=IssueResponse)
-async def update_issue(
+@router.patch("/{issue_id}", responses={200: {"model": IssueResponse}})
+def update_issue(
     issue_id: int,
     issue_data: IssueUpdate,
     current_user: User = Depends(get_current_user),
@@ -280,27 +280,6 @@ async def update_issue(
     issue.updated_at = datetime.utcnow()
     session.add(issue)
     session.commit()
-    session.refresh(issue)
-    
-    # レスポンスを構築
-    business_unit = None
-    if issue.business_unit_id:
-        business_unit = session.get(BusinessUnit, issue.business_unit_id)
-    created_by = session.get(User, issue.created_by_user_id)
     
-    return IssueResponse(
-        id=issue.id,
-        tenant_id=issue.tenant_id,
-        business_unit_id=issue.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=issue.title,
-        description=issue.description,
-        status=issue.status.value,
-        topic=issue.topic.value,
-        created_by_user_id=issue.created_by_user_id,
-        created_by_name=created_by.full_name if created_by else None,
-        conversation_id=issue.conversation_id,
-        created_at=issue.created_at.isoformat() if issue.created_at else "",
-        updated_at=issue.updated_at.isoformat() if issue.updated_at else ""
-    )
+    return ORJSONResponse(_issue_detail_payload(session, issue, current_user))
 
@@ -5,17 +5,27 @@
 を管理するAPI
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy import tuple_
 from sqlmodel import Session, select, or_
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.core.database import get_session
 from app.models.knowledge_item import KnowledgeItem
 from app.models.user import User
 from app.models.business_unit import BusinessUnit
-from app.api.deps import get_current_user, require_role
+from app.repositories.organization_repository import get_business_unit_cached
+from app.api.deps import get_current_tenant_id, get_current_user, require_role
+from app.repositories.knowledge_repository import invalidate_knowledge_context_cache
+from app.services.ai.answer_cache import invalidate_answer_cache
 from datetime import datetime
 
-router = APIRouter()
+# ハンドラーは組み立て済みの ORJSONResponse を返すため、レスポンスモデルは response_model ではなく
+# responses でOpenAPIのスキーマとしてのみ指定する（ルートごとの検証用フィールドの生成を省く）
+# DBアクセスが同期処理のため、ハンドラーは def で定義し
+# FastAPIのスレッドプールで実行させる（async def だとイベントループを塞いでしまう）
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # リクエスト/レスポンスモデル
@@ -56,33 +66,108 @@ class KnowledgeItemResponse(BaseModel):
     created_at: str
     updated_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-@router.get("", response_model=List[KnowledgeItemResponse])
-async def list_knowledge_items(
+def _knowledge_item_payload(
+    item: KnowledgeItem,
+    business_unit_name: Optional[str],
+    created_by_name: Optional[str],
+) -> dict:
+    """KnowledgeItemResponse形式のレスポンスdictを構築"""
+    return {
+        "id": item.id,
+        "tenant_id": item.tenant_id,
+        "business_unit_id": item.business_unit_id,
+        "business_unit_name": business_unit_name,
+        "title": item.title,
+        "content": item.content,
+        "category": item.category,
+        "source": item.source,
+        "tags": item.tags,
+        "created_by": item.created_by,
+        "created_by_name": created_by_name,
+        "updated_by": item.updated_by,
+        "created_at": item.created_at,  # orjson がISO 8601形式に変換する
+        "updated_at": item.updated_at,
+    }
+
+
+def _knowledge_item_detail_payload(session: Session, item: KnowledgeItem, current_user: User) -> dict:
+    """単体の取得・更新用に、事業部門名・作成者名を解決してレスポンスdictを構築"""
+    business_unit = get_business_unit_cached(session, item.business_unit_id)
+    # 作成者が自分ならユーザーの取得を省く
+    if item.created_by == current_user.id:
+        creator = current_user
+    else:
+        creator = session.get(User, item.created_by)
+    return _knowledge_item_payload(
+        item,
+        business_unit.name if business_unit else None,
+        creator.full_name if creator else None
+    )
+
+
+def _encode_cursor(item: KnowledgeItem) -> str:
+    """キーセットページング用のカーソル（"作成日時_ID"）を作成"""
+    return f"{item.created_at.isoformat()}_{item.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """カーソルを (作成日時, ID) に変換"""
+    try:
+        created_at, item_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルの形式が正しくありません"
+        )
+
+
+def _invalidate_knowledge_caches() -> None:
+    """ナレッジに依存するキャッシュ（検索コンテキスト・AI応答）を破棄"""
+    invalidate_knowledge_context_cache()
+    invalidate_answer_cache()
+
+
+@router.get("", responses={200: {"model": List[KnowledgeItemResponse]}})
+def list_knowledge_items(
     q: Optional[str] = Query(None, description="検索クエリ（タイトル・本文から検索）"),
     business_unit_id: Optional[int] = Query(None, description="事業部門IDで絞り込み"),
     tag: Optional[str] = Query(None, description="タグで絞り込み"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="前ページの X-Next-Cursor（指定時は skip を無視）"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
-    ナレッジアイテム一覧を取得
+    ナレッジアイテム一覧を取得（作成日時の新しい順）
     
     検索条件:
     - q: 全文検索（タイトル・本文）
     - business_unit_id: 事業部門ID
     - tag: タグ
     
+    ページング:
+    - skip/limit: オフセット指定（limit は最大100件）
+    - cursor: キーセット指定（深いページでもOFFSET分の読み飛ばしが発生しない）
+    - 続きがある場合は次ページのカーソルを X-Next-Cursor ヘッダーで返す
+    
     権限:
     - 自分のテナントのナレッジのみ閲覧可能
     - staff/manager: 自分の事業部門 + 全社共通（business_unit_id=None）
     - head/admin: 全部門のナレッジを閲覧可能
     """
     # テナントで絞り込み（将来のマルチテナント対応）
-    statement = select(KnowledgeItem)
+    # 事業部門・作成者はselectinloadでまとめて取得（アイテムごとのクエリを避け、IN句の2クエリにする）
+    # レスポンスには名前しか使わないため、読み込む列も絞る
+    statement = select(KnowledgeItem).options(
+        selectinload(KnowledgeItem.business_unit).load_only(BusinessUnit.name),
+        selectinload(KnowledgeItem.creator).load_only(User.full_name),
+        raiseload("*"),  # それ以外のリレーションへのアクセスは遅延読み込みせずエラーにする
+    )
     
     if current_user.tenant_id:
         statement = statement.where(KnowledgeItem.tenant_id == current_user.tenant_id)
@@ -100,11 +185,13 @@ async def list_knowledge_items(
     
     # 検索条件
     if q:
-        # シンプルな全文検索（将来的にベクトル検索に拡張可能）
+        # 部分一致検索（LIKE '%q%'）。title/content のトライグラムGINインデックスで検索される
+        # q に含まれる % や _ はワイルドカードとして扱わず、文字そのものとして検索する
+        # （日本語は単語で区切られないため、tsvector ではなく pg_trgm を使う。将来的にベクトル検索に拡張可能）
         statement = statement.where(
             or_(
-                KnowledgeItem.title.contains(q),
-                KnowledgeItem.content.contains(q)
+                KnowledgeItem.title.contains(q, autoescape=True),
+                KnowledgeItem.content.contains(q, autoescape=True)
             )
         )
     
@@ -112,46 +199,49 @@ async def list_knowledge_items(
         statement = statement.where(KnowledgeItem.business_unit_id == business_unit_id)
     
     if tag:
-        # PostgreSQLの配列検索（tags配列にtagが含まれる）
-        # 注意: SQLModel/SQLAlchemyでの配列検索は実装が複雑なため、
-        # ここでは簡易的にcontentに含まれるかで検索（将来的に改善）
-        statement = statement.where(KnowledgeItem.content.contains(tag))
+        # PostgreSQLの配列検索（tags配列にtagが含まれる: tags @> ARRAY[tag]）
+        # tags のGINインデックスで検索される
+        statement = statement.where(KnowledgeItem.tags.contains([tag]))
     
-    items = session.exec(statement.order_by(KnowledgeItem.updated_at.desc())).all()
+    # ページング（同じ作成日時の並びを安定させるためIDでも並べる）
+    # 更新のたびに変わる updated_at で並べると、ページをまたいで編集された行が
+    # 読み飛ばされたり重複したりするため、変わらない created_at をキーにする
+    if cursor:
+        statement = statement.where(
+            tuple_(KnowledgeItem.created_at, KnowledgeItem.id) < _decode_cursor(cursor)
+        )
+    else:
+        statement = statement.offset(skip)
+    statement = statement.order_by(
+        KnowledgeItem.created_at.desc(), KnowledgeItem.id.desc()
+    ).limit(limit)
+    
+    items = session.exec(statement).all()
     
-    # レスポンスに事業部門名と作成者名を追加
     result = []
     for item in items:
-        business_unit = None
-        if item.business_unit_id:
-            business_unit = session.get(BusinessUnit, item.business_unit_id)
-        
-        creator = session.get(User, item.created_by)
-        
-        result.append(KnowledgeItemResponse(
-            id=item.id,
-            tenant_id=item.tenant_id,
-            business_unit_id=item.business_unit_id,
-            business_unit_name=business_unit.name if business_unit else None,
-            title=item.title,
-            content=item.content,
-            category=item.category,
-            source=item.source,
-            tags=item.tags,
-            created_by=item.created_by,
-            created_by_name=creator.full_name if creator else None,
-            updated_by=item.updated_by,
-            created_at=item.created_at.isoformat() if item.created_at else "",
-            updated_at=item.updated_at.isoformat() if item.updated_at else ""
+        business_unit = item.business_unit
+        creator = item.creator
+
+        result.append(_knowledge_item_payload(
+            item,
+            business_unit.name if business_unit else None,
+            creator.full_name if creator else None,
         ))
 
-    return result
+    # 自前で組み立てた値なので、レスポンスモデルでの再検証を省いてそのまま返す
+    # 1ページは最大100件のため、StreamingResponse での逐次送信は行わない
+    # （次ページのカーソルはヘッダーで返すため本文より先に最終行が必要で、
+    #   リクエストのセッションも送信中には使えない）
+    headers = {"X-Next-Cursor": _encode_cursor(items[-1])} if len(items) == limit else None
+    return ORJSONResponse(result, headers=headers)
 
 
-@router.post("", response_model=KnowledgeItemResponse, status_code=status.HTTP_201_CREATED)
-async def create_knowledge_item(
+@router.post("", status_code=status.HTTP_201_CREATED, responses={201: {"model": KnowledgeItemResponse}})
+def create_knowledge_item(
     item_data: KnowledgeItemCreate,
     current_user: User = Depends(get_current_user),
+    tenant_id: int = Depends(get_current_tenant_id),
     session: Session = Depends(get_session)
 ):
     """
@@ -160,29 +250,13 @@ async def create_knowledge_item(
     権限:
     - 全ロールが作成可能（自分のテナント内）
     """
-    # テナントIDを取得（ユーザーのテナントIDを使用）
-    tenant_id = current_user.tenant_id
-    if not tenant_id:
-        # テナントIDが未設定の場合はデフォルトでmikamoテナントを取得
-        from app.models.tenant import Tenant
-        statement = select(Tenant).where(Tenant.name == "mikamo")
-        tenant = session.exec(statement).first()
-        if tenant:
-            tenant_id = tenant.id
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="テナントが見つかりません"
-            )
-    
     # 事業部門の存在確認
-    if item_data.business_unit_id:
-        business_unit = session.get(BusinessUnit, item_data.business_unit_id)
-        if not business_unit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="指定された事業部門が見つかりません"
-            )
+    business_unit = get_business_unit_cached(session, item_data.business_unit_id)
+    if item_data.business_unit_id and not business_unit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="指定された事業部門が見つかりません"
+        )
     
     # ナレッジアイテムを作成
     knowledge_item = KnowledgeItem(
@@ -197,35 +271,23 @@ async def create_knowledge_item(
     )
     session.add(knowledge_item)
     session.commit()
-    session.refresh(knowledge_item)
-    
-    # レスポンスを構築
-    business_unit = None
-    if knowledge_item.business_unit_id:
-        business_unit = session.get(BusinessUnit, knowledge_item.business_unit_id)
+    _invalidate_knowledge_caches()
     
-    creator = session.get(User, knowledge_item.created_by)
+    # レスポンスを構築（事業部門は存在確認で取得済み、作成者は現在のユーザー）
+    creator = current_user
     
-    return KnowledgeItemResponse(
-        id=knowledge_item.id,
-        tenant_id=knowledge_item.tenant_id,
-        business_unit_id=knowledge_item.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=knowledge_item.title,
-        content=knowledge_item.content,
-        category=knowledge_item.category,
-        source=knowledge_item.source,
-        tags=knowledge_item.tags,
-        created_by=knowledge_item.created_by,
-        created_by_name=creator.full_name if creator else None,
-        updated_by=knowledge_item.updated_by,
-        created_at=knowledge_item.created_at.isoformat() if knowledge_item.created_at else "",
-        updated_at=knowledge_item.updated_at.isoformat() if knowledge_item.updated_at else ""
+    return ORJSONResponse(
+        _knowledge_item_payload(
+            knowledge_item,
+            business_unit.name if business_unit else None,
+            creator.full_name if creator else None
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
-@router.get("/{item_id}", response_model=KnowledgeItemResponse)
-async def get_knowledge_item(
+@router.get("/{item_id}", responses={200: {"model": KnowledgeItemResponse}})
+def get_knowledge_item(
     item_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
@@ -260,36 +322,11 @@ async def get_knowledge_item(
                 detail="このナレッジアイテムにアクセスする権限がありません"
             )
     
-    # レスポンスを構築
-    business_unit = None
-    if item.business_unit_id:
-        business_unit = session.get(BusinessUnit, item.business_unit_id)
-    
-    creator = session.get(User, item.created_by)
-    updater = None
-    if item.updated_by:
-        updater = session.get(User, item.updated_by)
-    
-    return KnowledgeItemResponse(
-        id=item.id,
-        tenant_id=item.tenant_id,
-        business_unit_id=item.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=item.title,
-        content=item.content,
-        category=item.category,
-        source=item.source,
-        tags=item.tags,
-        created_by=item.created_by,
-        created_by_name=creator.full_name if creator else None,
-        updated_by=item.updated_by,
-        created_at=item.created_at.isoformat() if item.created_at else "",
-        updated_at=item.updated_at.isoformat() if item.updated_at else ""
-    )
+    return ORJSONResponse(_knowledge_item_detail_payload(session, item, current_user))
 
 
-@router.put("/{item_id}", response_model=KnowledgeItemResponse)
-async def update_knowledge_item(
+@router.put("/{item_id}", responses={200: {"model": KnowledgeItemResponse}})
+def update_knowledge_item(
     item_id: int,
     item_data: KnowledgeItemUpdate,
     current_user: User = Depends(get_current_user),
@@ -315,63 +352,32 @@ async def update_knowledge_item(
             detail="このナレッジアイテムを更新する権限がありません"
         )
     
-    # 更新
-    if item_data.title is not None:
-        item.title = item_data.title
-    if item_data.content is not None:
-        item.content = item_data.content
-    if item_data.business_unit_id is not None:
-        # 事業部門の存在確認
-        if item_data.business_unit_id:
-            business_unit = session.get(BusinessUnit, item_data.business_unit_id)
-            if not business_unit:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="指定された事業部門が見つかりません"
-                )
-        item.business_unit_id = item_data.business_unit_id
-    if item_data.category is not None:
-        item.category = item_data.category
-    if item_data.source is not None:
-        item.source = item_data.source
-    if item_data.tags is not None:
-        item.tags = item_data.tags
+    # 更新（指定された項目のみ。None は未指定と同じ扱い）
+    update_data = item_data.model_dump(exclude_unset=True, exclude_none=True)
+    
+    # 事業部門の存在確認
+    if update_data.get("business_unit_id"):
+        if not get_business_unit_cached(session, update_data["business_unit_id"]):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="指定された事業部門が見つかりません"
+            )
+    
+    for key, value in update_data.items():
+        setattr(item, key, value)
     
     item.updated_by = current_user.id
     item.updated_at = datetime.utcnow()
     
     session.add(item)
     session.commit()
-    session.refresh(item)
-    
-    # レスポンスを構築
-    business_unit = None
-    if item.business_unit_id:
-        business_unit = session.get(BusinessUnit, item.business_unit_id)
+    _invalidate_knowledge_caches()
     
-    creator = session.get(User, item.created_by)
-    updater = session.get(User, item.updated_by) if item.updated_by else None
-    
-    return KnowledgeItemResponse(
-        id=item.id,
-        tenant_id=item.tenant_id,
-        business_unit_id=item.business_unit_id,
-        business_unit_name=business_unit.name if business_unit else None,
-        title=item.title,
-        content=item.content,
-        category=item.category,
-        source=item.source,
-        tags=item.tags,
-        created_by=item.created_by,
-        created_by_name=creator.full_name if creator else None,
-        updated_by=item.updated_by,
-        created_at=item.created_at.isoformat() if item.created_at else "",
-        updated_at=item.updated_at.isoformat() if item.updated_at else ""
-    )
+    return ORJSONResponse(_knowledge_item_detail_payload(session, item, current_user))
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_knowledge_item(
+def delete_knowledge_item(
     item_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
@@ -392,5 +398,6 @@ async def delete_knowledge_item(
     
     session.delete(item)
     session.commit()
+    _invalidate_knowledge_caches()
     return None
 
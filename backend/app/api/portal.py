@@ -6,7 +6,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlmodel import Session, select
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.core.database import get_session
 from app.models.business_unit import BusinessUnit, BusinessUnitType
 from app.models.user import User
@@ -25,8 +25,7 @@ class BusinessUnitResponse(BaseModel):
     code: str
     description: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PortalSummaryResponse(BaseModel):
@@ -41,8 +40,7 @@ class PortalSummaryResponse(BaseModel):
     period_start: str
     period_end: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 @router.get("/business-units", response_model=List[BusinessUnitResponse])
@@ -160,9 +158,11 @@ async def get_business_unit_summary(
     statement = select(Department).where(Department.code == business_unit.code)
     department = session.exec(statement).first()
     
+    # サマリーは本部ビューで事業部門ごとに組み立てるため、model_construct で検証を省く
+    # （値はDBの型付きカラムから組み立てており、返却時にレスポンスモデルで検証される）
     if not department:
         # Departmentが見つからない場合は空のサマリーを返す
-        return PortalSummaryResponse(
+        return PortalSummaryResponse.model_construct(
             business_unit_id=business_unit.id,
             business_unit_name=business_unit.name,
             business_unit_code=business_unit.code,
@@ -187,7 +187,7 @@ async def get_business_unit_summary(
     total_transactions = sum(log.transaction_count for log in logs)
     log_count = len(logs)
     
-    return PortalSummaryResponse(
+    return PortalSummaryResponse.model_construct(
         business_unit_id=business_unit.id,
         business_unit_name=business_unit.name,
         business_unit_code=business_unit.code,
@@ -238,8 +238,7 @@ class BusinessUnitHealthResponse(BaseModel):
     opportunity_score: int
     last_updated_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 @router.get("/hq/health", response_model=List[BusinessUnitHealthResponse])
@@ -264,12 +263,13 @@ async def get_hq_health(
     business_units = session.exec(statement).all()
     
     # 各事業部門の健康度スコアを取得または更新
+    # 値はDBの型付きカラムから組み立てるため、model_construct で検証を省く（返却時にレスポンスモデルで検証される）
     health_list = []
     for bu in business_units:
         # スコアを更新
         health = update_business_unit_health(session, bu.id)
         
-        health_list.append(BusinessUnitHealthResponse(
+        health_list.append(BusinessUnitHealthResponse.model_construct(
             business_unit_id=bu.id,
             business_unit_name=bu.name,
             risk_score=health.risk_score,
@@ -6,7 +6,7 @@ from app.core.database import get_session
 from app.models.task import Task, TaskStatus
 from app.models.user import User
 from app.api.auth import get_current_user
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 router = APIRouter()
 
@@ -34,8 +34,7 @@ class TaskResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -53,7 +52,6 @@ async def create_task(
     )
     session.add(task)
     session.commit()
-    session.refresh(task)
     return task
 
 
@@ -122,7 +120,6 @@ async def update_task(
     task.updated_at = datetime.utcnow()
     session.add(task)
     session.commit()
-    session.refresh(task)
     return task
 
 
@@ -84,7 +84,6 @@ def get_or_create_tenant_settings(session: Session, tenant: Tenant) -> TenantSet
         )
         session.add(settings)
         session.commit()
-        session.refresh(settings)
 
     return settings
 
@@ -195,7 +194,6 @@ async def update_settings(
     settings.updated_at = datetime.utcnow()
     session.add(settings)
     session.commit()
-    session.refresh(settings)
 
     return TenantSettingsFull(
         tenant_name=tenant.name,
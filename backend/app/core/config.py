@@ -22,6 +22,20 @@ class Settings(BaseSettings):
     CLOUD_SQL_CONNECTION_NAME: Optional[str] = None  # 例: "project:region:instance"
     USE_CLOUD_SQL_PROXY: bool = False
 
+    # コネクションプール設定（インスタンスあたりの最大接続数 = POOL_SIZE + MAX_OVERFLOW）
+    # Cloud SQL の max_connections を Cloud Run の最大インスタンス数（uvicorn を --workers N で
+    # 起動する場合はさらに N）で割った値を超えないこと
+    # 同期ハンドラーはスレッドプール（既定40スレッド）で動くため、同時実行数が最大接続数を超えると
+    # 超えた分は DB_POOL_TIMEOUT_SECONDS まで接続の空きを待ち、それでも空かなければエラーになる
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    # PgBouncer などの外部プーラー経由で接続する場合は true にし、アプリ側ではプールしない
+    DB_USE_NULL_POOL: bool = False
+    DB_POOL_PRE_PING: bool = True  # 切断済みの接続を使う前に検知する
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # サーバー側で切断される前に接続を作り直す（-1で無効）
+    DB_ECHO: bool = False  # 実行SQLをすべてログ出力する（デバッグ用。本番では無効にすること）
+
     # Security
     # 本番環境では JWT_SECRET_KEY 環境変数（Secret Manager経由）を優先
     JWT_SECRET_KEY: Optional[str] = None
@@ -82,6 +96,18 @@ class Settings(BaseSettings):
     ANTHROPIC_MAX_TOKENS_PREMIUM: int = 4000
     ANTHROPIC_TEMPERATURE_PREMIUM: float = 0.7
 
+    # ============================================
+    # AIチャット設定
+    # ============================================
+    # スタッフQAの新規会話で同じ質問に対する回答を再利用する秒数（0で無効）
+    AI_ANSWER_CACHE_TTL_SECONDS: int = 3600
+
+    # AIチャットで読み込む会話履歴の最大件数（長い会話でもメモリ・トークンを一定に保つ）
+    AI_CHAT_HISTORY_LIMIT: int = 20
+
+    # AI利用状況の日次集計（ai_usage_daily）を再集計する間隔（秒、0で定期実行しない）
+    AI_USAGE_ROLLUP_INTERVAL_SECONDS: int = 300
+
     # ============================================
     # 後方互換性のための設定（非推奨・将来削除予定）
     # ============================================
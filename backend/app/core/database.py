@@ -6,6 +6,7 @@ Secret Manager から DATABASE_URL を注入してください。
 
 ローカル開発環境では、USE_LOCAL_DB=true を設定して POSTGRES_* 環境変数を使用できます。
 """
+from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel, create_engine, Session
 from app.core.config import settings
 
@@ -13,7 +14,25 @@ from app.core.config import settings
 # settings.database_url は DATABASE_URL 環境変数を優先し、
 # 未設定の場合は USE_LOCAL_DB=true の場合のみローカル設定を使用
 # Cloud Run では DATABASE_URL が未設定の場合、ValueError が発生する
-engine = create_engine(settings.database_url, echo=True)
+# リクエストごとに接続を張り直さないよう、コネクションプールを設定から調整する
+# SQLのエコー出力はリクエストごとに大量の同期ログ書き込みになるため、既定では無効
+# 外部プーラー（PgBouncer など）を使う場合は NullPool にして、接続の再利用はプーラーに任せる
+if settings.DB_USE_NULL_POOL:
+    engine = create_engine(
+        settings.database_url,
+        echo=settings.DB_ECHO,
+        poolclass=NullPool,
+    )
+else:
+    engine = create_engine(
+        settings.database_url,
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
 
 
 def init_db():
@@ -22,7 +41,15 @@ def init_db():
 
 
 def get_session():
-    """データベースセッションを取得"""
-    with Session(engine) as session:
+    """
+    データベースセッションを取得
+
+    リクエスト単位のセッションのため expire_on_commit=False とし、
+    コミット後に属性へアクセスするたびに再SELECTが走らないようにする
+
+    scoped_session（スレッドローカル）は使わない。async ハンドラーは同じスレッドで並行に
+    動くため、リクエスト間でセッションが共有されてしまう。接続はエンジンのプールで再利用される。
+    """
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
@@ -97,12 +97,217 @@ def add_missing_columns():
             print(f"ℹ️  knowledge_itemsテーブルがまだ存在しません: {e}")
 
 
+# 既存テーブルに追加するインデックス（インデックス名, DDL文）
+# create_all() は既存テーブルにインデックスを作成しないため、ここで補完する
+INDEXES = [
+    (
+        "ix_users_tenant_dept_role_active",
+        "CREATE INDEX IF NOT EXISTS ix_users_tenant_dept_role_active "
+        "ON users (tenant_id, department_id, role, is_active)",
+    ),
+    (
+        "ix_conv_user_updated",
+        "CREATE INDEX IF NOT EXISTS ix_conv_user_updated "
+        "ON conversations (user_id, updated_at)",
+    ),
+    (
+        "ix_message_conv_created",
+        "CREATE INDEX IF NOT EXISTS ix_message_conv_created "
+        "ON messages (conversation_id, created_at)",
+    ),
+    (
+        "uq_daily_logs_user_date_cov",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_daily_logs_user_date_cov "
+        "ON daily_logs (user_id, \"date\") "
+        "INCLUDE (sales_amount, customers_count, transaction_count)",
+    ),
+    (
+        "ix_daily_logs_date_dept_cov",
+        "CREATE INDEX IF NOT EXISTS ix_daily_logs_date_dept_cov "
+        "ON daily_logs (\"date\", department_id) "
+        "INCLUDE (sales_amount, customers_count, transaction_count, weather)",
+    ),
+    (
+        "ix_ai_usage_logs_tenant_created_cov",
+        "CREATE INDEX IF NOT EXISTS ix_ai_usage_logs_tenant_created_cov "
+        "ON ai_usage_logs (tenant_id, created_at) "
+        "INCLUDE (tier, purpose, tokens_input, tokens_output)",
+    ),
+    # Decision / Insight 一覧の絞り込み・並び替え用
+    (
+        "ix_decisions_tenant_created",
+        "CREATE INDEX IF NOT EXISTS ix_decisions_tenant_created "
+        "ON decisions (tenant_id, created_at)",
+    ),
+    (
+        "ix_decisions_tenant_bu_created",
+        "CREATE INDEX IF NOT EXISTS ix_decisions_tenant_bu_created "
+        "ON decisions (tenant_id, business_unit_id, created_at)",
+    ),
+    (
+        "ix_insights_tenant_score_created",
+        "CREATE INDEX IF NOT EXISTS ix_insights_tenant_score_created "
+        "ON insights (tenant_id, score, created_at)",
+    ),
+    (
+        "ix_insights_tenant_bu_score_created",
+        "CREATE INDEX IF NOT EXISTS ix_insights_tenant_bu_score_created "
+        "ON insights (tenant_id, business_unit_id, score, created_at)",
+    ),
+    (
+        "ix_insights_tenant_company_score_created",
+        "CREATE INDEX IF NOT EXISTS ix_insights_tenant_company_score_created "
+        "ON insights (tenant_id, score, created_at) WHERE business_unit_id IS NULL",
+    ),
+    # Issue / ナレッジ一覧の絞り込み・並び替え用
+    (
+        "ix_issues_tenant_created",
+        "CREATE INDEX IF NOT EXISTS ix_issues_tenant_created "
+        "ON issues (tenant_id, created_at)",
+    ),
+    (
+        "ix_issues_tenant_bu_created",
+        "CREATE INDEX IF NOT EXISTS ix_issues_tenant_bu_created "
+        "ON issues (tenant_id, business_unit_id, created_at)",
+    ),
+    (
+        "ix_issues_tenant_status_created",
+        "CREATE INDEX IF NOT EXISTS ix_issues_tenant_status_created "
+        "ON issues (tenant_id, status, created_at)",
+    ),
+    (
+        "ix_knowledge_tenant_created_id",
+        "CREATE INDEX IF NOT EXISTS ix_knowledge_tenant_created_id "
+        "ON knowledge_items (tenant_id, created_at, id)",
+    ),
+    # 部分一致検索（LIKE '%...%'）用のトライグラムインデックス
+    (
+        "pg_trgm",
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    ),
+    (
+        "ix_issue_title_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_issue_title_trgm "
+        "ON issues USING gin (title gin_trgm_ops)",
+    ),
+    (
+        "ix_issue_description_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_issue_description_trgm "
+        "ON issues USING gin (description gin_trgm_ops)",
+    ),
+    (
+        "ix_knowledge_title_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_knowledge_title_trgm "
+        "ON knowledge_items USING gin (title gin_trgm_ops)",
+    ),
+    (
+        "ix_knowledge_content_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_knowledge_content_trgm "
+        "ON knowledge_items USING gin (content gin_trgm_ops)",
+    ),
+    # ナレッジのタグ絞り込み（配列の包含検索）用
+    (
+        "ix_knowledge_tags_gin",
+        "CREATE INDEX IF NOT EXISTS ix_knowledge_tags_gin "
+        "ON knowledge_items USING gin (tags)",
+    ),
+]
+
+
+# 既存テーブルのカラムに設定するDB側のデフォルト値（対象, DDL文）
+# create_all() は既存テーブルのカラム定義を変更しないため、ここで補完する
+COLUMN_DEFAULTS = [
+    (
+        "decisions.created_at",
+        "ALTER TABLE decisions ALTER COLUMN created_at SET DEFAULT timezone('utc', now())",
+    ),
+    (
+        "decisions.updated_at",
+        "ALTER TABLE decisions ALTER COLUMN updated_at SET DEFAULT timezone('utc', now())",
+    ),
+    (
+        "insights.created_at",
+        "ALTER TABLE insights ALTER COLUMN created_at SET DEFAULT timezone('utc', now())",
+    ),
+    (
+        "insights.updated_at",
+        "ALTER TABLE insights ALTER COLUMN updated_at SET DEFAULT timezone('utc', now())",
+    ),
+]
+
+
+def set_column_defaults():
+    """
+    カラムのDB側デフォルト値を設定する
+
+    Cloud Runでの起動時に自動的に実行（何度実行しても安全）
+    """
+    with engine.connect() as conn:
+        for name, ddl in COLUMN_DEFAULTS:
+            try:
+                conn.execute(text(ddl))
+                conn.commit()
+                print(f"✅ カラム {name} のデフォルト値を確認しました")
+            except Exception as e:
+                conn.rollback()
+                print(f"⚠️  カラム {name} のデフォルト値の設定でエラー: {e}")
+
+
+# 一意インデックス作成前の重複チェック（インデックス名 → 重複キーを返すSQL）
+# 既存データに重複があると CREATE UNIQUE INDEX が失敗するため、重複キーを記録して作成をスキップする
+# （データは自動で削除しない。重複を解消して再起動すればインデックスが作成される）
+UNIQUE_INDEX_DUPLICATE_CHECKS = {
+    "uq_daily_logs_user_date_cov": (
+        "SELECT user_id, \"date\", count(*) FROM daily_logs "
+        "GROUP BY user_id, \"date\" HAVING count(*) > 1 LIMIT 20"
+    ),
+}
+
+
+def _find_unique_index_duplicates(conn, name: str):
+    """一意インデックスが未作成の場合、作成を妨げる重複キーを返す"""
+    exists = conn.execute(
+        text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+        {"name": name},
+    ).first()
+    if exists:
+        return []
+    return conn.execute(text(UNIQUE_INDEX_DUPLICATE_CHECKS[name])).all()
+
+
+def add_missing_indexes():
+    """
+    欠けているインデックスを作成する
+
+    Cloud Runでの起動時に自動的に実行（IF NOT EXISTS のため何度実行しても安全）
+    """
+    with engine.connect() as conn:
+        for name, ddl in INDEXES:
+            if name in UNIQUE_INDEX_DUPLICATE_CHECKS:
+                duplicates = _find_unique_index_duplicates(conn, name)
+                conn.commit()
+                if duplicates:
+                    rows = ", ".join(str(tuple(row)) for row in duplicates)
+                    print(f"⚠️  インデックス {name} は重複データがあるため作成をスキップしました: {rows}")
+                    print("   重複している行を1件に整理してから再起動すると作成されます")
+                    continue
+            try:
+                conn.execute(text(ddl))
+                conn.commit()
+                print(f"✅ インデックス {name} を確認しました")
+            except Exception as e:
+                conn.rollback()
+                print(f"⚠️  インデックス {name} の作成でエラー: {e}")
+
+
 def run_migrations():
     """
     すべてのマイグレーションを実行
     """
     print("\n" + "=" * 60)
-    print("🔄 データベースマイグレーション: 欠けているカラムを追加")
+    print("🔄 データベースマイグレーション: 欠けているカラム・デフォルト値・インデックスを追加")
     print("=" * 60)
     add_missing_columns()
+    set_column_defaults()
+    add_missing_indexes()
     print("=" * 60 + "\n")
@@ -1,11 +1,23 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 検証済みトークンのペイロード（トークンのハッシュ値 → ペイロード）
+# 署名の検証結果は有効期限まで変わらないため、エントリごとに有効期限までキャッシュする
+_payload_cache = TTLCache(maxsize=10000, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def token_cache_key(token: str) -> bytes:
+    """トークンをキャッシュのキーに変換（トークンそのものをメモリに残さないためハッシュ値を使う）"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """パスワードを検証"""
@@ -30,11 +42,23 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """アクセストークンをデコード"""
+    """
+    アクセストークンをデコード
+
+    検証済みのペイロードはキャッシュし、同じトークンでは署名の検証を省く
+    （返り値は共有のため変更しないこと）
+    """
+    cache_key = token_cache_key(token)
+    payload = _payload_cache.get(cache_key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         # セキュリティ上の理由から、トークンやシークレットキーの内容はログに出力しない
         return None
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        _payload_cache.set(cache_key, payload, ttl=ttl)
+    return payload
 
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -17,6 +18,8 @@ from app.core.middleware import (
 from app.api import auth, daily_logs, tasks, ai_chat, admin, knowledge, portal, issues, insights, decisions, tenant, ai_usage
 from app.core.init_db import init_database
 from app.core.migrate_columns import run_migrations
+from app.services.ai.http_client import close_http_client
+from app.services.ai.usage_rollup import run_ai_usage_rollup_loop
 
 # ロギングを初期化
 setup_logging()
@@ -62,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],  # 一覧APIの総件数・次ページのカーソル
 )
 
 # ルーター登録
@@ -79,6 +83,10 @@ app.include_router(tenant.router, tags=["テナント設定"])
 app.include_router(ai_usage.router, prefix="/api/admin/ai-usage", tags=["AI利用状況"])
 
 
+# AI利用状況の日次集計を更新するバックグラウンドタスク
+_rollup_task = None
+
+
 @app.on_event("startup")
 async def on_startup():
     """
@@ -117,6 +125,18 @@ async def on_startup():
         print(f"⚠️  データベース初期化でエラーが発生しました: {e}")
         print("   アプリケーションは起動しますが、DB接続エラーが発生する可能性があります")
 
+    # 4. AI利用状況の日次集計を定期的に更新（リクエスト処理中に集計しないため）
+    global _rollup_task
+    _rollup_task = asyncio.create_task(run_ai_usage_rollup_loop())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """アプリ終了時にバックグラウンドタスクを停止し、共有HTTPクライアントをクローズ"""
+    if _rollup_task:
+        _rollup_task.cancel()
+    await close_http_client()
+
 
 @app.get("/")
 async def root():
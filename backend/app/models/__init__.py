@@ -2,24 +2,24 @@ from app.models.user import User, Department
 from app.models.daily_log import DailyLog
 from app.models.task import Task
 from app.models.ai_chat_log import AIChatLog
-from app.models.ai_usage_log import AiUsageLog
+from app.models.ai_usage_log import AiUsageLog, AiUsageDaily
 from app.models.tenant import Tenant, TenantSettings, AiTierPolicy
 from app.models.business_unit import BusinessUnit, BusinessUnitType
 from app.models.knowledge_item import KnowledgeItem
 from app.models.conversation import Conversation, Message
 from app.models.issue import Issue, IssueStatus, IssueTopic
 from app.models.insight import Insight, InsightType
-from app.models.decision import Decision, DecisionStatus
+from app.models.decision import Decision, DecisionStatus, InsightDecisionLink
 from app.models.business_unit_health import BusinessUnitHealth
 
 __all__ = [
-    "User", "Department", "DailyLog", "Task", "AIChatLog", "AiUsageLog",
+    "User", "Department", "DailyLog", "Task", "AIChatLog", "AiUsageLog", "AiUsageDaily",
     "Tenant", "TenantSettings", "AiTierPolicy",
     "BusinessUnit", "BusinessUnitType",
     "KnowledgeItem", "Conversation", "Message",
     "Issue", "IssueStatus", "IssueTopic",
     "Insight", "InsightType",
-    "Decision", "DecisionStatus",
+    "Decision", "DecisionStatus", "InsightDecisionLink",
     "BusinessUnitHealth"
 ]
 
@@ -10,14 +10,26 @@ AI利用ログモデル
 - どのティア・モデルを使い
 - どれだけトークンを消費したか
 """
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, date
 
 
 class AiUsageLog(SQLModel, table=True):
     """AI利用ログモデル（コスト可視化・従量課金設計用）"""
     __tablename__ = "ai_usage_logs"
+    __table_args__ = (
+        # テナントの期間指定の集計（当日分のライブ集計など）
+        # 集計対象の列を INCLUDE し、テーブル本体を読まずに集計できるようにする
+        # （error は長いメッセージがインデックス行の上限を超えうるため含めない）
+        Index(
+            "ix_ai_usage_logs_tenant_created_cov",
+            "tenant_id",
+            "created_at",
+            postgresql_include=["tier", "purpose", "tokens_input", "tokens_output"],
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -44,3 +56,23 @@ class AiUsageLog(SQLModel, table=True):
 
     # 会話ID（紐づく会話がある場合）
     conversation_id: Optional[int] = Field(default=None, foreign_key="conversations.id")
+
+
+class AiUsageDaily(SQLModel, table=True):
+    """
+    AI利用の日次集計（ダッシュボード用ロールアップ）
+
+    ai_usage_logs をテナント・日・ティア・用途ごとに集計したもの。
+    app.services.ai.usage_rollup で定期的に更新される。
+    """
+    __tablename__ = "ai_usage_daily"
+
+    tenant_id: int = Field(foreign_key="tenants.id", primary_key=True)
+    day: date = Field(primary_key=True)  # UTC日付
+    tier: str = Field(primary_key=True)
+    purpose: str = Field(primary_key=True)
+
+    call_count: int = Field(default=0)
+    tokens_input: int = Field(default=0)
+    tokens_output: int = Field(default=0)
+    error_count: int = Field(default=0)
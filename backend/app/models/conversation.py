@@ -6,12 +6,16 @@ AIアシスタントとの会話を管理するためのモデル
 from sqlmodel import SQLModel, Field, Relationship, Column
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import Text
+from sqlalchemy import Text, Index
 
 
 class Conversation(SQLModel, table=True):
     """会話モデル（会話セッション）"""
     __tablename__ = "conversations"
+    __table_args__ = (
+        # ユーザーの会話一覧（updated_at降順）
+        Index("ix_conv_user_updated", "user_id", "updated_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(foreign_key="tenants.id", index=True)
@@ -35,6 +39,10 @@ class Conversation(SQLModel, table=True):
 class Message(SQLModel, table=True):
     """メッセージモデル（会話内の個別メッセージ）"""
     __tablename__ = "messages"
+    __table_args__ = (
+        # 会話内のメッセージを時系列で取得
+        Index("ix_message_conv_created", "conversation_id", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     conversation_id: int = Field(foreign_key="conversations.id", index=True)
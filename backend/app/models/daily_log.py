@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional
 from datetime import date as date_type, datetime
 from enum import Enum
@@ -15,6 +16,26 @@ class WeatherType(str, Enum):
 class DailyLog(SQLModel, table=True):
     """日次ログモデル（強化版）"""
     __tablename__ = "daily_logs"
+    __table_args__ = (
+        # 1ユーザー1日1件（作成時の ON CONFLICT の判定に使用）
+        # 週間サマリーの集計対象の列を INCLUDE し、インデックスだけで集計できるようにする
+        Index(
+            "uq_daily_logs_user_date_cov",
+            "user_id",
+            "date",
+            unique=True,
+            postgresql_include=["sales_amount", "customers_count", "transaction_count"],
+        ),
+        # ダッシュボードの部署・日付別集計（推移グラフ・部署間比較）を、テーブル本体を読まずに行う
+        Index(
+            "ix_daily_logs_date_dept_cov",
+            "date",
+            "department_id",
+            postgresql_include=["sales_amount", "customers_count", "transaction_count", "weather"],
+        ),
+    )
+    # サーバー側で決まる値は INSERT/UPDATE の RETURNING で取得し、コミット後の refresh を不要にする
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Optional[int] = Field(default=None, primary_key=True)
     log_date: date_type = Field(index=True, sa_column_kwargs={"name": "date"})
@@ -6,7 +6,7 @@ HQが下す意思決定を履歴として残し、Issue/Insightと紐づける
 from sqlmodel import SQLModel, Field, Relationship, Column
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import Text
+from sqlalchemy import Index, Text, func, text
 from enum import Enum
 
 
@@ -21,6 +21,12 @@ class DecisionStatus(str, Enum):
 class Decision(SQLModel, table=True):
     """Decisionモデル（経営・マネージャー側の意思決定ログ）"""
     __tablename__ = "decisions"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # 一覧（テナント内の新着順、事業部門での絞り込み）をソートなしでLIMIT件だけ読む
+        Index("ix_decisions_tenant_created", "tenant_id", "created_at"),
+        Index("ix_decisions_tenant_bu_created", "tenant_id", "business_unit_id", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(foreign_key="tenants.id", index=True)
@@ -33,8 +39,15 @@ class Decision(SQLModel, table=True):
     content: str = Field(sa_column=Column(Text))  # どんな判断をしたか／何をいつまでにやるか
     status: DecisionStatus = Field(default=DecisionStatus.PLANNED, index=True)
     created_by_user_id: int = Field(foreign_key="users.id", index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())")},
+    )
+    # 更新日時はDB側で設定する（UPDATE文に含めて同じ文で更新し、RETURNINGで受け取る）
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())"), "onupdate": func.timezone("utc", func.now())},
+    )
 
     # Relationships
     tenant: "Tenant" = Relationship()
@@ -43,13 +56,10 @@ class Decision(SQLModel, table=True):
     # 中間テーブル経由の関係は後で実装（一旦シンプルに）
 
 
-# 中間テーブル: InsightとDecisionの多対多関係（将来的に実装）
-# from sqlmodel import Table, Column as SQLColumn, Integer, ForeignKey
-# 
-# insight_decision_link = Table(
-#     "insight_decision_link",
-#     SQLModel.metadata,
-#     SQLColumn("insight_id", Integer, ForeignKey("insights.id"), primary_key=True),
-#     SQLColumn("decision_id", Integer, ForeignKey("decisions.id"), primary_key=True),
-# )
+class InsightDecisionLink(SQLModel, table=True):
+    """中間テーブル: InsightとDecisionの多対多関係"""
+    __tablename__ = "insight_decision_link"
+
+    insight_id: int = Field(foreign_key="insights.id", primary_key=True)
+    decision_id: int = Field(foreign_key="decisions.id", primary_key=True, index=True)
 
@@ -6,7 +6,7 @@ Insight（AIによる分析・提案）モデル
 from sqlmodel import SQLModel, Field, Relationship, Column
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import Text
+from sqlalchemy import Index, Text, func, text
 from enum import Enum
 
 
@@ -20,6 +20,20 @@ class InsightType(str, Enum):
 class Insight(SQLModel, table=True):
     """Insightモデル（AIによる分析・提案）"""
     __tablename__ = "insights"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # 一覧（テナント内のスコア順・新着順、事業部門での絞り込み）をソートなしでLIMIT件だけ読む
+        Index("ix_insights_tenant_score_created", "tenant_id", "score", "created_at"),
+        Index("ix_insights_tenant_bu_score_created", "tenant_id", "business_unit_id", "score", "created_at"),
+        # 事業部門が未設定のスタッフ向け（全社共通のInsightのみ）
+        Index(
+            "ix_insights_tenant_company_score_created",
+            "tenant_id",
+            "score",
+            "created_at",
+            postgresql_where=text("business_unit_id IS NULL"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(foreign_key="tenants.id", index=True)
@@ -36,8 +50,15 @@ class Insight(SQLModel, table=True):
         default=None,
         foreign_key="users.id"
     )  # 基本はAIだが、人間が追記・修正できる前提
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())")},
+    )
+    # 更新日時はDB側で設定する（UPDATE文に含めて同じ文で更新し、RETURNINGで受け取る）
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())"), "onupdate": func.timezone("utc", func.now())},
+    )
 
     # Relationships
     tenant: "Tenant" = Relationship()
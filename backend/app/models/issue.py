@@ -6,7 +6,7 @@ Issue（現場での"困りごと"・トピック）モデル
 from sqlmodel import SQLModel, Field, Relationship, Column
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import Text
+from sqlalchemy import Index, Text
 from enum import Enum
 
 
@@ -32,6 +32,12 @@ class IssueTopic(str, Enum):
 class Issue(SQLModel, table=True):
     """Issueモデル（現場での"困りごと"・トピック）"""
     __tablename__ = "issues"
+    __table_args__ = (
+        # 一覧（テナント内の新着順、事業部門・ステータスでの絞り込み）をソートなしでLIMIT件だけ読む
+        Index("ix_issues_tenant_created", "tenant_id", "created_at"),
+        Index("ix_issues_tenant_bu_created", "tenant_id", "business_unit_id", "created_at"),
+        Index("ix_issues_tenant_status_created", "tenant_id", "status", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(foreign_key="tenants.id", index=True)
@@ -7,13 +7,19 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import Column, Text, ARRAY, String
+from sqlalchemy import Column, Index, Text, ARRAY, String
 from sqlalchemy.dialects.postgresql import ARRAY as PG_ARRAY
 
 
 class KnowledgeItem(SQLModel, table=True):
     """ナレッジアイテムモデル"""
     __tablename__ = "knowledge_items"
+    __table_args__ = (
+        # 一覧（テナント内の作成日時順・キーセットページング）をソートなしでLIMIT件だけ読む
+        Index("ix_knowledge_tenant_created_id", "tenant_id", "created_at", "id"),
+        # タグでの絞り込み（tags @> ARRAY[...]）用
+        Index("ix_knowledge_tags_gin", "tags", postgresql_using="gin"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(foreign_key="tenants.id", index=True)
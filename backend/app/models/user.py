@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, List
 from datetime import datetime
 
@@ -20,6 +21,12 @@ class Department(SQLModel, table=True):
 class User(SQLModel, table=True):
     """ユーザーモデル"""
     __tablename__ = "users"
+    __table_args__ = (
+        # 管理画面のユーザー一覧の絞り込み条件（テナント・部門・ロール・有効/無効）
+        Index("ix_users_tenant_dept_role_active", "tenant_id", "department_id", "role", "is_active"),
+    )
+    # サーバー側で決まる値は INSERT/UPDATE の RETURNING で取得し、コミット後の refresh を不要にする
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: Optional[int] = Field(
@@ -128,6 +128,7 @@ def get_department_daily_logs_for_chart(
         日付ごとの集計データのリスト
     """
     cutoff_date = date.today() - timedelta(days=days)
+    # 集計に使う列は ix_daily_logs_date_dept_cov に含まれるため、インデックスだけで集計できる
     statement = select(
         DailyLog.log_date,
         func.sum(DailyLog.sales_amount).label("sales"),
@@ -165,19 +166,25 @@ def get_all_departments_today_summary(session: Session) -> List[dict]:
         部署ごとのサマリーデータのリスト
     """
     today = date.today()
-    statement = select(
-        Department.id,
-        Department.name,
-        Department.code,
+    # 日次ログは ix_daily_logs_date_dept_cov で集計し（行数は count(*) で数える）、部署情報を結合する
+    totals = select(
+        DailyLog.department_id,
         func.sum(DailyLog.sales_amount).label("sales"),
         func.sum(DailyLog.customers_count).label("customers"),
         func.sum(DailyLog.transaction_count).label("transactions"),
-        func.count(DailyLog.id).label("log_count"),
-    ).join(
-        DailyLog, DailyLog.department_id == Department.id
+        func.count().label("log_count"),
     ).where(
         DailyLog.log_date == today
-    ).group_by(Department.id, Department.name, Department.code)
+    ).group_by(DailyLog.department_id).subquery()
+    statement = select(
+        Department.id,
+        Department.name,
+        Department.code,
+        totals.c.sales,
+        totals.c.customers,
+        totals.c.transactions,
+        totals.c.log_count,
+    ).join(totals, totals.c.department_id == Department.id)
     
     results = session.exec(statement).all()
     return [
@@ -192,4 +199,3 @@ def get_all_departments_today_summary(session: Session) -> List[dict]:
         }
         for r in results
     ]
-
@@ -4,12 +4,23 @@
 ナレッジアイテムの検索・取得ロジック
 将来的にベクトル検索（RAG）に対応できる設計
 """
+import hashlib
 from sqlmodel import Session, select, or_
 from sqlalchemy import func
 from typing import List, Optional
+from app.core.cache import TTLCache
 from app.models.knowledge_item import KnowledgeItem
 from app.models.business_unit import BusinessUnit
 
+# AIチャットごとに同じ検索が繰り返されるため、生成したコンテキスト文字列を短時間キャッシュする
+# ナレッジの作成・更新・削除時は invalidate_knowledge_context_cache() で破棄する
+_knowledge_context_cache = TTLCache(maxsize=1024, ttl=300)
+
+
+def invalidate_knowledge_context_cache() -> None:
+    """ナレッジコンテキストのキャッシュを破棄"""
+    _knowledge_context_cache.clear()
+
 
 def search_knowledge_items(
     session: Session,
@@ -42,6 +53,7 @@ def search_knowledge_items(
         statement = statement.where(KnowledgeItem.tenant_id == tenant_id)
 
     # 検索クエリで絞り込み（タイトル・本文）
+    # 部分一致は pg_trgm のGINインデックス（ix_knowledge_*_trgm）で全件走査を避ける
     if query:
         statement = statement.where(
             or_(
@@ -135,6 +147,20 @@ def get_knowledge_context(
     Returns:
         コンテキスト文字列（Markdown形式）
     """
+    # 検索（LIKE）は大文字・小文字や空白を区別するため、キーもクエリ文字列そのままで作る
+    cache_key = (
+        hashlib.blake2b(query.encode(), digest_size=16).hexdigest(),
+        business_unit_id,
+        tenant_id,
+        category,
+        tuple(tags) if tags else None,
+        limit,
+        include_full_content,
+    )
+    cached = _knowledge_context_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     items = search_knowledge_items(
         session=session,
         query=query,
@@ -146,6 +172,7 @@ def get_knowledge_context(
     )
 
     if not items:
+        _knowledge_context_cache.set(cache_key, "")
         return ""
 
     context_parts = ["【関連ナレッジ情報】"]
@@ -160,7 +187,9 @@ def get_knowledge_context(
         if item.tags:
             context_parts.append(f"\nタグ: {', '.join(item.tags)}")
 
-    return "\n".join(context_parts)
+    context = "\n".join(context_parts)
+    _knowledge_context_cache.set(cache_key, context)
+    return context
 
 
 def get_menu_context(
@@ -0,0 +1,86 @@
+"""
+組織マスタ（テナント・部門・事業部門）リポジトリ層
+
+テナント・部門・事業部門はほとんど変更されないため、TTLキャッシュ経由で取得する。
+キャッシュにはセッションに紐づかないコピーを保持し、呼び出し側のセッションとは独立させる。
+"""
+from typing import Optional
+from sqlmodel import Session, select
+from app.core.cache import TTLCache
+from app.models.user import Department
+from app.models.business_unit import BusinessUnit
+from app.models.tenant import Tenant
+
+_department_cache = TTLCache(maxsize=256, ttl=60)
+_business_unit_cache = TTLCache(maxsize=256, ttl=60)
+_tenant_id_cache = TTLCache(maxsize=16, ttl=600)
+
+
+def get_tenant_id_by_name_cached(session: Session, name: str) -> Optional[int]:
+    """
+    テナント名からテナントIDを取得（TTLキャッシュ付き）
+
+    テナントIDが未設定のユーザーのフォールバック（デフォルトテナント）に使用する。
+    見つからなかった場合はキャッシュしない（初期化直後に作成される場合があるため）。
+    """
+    tenant_id = _tenant_id_cache.get(name)
+    if tenant_id is None:
+        tenant_id = session.exec(select(Tenant.id).where(Tenant.name == name)).first()
+        if tenant_id is None:
+            return None
+        _tenant_id_cache.set(name, tenant_id)
+    return tenant_id
+
+
+def get_department_cached(session: Session, department_id: Optional[int]) -> Optional[Department]:
+    """
+    部門を取得（TTLキャッシュ付き）
+
+    Returns:
+        セッションに紐づかない Department（読み取り専用として扱うこと）
+    """
+    if not department_id:
+        return None
+    department = _department_cache.get(department_id)
+    if department is None:
+        row = session.get(Department, department_id)
+        if not row:
+            return None
+        department = Department(id=row.id, name=row.name, code=row.code, created_at=row.created_at)
+        _department_cache.set(department_id, department)
+    return department
+
+
+def get_business_unit_cached(session: Session, business_unit_id: Optional[int]) -> Optional[BusinessUnit]:
+    """
+    事業部門を取得（TTLキャッシュ付き）
+
+    Returns:
+        セッションに紐づかない BusinessUnit（読み取り専用として扱うこと）
+    """
+    if not business_unit_id:
+        return None
+    business_unit = _business_unit_cache.get(business_unit_id)
+    if business_unit is None:
+        row = session.get(BusinessUnit, business_unit_id)
+        if not row:
+            return None
+        business_unit = BusinessUnit(
+            id=row.id,
+            tenant_id=row.tenant_id,
+            name=row.name,
+            type=row.type,
+            code=row.code,
+            description=row.description,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        _business_unit_cache.set(business_unit_id, business_unit)
+    return business_unit
+
+
+def invalidate_organization_cache() -> None:
+    """テナント・部門・事業部門のキャッシュを破棄（マスタ更新時に呼び出す）"""
+    _tenant_id_cache.clear()
+    _department_cache.clear()
+    _business_unit_cache.clear()
@@ -0,0 +1,58 @@
+"""
+AI応答キャッシュ
+
+同じテナント・事業部門で同じ質問が繰り返された場合に、AI APIを呼ばずに
+前回の回答を返すためのプロセス内キャッシュ。
+
+キャッシュ対象はスタッフQAモードの新規会話のみ:
+- スタッフQAの回答はテナント・事業部門・ナレッジ・質問文だけで決まる
+  （通常モードはユーザー個人の日報、既存会話は会話履歴に依存するため対象外）
+- 質問文は表記ゆれ（全角/半角・大文字/小文字・空白）を正規化してキーにする
+"""
+import re
+import unicodedata
+from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_answer_cache = TTLCache(maxsize=1024, ttl=settings.AI_ANSWER_CACHE_TTL_SECONDS)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """キャッシュキー用に質問文を正規化"""
+    normalized = unicodedata.normalize("NFKC", question).lower()
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def _cache_key(tenant_id: int, business_unit_id: Optional[int], question: str) -> tuple:
+    return (tenant_id, business_unit_id, normalize_question(question))
+
+
+def get_cached_answer(
+    tenant_id: int,
+    business_unit_id: Optional[int],
+    question: str,
+) -> Optional[str]:
+    """キャッシュ済みの回答を取得（なければNone）"""
+    if settings.AI_ANSWER_CACHE_TTL_SECONDS <= 0:
+        return None
+    return _answer_cache.get(_cache_key(tenant_id, business_unit_id, question))
+
+
+def cache_answer(
+    tenant_id: int,
+    business_unit_id: Optional[int],
+    question: str,
+    answer: str,
+) -> None:
+    """回答をキャッシュに登録"""
+    if settings.AI_ANSWER_CACHE_TTL_SECONDS <= 0 or not answer:
+        return
+    _answer_cache.set(_cache_key(tenant_id, business_unit_id, question), answer)
+
+
+def invalidate_answer_cache() -> None:
+    """キャッシュをすべて破棄（ナレッジ更新時など）"""
+    _answer_cache.clear()
@@ -5,7 +5,7 @@ AI Client 抽象インターフェース
 用途（Purpose）に応じて BASIC / STANDARD / PREMIUM の3段階ティアを自動選択
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Literal, TYPE_CHECKING
+from typing import AsyncIterator, List, Dict, Optional, Literal, TYPE_CHECKING
 from enum import Enum
 from app.core.config import settings
 import structlog
@@ -71,6 +71,22 @@ class AiClient(ABC):
         """
         pass
 
+    async def stream_reply(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        AIからの応答を差分ごとに生成（ストリーミング）
+
+        ストリーミング非対応のプロバイダーでは、generate_reply() の結果を1回で返す。
+
+        Yields:
+            応答テキストの差分
+        """
+        yield await self.generate_reply(system_prompt, messages, options)
+
 
 class AiClientFactory:
     """AI Client ファクトリ（3段階ティア対応）"""
@@ -0,0 +1,28 @@
+"""
+AIプロバイダー共通のHTTPクライアント
+
+リクエストごとに httpx.AsyncClient を生成すると、毎回 TCP/TLS 接続を張り直すことになる。
+プロセス内で1つのクライアントを共有し、コネクションプールを再利用する。
+"""
+from typing import Optional
+import httpx
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """共有の AsyncClient を取得（未作成・クローズ済みの場合は作成）"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """共有の AsyncClient をクローズ（アプリ終了時に呼び出す）"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
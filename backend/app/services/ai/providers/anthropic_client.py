@@ -4,11 +4,13 @@ Anthropic (Claude) API Client 実装
 Claude APIを使用して応答を生成するクライアント
 3段階ティア（BASIC / STANDARD / PREMIUM）に対応
 """
-from typing import List, Dict, Optional, Tuple
+from typing import AsyncIterator, List, Dict, NoReturn, Optional, Tuple
 from dataclasses import dataclass
+import json
 import httpx
 from app.core.config import settings
 from app.services.ai.client import AiClient
+from app.services.ai.http_client import get_http_client
 import structlog
 
 logger = structlog.get_logger()
@@ -74,6 +76,69 @@ class AnthropicClient(AiClient):
             ValueError: APIキーが設定されていない場合
             httpx.HTTPStatusError: API呼び出しでエラーが発生した場合
         """
+        payload, headers = self._build_request(system_prompt, messages, options)
+
+        try:
+            client = get_http_client()
+            response = await client.post(
+                self.api_base_url,
+                json=payload,
+                headers=headers,
+                timeout=60.0  # タイムアウトを60秒に延長
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            # Anthropic APIのレスポンス形式: content[0].text
+            if "content" in data and len(data["content"]) > 0:
+                answer = data["content"][0]["text"]
+                usage = data.get("usage", {})
+                logger.info(
+                    "Anthropic API response received",
+                    model=self.model,
+                    response_length=len(answer),
+                    usage=usage
+                )
+
+                # 最後のレスポンスメタデータを保存（ログ記録用）
+                self._last_response = AiResponse(
+                    content=answer,
+                    tokens_input=usage.get("input_tokens"),
+                    tokens_output=usage.get("output_tokens"),
+                    model=self.model
+                )
+
+                return answer
+            else:
+                logger.error("Unexpected Anthropic API response format", response=data)
+                raise ValueError("Unexpected response format from Anthropic API")
+
+        except httpx.HTTPStatusError as e:
+            self._raise_http_error(e)
+
+        except httpx.TimeoutException as e:
+            logger.error("Anthropic API timeout", model=self.model)
+            raise ValueError(
+                "Anthropic API request timed out. "
+                "The AI service may be experiencing high load."
+            ) from e
+
+        except Exception as e:
+            logger.error("Anthropic API error", error=str(e), model=self.model)
+            raise
+
+    def _build_request(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict] = None
+    ) -> Tuple[Dict, Dict[str, str]]:
+        """
+        APIリクエストのペイロードとヘッダーを構築
+
+        Raises:
+            ValueError: APIキーが設定されていない場合
+        """
         if not self.api_key:
             raise ValueError(
                 "ANTHROPIC_API_KEY is not set. "
@@ -120,73 +185,99 @@ class AnthropicClient(AiClient):
             message_count=len(messages)
         )
 
+        return payload, headers
+
+    def _raise_http_error(self, e: httpx.HTTPStatusError) -> NoReturn:
+        """HTTPエラーを分かりやすいメッセージの例外に変換して送出"""
+        error_detail = ""
+        try:
+            error_body = e.response.json()
+            error_detail = error_body.get("error", {}).get("message", str(e))
+        except Exception:
+            error_detail = str(e)
+
+        logger.error(
+            "Anthropic API HTTP error",
+            status_code=e.response.status_code,
+            error=error_detail,
+            model=self.model
+        )
+
+        # エラーメッセージをより詳細に
+        if e.response.status_code == 401:
+            raise ValueError(
+                "Anthropic API authentication failed. "
+                "Please check ANTHROPIC_API_KEY is correctly set."
+            ) from e
+        elif e.response.status_code == 429:
+            raise ValueError(
+                "Anthropic API rate limit exceeded. "
+                "Please try again later."
+            ) from e
+        elif e.response.status_code == 400:
+            raise ValueError(
+                f"Anthropic API bad request: {error_detail}"
+            ) from e
+        else:
+            raise e
+
+    async def stream_reply(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Anthropic (Claude) APIのストリーミングで応答を生成
+
+        Server-Sent Events の content_block_delta からテキスト差分を順に返す。
+        ストリーム終了後、トークン使用量は get_last_response_metadata() で取得できる。
+
+        Yields:
+            応答テキストの差分
+        """
+        payload, headers = self._build_request(system_prompt, messages, options)
+        payload["stream"] = True
+
+        chunks: List[str] = []
+        tokens_input: Optional[int] = None
+        tokens_output: Optional[int] = None
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_base_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=60.0  # タイムアウトを60秒に延長
-                )
+            client = get_http_client()
+            async with client.stream(
+                "POST",
+                self.api_base_url,
+                json=payload,
+                headers=headers,
+                timeout=60.0
+            ) as response:
+                if response.is_error:
+                    await response.aread()
                 response.raise_for_status()
-                data = response.json()
-
-                # Anthropic APIのレスポンス形式: content[0].text
-                if "content" in data and len(data["content"]) > 0:
-                    answer = data["content"][0]["text"]
-                    usage = data.get("usage", {})
-                    logger.info(
-                        "Anthropic API response received",
-                        model=self.model,
-                        response_length=len(answer),
-                        usage=usage
-                    )
-
-                    # 最後のレスポンスメタデータを保存（ログ記録用）
-                    self._last_response = AiResponse(
-                        content=answer,
-                        tokens_input=usage.get("input_tokens"),
-                        tokens_output=usage.get("output_tokens"),
-                        model=self.model
-                    )
-
-                    return answer
-                else:
-                    logger.error("Unexpected Anthropic API response format", response=data)
-                    raise ValueError("Unexpected response format from Anthropic API")
 
-        except httpx.HTTPStatusError as e:
-            error_detail = ""
-            try:
-                error_body = e.response.json()
-                error_detail = error_body.get("error", {}).get("message", str(e))
-            except Exception:
-                error_detail = str(e)
-
-            logger.error(
-                "Anthropic API HTTP error",
-                status_code=e.response.status_code,
-                error=error_detail,
-                model=self.model
-            )
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    event_type = event.get("type")
+                    if event_type == "content_block_delta":
+                        text = event.get("delta", {}).get("text")
+                        if text:
+                            chunks.append(text)
+                            yield text
+                    elif event_type == "message_start":
+                        usage = event.get("message", {}).get("usage", {})
+                        tokens_input = usage.get("input_tokens")
+                    elif event_type == "message_delta":
+                        tokens_output = event.get("usage", {}).get("output_tokens", tokens_output)
+                    elif event_type == "error":
+                        message = event.get("error", {}).get("message", "unknown error")
+                        logger.error("Anthropic API stream error", error=message, model=self.model)
+                        raise ValueError(f"Anthropic API stream error: {message}")
 
-            # エラーメッセージをより詳細に
-            if e.response.status_code == 401:
-                raise ValueError(
-                    "Anthropic API authentication failed. "
-                    "Please check ANTHROPIC_API_KEY is correctly set."
-                ) from e
-            elif e.response.status_code == 429:
-                raise ValueError(
-                    "Anthropic API rate limit exceeded. "
-                    "Please try again later."
-                ) from e
-            elif e.response.status_code == 400:
-                raise ValueError(
-                    f"Anthropic API bad request: {error_detail}"
-                ) from e
-            else:
-                raise
+        except httpx.HTTPStatusError as e:
+            self._raise_http_error(e)
 
         except httpx.TimeoutException as e:
             logger.error("Anthropic API timeout", model=self.model)
@@ -195,9 +286,20 @@ class AnthropicClient(AiClient):
                 "The AI service may be experiencing high load."
             ) from e
 
-        except Exception as e:
-            logger.error("Anthropic API error", error=str(e), model=self.model)
-            raise
+        answer = "".join(chunks)
+        logger.info(
+            "Anthropic API stream completed",
+            model=self.model,
+            response_length=len(answer),
+            tokens_input=tokens_input,
+            tokens_output=tokens_output
+        )
+        self._last_response = AiResponse(
+            content=answer,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            model=self.model
+        )
 
     def get_last_response_metadata(self) -> Optional[AiResponse]:
         """
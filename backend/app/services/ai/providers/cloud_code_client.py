@@ -4,9 +4,9 @@ Cloud Code API Client 実装
 将来的にCloud Code APIを使用する場合の実装
 """
 from typing import List, Dict, Optional
-import httpx
 from app.core.config import settings
 from app.services.ai.client import AiClient
+from app.services.ai.http_client import get_http_client
 import structlog
 
 logger = structlog.get_logger()
@@ -63,16 +63,16 @@ class CloudCodeAiClient(AiClient):
             headers["Authorization"] = f"Bearer {self.api_key}"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_base_url}/chat/completions",
-                    json=payload,
-                    headers=headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
+            client = get_http_client()
+            response = await client.post(
+                f"{self.api_base_url}/chat/completions",
+                json=payload,
+                headers=headers,
+                timeout=30.0
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
         except Exception as e:
             logger.error("Cloud Code API error", error=str(e))
             raise
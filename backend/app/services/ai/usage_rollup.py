@@ -0,0 +1,153 @@
+"""
+AI利用ログの日次ロールアップ
+
+ai_usage_logs は呼び出しごとに1行増え続けるため、ダッシュボードでは
+日次集計テーブル（ai_usage_daily）を参照する。
+
+更新方法:
+- 集計済みの最新日の前日以降を ai_usage_logs から再集計し、UPSERTで上書きする
+  （日付をまたいだ直後に書き込まれたログも取りこぼさない）
+- 集計テーブルが空の場合は全期間を集計する（初回のバックフィル）
+- アプリ起動中はバックグラウンドで AI_USAGE_ROLLUP_INTERVAL_SECONDS ごとに実行する
+  （リクエスト処理中には実行しない。DBへの書き込みとロック待ちでイベントループを塞がないため）
+
+読み取り時は、前日までを ai_usage_daily から、当日分を ai_usage_logs から直接集計して
+結合する（ai_usage_daily_source）。当日分は件数が少なく、再集計を待たずに反映される。
+AI_USAGE_ROLLUP_INTERVAL_SECONDS=0（定期実行しない）の場合は集計テーブルが更新されないため、
+全期間を ai_usage_logs から直接集計する。
+"""
+import asyncio
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import Integer, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select, func
+from app.core.config import settings
+from app.core.database import engine
+from app.models.ai_usage_log import AiUsageLog, AiUsageDaily
+import structlog
+
+logger = structlog.get_logger()
+
+_last_refreshed_at = 0.0
+_refresh_lock = threading.Lock()
+
+
+def refresh_ai_usage_daily(session: Session) -> None:
+    """ai_usage_daily を ai_usage_logs から再集計（呼び出し側でコミットすること）"""
+    latest_day = session.exec(select(func.max(AiUsageDaily.day))).one()
+
+    day = func.date(AiUsageLog.created_at)
+    source = select(
+        AiUsageLog.tenant_id,
+        day,
+        AiUsageLog.tier,
+        AiUsageLog.purpose,
+        func.count(AiUsageLog.id),
+        func.coalesce(func.sum(AiUsageLog.tokens_input), 0),
+        func.coalesce(func.sum(AiUsageLog.tokens_output), 0),
+        func.count(AiUsageLog.id).filter(AiUsageLog.error.is_not(None)),
+    ).group_by(AiUsageLog.tenant_id, day, AiUsageLog.tier, AiUsageLog.purpose)
+    if latest_day:
+        since = datetime.combine(latest_day - timedelta(days=1), datetime.min.time())
+        source = source.where(AiUsageLog.created_at >= since)
+
+    stmt = pg_insert(AiUsageDaily).from_select(
+        ["tenant_id", "day", "tier", "purpose",
+         "call_count", "tokens_input", "tokens_output", "error_count"],
+        source,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "day", "tier", "purpose"],
+        set_={
+            "call_count": stmt.excluded.call_count,
+            "tokens_input": stmt.excluded.tokens_input,
+            "tokens_output": stmt.excluded.tokens_output,
+            "error_count": stmt.excluded.error_count,
+        },
+    )
+    session.execute(stmt)
+
+
+def refresh_ai_usage_daily_if_stale() -> None:
+    """
+    前回の再集計から一定時間が経過していれば ai_usage_daily を更新
+
+    ブロッキング処理のため、イベントループ上では呼び出さないこと（定期実行はスレッドで実行する）。
+    独自のセッションでコミットし、失敗した場合はログに記録して既存の集計値をそのまま使う。
+    """
+    global _last_refreshed_at
+
+    interval = settings.AI_USAGE_ROLLUP_INTERVAL_SECONDS
+    if interval <= 0:
+        return
+    # 別のスレッドが再集計中なら待たずに戻る（同じ集計を重ねて実行しない）
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        if time.monotonic() - _last_refreshed_at < interval:
+            return
+        with Session(engine) as session:
+            refresh_ai_usage_daily(session)
+            session.commit()
+        _last_refreshed_at = time.monotonic()
+    except Exception as e:
+        logger.error("Failed to refresh ai_usage_daily", error=str(e))
+    finally:
+        _refresh_lock.release()
+
+
+async def run_ai_usage_rollup_loop() -> None:
+    """ai_usage_daily を一定間隔で再集計し続ける（アプリ起動時にタスクとして開始）"""
+    interval = settings.AI_USAGE_ROLLUP_INTERVAL_SECONDS
+    if interval <= 0:
+        return
+    while True:
+        await asyncio.to_thread(refresh_ai_usage_daily_if_stale)
+        await asyncio.sleep(interval)
+
+
+def ai_usage_daily_source(tenant_id: int, start_day: date):
+    """
+    テナントの日次利用集計（start_day 以降）を返すサブクエリ
+
+    カラム: day, tier, purpose, call_count, tokens_input, tokens_output, error_count
+    前日までは ai_usage_daily、当日分は ai_usage_logs を集計して UNION ALL する。
+    日次集計を定期実行しない設定の場合は、全期間を ai_usage_logs から集計する。
+    """
+    today = datetime.utcnow().date()
+    rollup_enabled = settings.AI_USAGE_ROLLUP_INTERVAL_SECONDS > 0
+    live_since = max(today, start_day) if rollup_enabled else start_day
+
+    rolled_up = select(
+        AiUsageDaily.day,
+        AiUsageDaily.tier,
+        AiUsageDaily.purpose,
+        AiUsageDaily.call_count,
+        AiUsageDaily.tokens_input,
+        AiUsageDaily.tokens_output,
+        AiUsageDaily.error_count,
+    ).where(
+        AiUsageDaily.tenant_id == tenant_id,
+        AiUsageDaily.day >= start_day,
+        AiUsageDaily.day < today,
+    )
+
+    day = func.date(AiUsageLog.created_at)
+    live = select(
+        day.label("day"),
+        AiUsageLog.tier,
+        AiUsageLog.purpose,
+        func.count(AiUsageLog.id).cast(Integer).label("call_count"),
+        func.coalesce(func.sum(AiUsageLog.tokens_input), 0).cast(Integer).label("tokens_input"),
+        func.coalesce(func.sum(AiUsageLog.tokens_output), 0).cast(Integer).label("tokens_output"),
+        func.count(AiUsageLog.id).filter(AiUsageLog.error.is_not(None)).cast(Integer).label("error_count"),
+    ).where(
+        AiUsageLog.tenant_id == tenant_id,
+        AiUsageLog.created_at >= datetime.combine(live_since, datetime.min.time()),
+    ).group_by(day, AiUsageLog.tier, AiUsageLog.purpose)
+
+    if not rollup_enabled:
+        return live.subquery("ai_usage")
+    return union_all(rolled_up, live).subquery("ai_usage")
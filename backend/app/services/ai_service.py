@@ -365,35 +365,48 @@ class AIService:
         Returns:
             サジェスト質問のリスト
         """
-        suggestions_map = {
-            "coating": [
-                "コーティングの受注率を上げるには？",
-                "洗車からコーティングへのアップセル方法は？",
-                "納車時の説明で気をつけることは？",
-            ],
-            "mnet": [
-                "来店から成約までの流れを改善するには？",
-                "在庫回転率を上げるには？",
-                "お客様との信頼関係を築くには？",
-            ],
-            "gas": [
-                "給油客を洗車・コーティングに誘導するには？",
-                "ピーク時間帯の効率的な動き方は？",
-                "固定客を増やすには？",
-            ],
-            "cafe": [
-                "客単価を上げるには？",
-                "忙しい時間帯の回転率を上げるには？",
-                "お客様に喜ばれる接客のコツは？",
-            ],
-            "head": [
-                "部署横断で売上を上げるには？",
-                "スタッフのモチベーションを上げるには？",
-                "KPIを達成するための施策は？",
-            ],
-        }
-        
-        return suggestions_map.get(department_code, [
-            "今日の接客のコツは？",
-            "売上を上げるための工夫は？",
-        ])
+        return get_department_suggestions(department_code)
+
+
+# 部署ごとの質問サジェスト（呼び出しのたびに組み立てないようモジュールで保持）
+_SUGGESTIONS_BY_DEPARTMENT: Dict[str, List[str]] = {
+    "coating": [
+        "コーティングの受注率を上げるには？",
+        "洗車からコーティングへのアップセル方法は？",
+        "納車時の説明で気をつけることは？",
+    ],
+    "mnet": [
+        "来店から成約までの流れを改善するには？",
+        "在庫回転率を上げるには？",
+        "お客様との信頼関係を築くには？",
+    ],
+    "gas": [
+        "給油客を洗車・コーティングに誘導するには？",
+        "ピーク時間帯の効率的な動き方は？",
+        "固定客を増やすには？",
+    ],
+    "cafe": [
+        "客単価を上げるには？",
+        "忙しい時間帯の回転率を上げるには？",
+        "お客様に喜ばれる接客のコツは？",
+    ],
+    "head": [
+        "部署横断で売上を上げるには？",
+        "スタッフのモチベーションを上げるには？",
+        "KPIを達成するための施策は？",
+    ],
+}
+
+_DEFAULT_SUGGESTIONS: List[str] = [
+    "今日の接客のコツは？",
+    "売上を上げるための工夫は？",
+]
+
+
+def get_department_suggestions(department_code: str) -> List[str]:
+    """
+    部署に応じた質問サジェストを取得
+
+    AIクライアントを使わないため、AIServiceを生成せずに呼び出せる。
+    """
+    return list(_SUGGESTIONS_BY_DEPARTMENT.get(department_code, _DEFAULT_SUGGESTIONS))
@@ -6,7 +6,7 @@ AIサービス（v2: 抽象化レイヤー対応）
 
 SaaS対応: テナント設定からAIプロンプトを動的に取得
 """
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Optional, List, Dict, Tuple
 from pathlib import Path
 from sqlmodel import Session, select
 from app.core.config import settings
@@ -27,6 +27,9 @@ DEFAULT_SYSTEM_PROMPT_TEMPLATE = """あなたは{company_name}の社内アドバ
 
 回答は日本語で、です・ます調でお願いします。"""
 
+# システムプロンプトファイルの内容（サービスはリクエストごとに生成されるため、プロセス単位で保持）
+_system_prompt_file_cache: Dict[Path, str] = {}
+
 
 class AIServiceV2:
     """AI相談サービス - DX参謀AI（v2: 抽象化レイヤー対応、マルチテナント対応）"""
@@ -63,7 +66,6 @@ class AIServiceV2:
         self._model = getattr(self.ai_client, "model", "unknown")
 
         self.system_prompt_path = Path(__file__).parent / "ai" / "system_prompts" / "mikamo_assistant_ja.md"
-        self._system_prompt_cache: Optional[str] = None
         self.tenant_settings = tenant_settings
 
     @property
@@ -102,14 +104,16 @@ class AIServiceV2:
         Returns:
             システムプロンプト文字列
         """
-        if self._system_prompt_cache:
-            return self._system_prompt_cache
+        cached = _system_prompt_file_cache.get(self.system_prompt_path)
+        if cached:
+            return cached
 
         try:
             if self.system_prompt_path.exists():
                 with open(self.system_prompt_path, "r", encoding="utf-8") as f:
-                    self._system_prompt_cache = f.read()
-                return self._system_prompt_cache
+                    prompt = f.read()
+                _system_prompt_file_cache[self.system_prompt_path] = prompt
+                return prompt
             else:
                 logger.warning(f"System prompt file not found: {self.system_prompt_path}")
                 return None  # テナント設定にフォールバック
@@ -222,7 +226,7 @@ class AIServiceV2:
         
         return "\n".join(context_parts)
     
-    async def generate_answer(
+    def build_prompt(
         self,
         session: Session,
         question: str,
@@ -232,59 +236,48 @@ class AIServiceV2:
         summary: Dict,
         today_log: Optional[DailyLog] = None,
         knowledge_context: Optional[str] = None
-    ) -> str:
+    ) -> Tuple[str, List[Dict[str, str]]]:
         """
-        AI回答を生成（抽象化レイヤー経由、マルチテナント対応）
-
-        Args:
-            session: データベースセッション
-            question: ユーザーの質問
-            user: ユーザー情報
-            department: 部署情報
-            recent_logs: 直近のDailyLogリスト
-            summary: サマリーデータ
-            today_log: 今日のDailyLog（あれば）
-            knowledge_context: ナレッジベースからの関連情報（あれば）
+        システムプロンプトとメッセージを構築（テナント設定の取得にDBアクセスを含む）
 
         Returns:
-            AI回答
+            (システムプロンプト, メッセージリスト)
         """
-        try:
-            # テナント設定を取得（SaaS対応）
-            tenant_settings = None
-            company_name = "DXポータル"  # フォールバック
-            if user.tenant_id:
-                tenant_settings = self._get_tenant_settings(session, user.tenant_id)
-                # テナントの表示名を取得
-                tenant = session.get(Tenant, user.tenant_id)
-                if tenant:
-                    company_name = tenant.display_name
-
-            logger.debug(
-                "Building AI prompt",
-                tenant_id=user.tenant_id,
-                has_tenant_settings=tenant_settings is not None,
-                company_name=company_name
-            )
+        # テナント設定を取得（SaaS対応）
+        tenant_settings = None
+        company_name = "DXポータル"  # フォールバック
+        if user.tenant_id:
+            tenant_settings = self._get_tenant_settings(session, user.tenant_id)
+            # テナントの表示名を取得
+            tenant = session.get(Tenant, user.tenant_id)
+            if tenant:
+                company_name = tenant.display_name
+
+        logger.debug(
+            "Building AI prompt",
+            tenant_id=user.tenant_id,
+            has_tenant_settings=tenant_settings is not None,
+            company_name=company_name
+        )
 
-            # System Promptを構築（テナント設定を反映）
-            system_prompt = self._build_system_prompt_with_context(
-                department.code,
-                user.role,
-                department.name,
-                tenant_settings=tenant_settings,
-                company_name=company_name
-            )
-            
-            # コンテキストを構築
-            context = self._build_context_from_logs(recent_logs, summary, today_log)
-            
-            # ナレッジベースからの情報を追加
-            if knowledge_context:
-                context += f"\n\n【関連ナレッジ情報】\n{knowledge_context}\n"
-            
-            # ユーザーメッセージを構築
-            user_message = f"""
+        # System Promptを構築（テナント設定を反映）
+        system_prompt = self._build_system_prompt_with_context(
+            department.code,
+            user.role,
+            department.name,
+            tenant_settings=tenant_settings,
+            company_name=company_name
+        )
+        
+        # コンテキストを構築
+        context = self._build_context_from_logs(recent_logs, summary, today_log)
+        
+        # ナレッジベースからの情報を追加
+        if knowledge_context:
+            context += f"\n\n【関連ナレッジ情報】\n{knowledge_context}\n"
+        
+        # ユーザーメッセージを構築
+        user_message = f"""
 {context}
 
 【質問】
@@ -315,12 +308,92 @@ class AIServiceV2:
 }}
 ```
 """
-            
+
+        messages = [
+            {"role": "user", "content": user_message}
+        ]
+        return system_prompt, messages
+
+    async def generate_answer(
+        self,
+        session: Session,
+        question: str,
+        user: User,
+        department: Department,
+        recent_logs: List[DailyLog],
+        summary: Dict,
+        today_log: Optional[DailyLog] = None,
+        knowledge_context: Optional[str] = None
+    ) -> str:
+        """
+        AI回答を生成（抽象化レイヤー経由、マルチテナント対応）
+
+        Args:
+            session: データベースセッション
+            question: ユーザーの質問
+            user: ユーザー情報
+            department: 部署情報
+            recent_logs: 直近のDailyLogリスト
+            summary: サマリーデータ
+            today_log: 今日のDailyLog（あれば）
+            knowledge_context: ナレッジベースからの関連情報（あれば）
+
+        Returns:
+            AI回答
+        """
+        prompt = self.prepare_prompt(
+            session, question, user, department,
+            recent_logs, summary, today_log, knowledge_context
+        )
+        if prompt is None:
+            # エラー時もフォールバックで応答
+            return self.fallback_response(question, department.code)
+
+        system_prompt, messages = prompt
+        return await self.generate_answer_from_prompt(system_prompt, messages, department.code)
+
+    def prepare_prompt(
+        self,
+        session: Session,
+        question: str,
+        user: User,
+        department: Department,
+        recent_logs: List[DailyLog],
+        summary: Dict,
+        today_log: Optional[DailyLog] = None,
+        knowledge_context: Optional[str] = None
+    ) -> Optional[Tuple[str, List[Dict[str, str]]]]:
+        """
+        build_prompt() を実行し、失敗時はエラーをログに記録して None を返す
+        （呼び出し側は fallback_response() で応答する）
+
+        同期DBアクセスを含むため、イベントループ上からはスレッドプールで呼ぶこと。
+        """
+        try:
+            return self.build_prompt(
+                session, question, user, department,
+                recent_logs, summary, today_log, knowledge_context
+            )
+        except Exception as e:
+            logger.error("AI service error", error=str(e), exc_info=True)
+            return None
+
+    async def generate_answer_from_prompt(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        department_code: str
+    ) -> str:
+        """
+        build_prompt() で構築したプロンプトから回答を生成
+
+        エラー時はフォールバック応答を返す。
+
+        Returns:
+            AI回答
+        """
+        try:
             # AI Clientを使用して応答を生成
-            messages = [
-                {"role": "user", "content": user_message}
-            ]
-            
             answer = await self.ai_client.generate_reply(
                 system_prompt=system_prompt,
                 messages=messages,
@@ -330,15 +403,47 @@ class AIServiceV2:
                 }
             )
             
-            logger.info("AI answer generated", question_length=len(question), answer_length=len(answer))
+            logger.info("AI answer generated", answer_length=len(answer))
             return answer
             
         except Exception as e:
             logger.error("AI service error", error=str(e), exc_info=True)
             # エラー時もフォールバックで応答
-            return self._fallback_response(question, department.code)
+            return self.fallback_response("", department_code)
+
+    async def stream_answer(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        department_code: str
+    ) -> AsyncIterator[str]:
+        """
+        build_prompt() で構築したプロンプトから回答をストリーミング生成
+
+        まだ何も返していない段階でエラーになった場合はフォールバック応答を返す。
+
+        Yields:
+            応答テキストの差分
+        """
+        started = False
+        try:
+            async for delta in self.ai_client.stream_reply(
+                system_prompt=system_prompt,
+                messages=messages,
+                options={
+                    "temperature": 0.7,
+                    "max_tokens": 2000
+                }
+            ):
+                started = True
+                yield delta
+        except Exception as e:
+            logger.error("AI service error", error=str(e), exc_info=True)
+            if started:
+                raise
+            yield self.fallback_response("", department_code)
     
-    def _fallback_response(
+    def fallback_response(
         self,
         question: str,
         department_code: str
@@ -165,7 +165,6 @@ def update_business_unit_health(
         session.add(health)
     
     session.commit()
-    session.refresh(health)
     
     logger.info(
         "BusinessUnitHealth updated",
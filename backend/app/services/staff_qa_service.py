@@ -6,7 +6,7 @@
 
 SaaS対応: テナント設定からAIプロンプトを動的に取得
 """
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from sqlmodel import Session, select
 from app.core.config import settings
 from app.models.user import User
@@ -205,6 +205,94 @@ class StaffQAService:
         
         return "\n".join(context_parts)
     
+    def build_staff_prompt(
+        self,
+        session: Session,
+        user: User,
+        business_unit: Optional[BusinessUnit],
+        user_question: str,
+        conversation_id: Optional[int] = None
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        スタッフQA用のシステムプロンプトとメッセージを構築（DBアクセスを含む）
+
+        Returns:
+            (システムプロンプト, メッセージリスト)
+        """
+        business_unit_id = business_unit.id if business_unit else None
+        business_unit_name = business_unit.name if business_unit else "全社"
+
+        # テナント設定を取得（SaaS対応: プロンプトをテナントごとにカスタマイズ）
+        tenant_settings = None
+        company_name = "DXポータル"  # フォールバック
+        if user.tenant_id:
+            tenant_settings = self._get_tenant_settings(session, user.tenant_id)
+            # テナントの表示名を取得
+            tenant = session.get(Tenant, user.tenant_id)
+            if tenant:
+                company_name = tenant.display_name
+
+        # システムプロンプトを構築（テナント設定を反映）
+        system_prompt = self._build_staff_system_prompt(
+            business_unit_name=business_unit_name,
+            tenant_settings=tenant_settings,
+            company_name=company_name
+        )
+
+        logger.debug(
+            "Building staff QA prompt",
+            tenant_id=user.tenant_id,
+            has_tenant_settings=tenant_settings is not None,
+            company_name=company_name
+        )
+
+        # コンテキストを構築（必要最小限）
+        context = self._build_context(
+            session,
+            business_unit_id,
+            conversation_id,
+            user_question
+        )
+
+        # ユーザーメッセージを構築
+        user_message_content = f"""{context}
+
+【質問】
+{user_question}
+
+上記の情報を元に、簡潔で分かりやすい回答をしてください。"""
+
+        messages = [
+            {"role": "user", "content": user_message_content}
+        ]
+        return system_prompt, messages
+
+    def _translate_error(self, e: Exception, user_id: Optional[int]) -> ValueError:
+        """AI呼び出しの例外を「エラーコード:メッセージ」形式の ValueError に変換"""
+        if isinstance(e, ValueError):
+            error_msg = str(e)
+            logger.error("Staff QA configuration error", error=error_msg, user_id=user_id)
+
+            # 設定エラーの場合は具体的なメッセージを返す
+            if "ANTHROPIC_API_KEY" in error_msg:
+                return ValueError(
+                    "ai_not_configured:AIサービスの設定が完了していません。"
+                    "管理者に ANTHROPIC_API_KEY の設定を依頼してください。"
+                )
+            elif "model not configured" in error_msg.lower():
+                return ValueError(
+                    "ai_not_configured:AIモデルの設定が完了していません。"
+                    "管理者に ANTHROPIC_MODEL_* の設定を依頼してください。"
+                )
+            return e
+
+        logger.error("Staff QA service error", error=str(e), exc_info=True)
+        # エラー時はフォールバック応答
+        return ValueError(
+            "ai_error:AIサービスで問題が発生しました。"
+            "しばらくしてから再度お試しください。"
+        )
+
     async def answer_staff_question(
         self,
         session: Session,
@@ -216,6 +304,9 @@ class StaffQAService:
         """
         スタッフQA用の回答を生成
 
+        プロンプト構築に同期DBアクセスを含むため、イベントループ上から呼ぶ場合は
+        prepare_staff_prompt() をスレッドプールで実行してから generate_staff_answer() を使うこと。
+
         Args:
             session: データベースセッション
             user: ユーザー情報
@@ -226,55 +317,54 @@ class StaffQAService:
         Returns:
             AIからの応答テキスト
         """
-        try:
-            business_unit_id = business_unit.id if business_unit else None
-            business_unit_name = business_unit.name if business_unit else "全社"
-
-            # テナント設定を取得（SaaS対応: プロンプトをテナントごとにカスタマイズ）
-            tenant_settings = None
-            company_name = "DXポータル"  # フォールバック
-            if user.tenant_id:
-                tenant_settings = self._get_tenant_settings(session, user.tenant_id)
-                # テナントの表示名を取得
-                tenant = session.get(Tenant, user.tenant_id)
-                if tenant:
-                    company_name = tenant.display_name
-
-            # システムプロンプトを構築（テナント設定を反映）
-            system_prompt = self._build_staff_system_prompt(
-                business_unit_name=business_unit_name,
-                tenant_settings=tenant_settings,
-                company_name=company_name
-            )
+        system_prompt, messages = self.prepare_staff_prompt(
+            session, user, business_unit, user_question, conversation_id
+        )
+        return await self.generate_staff_answer(
+            system_prompt,
+            messages,
+            user_id=user.id,
+            business_unit_id=business_unit.id if business_unit else None,
+        )
+
+    def prepare_staff_prompt(
+        self,
+        session: Session,
+        user: User,
+        business_unit: Optional[BusinessUnit],
+        user_question: str,
+        conversation_id: Optional[int] = None
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        build_staff_prompt() を実行し、失敗時は「エラーコード:メッセージ」形式の ValueError を送出
 
-            logger.debug(
-                "Building staff QA prompt",
-                tenant_id=user.tenant_id,
-                has_tenant_settings=tenant_settings is not None,
-                company_name=company_name
-            )
-            
-            # コンテキストを構築（必要最小限）
-            context = self._build_context(
-                session,
-                business_unit_id,
-                conversation_id,
-                user_question
+        同期DBアクセスを含むため、イベントループ上からはスレッドプールで呼ぶこと。
+        """
+        try:
+            return self.build_staff_prompt(
+                session, user, business_unit, user_question, conversation_id
             )
-            
-            # ユーザーメッセージを構築
-            user_message_content = f"""{context}
+        except Exception as e:
+            error = self._translate_error(e, user.id)
+            if error is e:
+                raise
+            raise error from e
 
-【質問】
-{user_question}
+    async def generate_staff_answer(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        user_id: Optional[int] = None,
+        business_unit_id: Optional[int] = None
+    ) -> str:
+        """
+        build_staff_prompt() で構築したプロンプトから回答を生成
 
-上記の情報を元に、簡潔で分かりやすい回答をしてください。"""
-            
+        Returns:
+            AIからの応答テキスト
+        """
+        try:
             # 軽量モデルで応答を生成
-            messages = [
-                {"role": "user", "content": user_message_content}
-            ]
-            
             answer = await self.ai_client.generate_reply(
                 system_prompt=system_prompt,
                 messages=messages,
@@ -283,41 +373,46 @@ class StaffQAService:
                     "max_tokens": self.max_tokens
                 }
             )
-            
+
             logger.info(
                 "Staff QA answer generated",
-                user_id=user.id,
+                user_id=user_id,
                 business_unit_id=business_unit_id,
-                question_length=len(user_question),
                 answer_length=len(answer)
             )
-            
+
             return answer
-            
-        except ValueError as e:
-            error_msg = str(e)
-            logger.error("Staff QA configuration error", error=error_msg, user_id=user.id)
 
-            # 設定エラーの場合は具体的なメッセージを返す
-            if "ANTHROPIC_API_KEY" in error_msg:
-                raise ValueError(
-                    "ai_not_configured:AIサービスの設定が完了していません。"
-                    "管理者に ANTHROPIC_API_KEY の設定を依頼してください。"
-                )
-            elif "model not configured" in error_msg.lower():
-                raise ValueError(
-                    "ai_not_configured:AIモデルの設定が完了していません。"
-                    "管理者に ANTHROPIC_MODEL_* の設定を依頼してください。"
-                )
-            else:
+        except Exception as e:
+            error = self._translate_error(e, user_id)
+            if error is e:
                 raise
+            raise error from e
 
-        except Exception as e:
-            logger.error("Staff QA service error", error=str(e), exc_info=True)
-            # エラー時はフォールバック応答
-            raise ValueError(
-                "ai_error:AIサービスで問題が発生しました。"
-                "しばらくしてから再度お試しください。"
-            )
-    
+    async def stream_staff_answer(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        user_id: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        build_staff_prompt() で構築したプロンプトから回答をストリーミング生成
 
+        Yields:
+            応答テキストの差分
+        """
+        try:
+            async for delta in self.ai_client.stream_reply(
+                system_prompt=system_prompt,
+                messages=messages,
+                options={
+                    "temperature": self.temperature,
+                    "max_tokens": self.max_tokens
+                }
+            ):
+                yield delta
+        except Exception as e:
+            error = self._translate_error(e, user_id)
+            if error is e:
+                raise
+            raise error from e
@@ -0,0 +1,85 @@
+"""
+TTLキャッシュのユニットテスト
+
+テスト対象:
+- app.core.cache.TTLCache: 有効期限・最大件数・削除
+
+実行方法:
+  cd backend
+  pytest tests/test_cache.py -v
+
+注意:
+- 標準ライブラリのみに依存するモジュールのため直接インポートする
+- 環境変数やDB接続は不要
+"""
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    """time.monotonic の代わりに使う手動クロック"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(monkeypatch, **kwargs):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return TTLCache(**kwargs), clock
+
+
+# ============================================================
+# TTLCache のテスト
+# ============================================================
+
+class TestTTLCache:
+    """TTLCache のテスト"""
+
+    def test_get_returns_default_when_missing(self, monkeypatch):
+        """未登録のキーは default を返す"""
+        cache, _ = make_cache(monkeypatch)
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_value_expires_after_ttl(self, monkeypatch):
+        """TTLを過ぎた値は取得できない"""
+        cache, clock = make_cache(monkeypatch, ttl=60)
+        cache.set("key", "value")
+        clock.now += 59
+        assert cache.get("key") == "value"
+        clock.now += 1
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_overrides_default(self, monkeypatch):
+        """set() で指定したTTLが優先される"""
+        cache, clock = make_cache(monkeypatch, ttl=60)
+        cache.set("short", 1, ttl=5)
+        clock.now += 5
+        assert cache.get("short") is None
+
+    def test_evicts_least_recently_used(self, monkeypatch):
+        """最大件数を超えると最も古く使われたものから削除される"""
+        cache, _ = make_cache(monkeypatch, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self, monkeypatch):
+        """pop() と clear() でエントリを削除できる"""
+        cache, _ = make_cache(monkeypatch)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.pop("a")
+        cache.pop("missing")
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
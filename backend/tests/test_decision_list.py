@@ -0,0 +1,64 @@
+"""
+Decision一覧の総件数ヘッダーのテスト
+
+テスト対象:
+- decisions.list_decisions(): X-Total-Count ヘッダー（ページングに関係なく絞り込み後の総件数）
+
+実行方法:
+  cd backend
+  TEST_DATABASE_URL=postgresql://... pytest tests/test_decision_list.py -v
+
+注意:
+- PostgreSQL が必要（TEST_DATABASE_URL 未設定ならスキップ）
+"""
+import orjson
+
+from app.api.decisions import list_decisions
+from app.models.decision import Decision, DecisionStatus
+
+
+def list_page(session, user, **params):
+    """クエリパラメータの既定値を補ってハンドラーを呼び出す"""
+    query = {"business_unit_id": None, "status": None, "skip": 0, "limit": 50}
+    query.update(params)
+    return list_decisions(**query, current_user=user, session=session, _=None)
+
+
+def add_decisions(session, org, statuses: list) -> None:
+    for i, status in enumerate(statuses):
+        session.add(Decision(
+            tenant_id=org["tenant"].id,
+            title=f"decision {i}",
+            content="内容",
+            status=status,
+            created_by_user_id=org["user"].id,
+        ))
+    session.flush()
+
+
+# ============================================================
+# 総件数ヘッダーのテスト
+# ============================================================
+
+class TestListDecisionsTotalCount:
+    """X-Total-Count ヘッダーのテスト"""
+
+    def test_total_count_is_independent_of_page_size(self, db_session, org):
+        add_decisions(db_session, org, [DecisionStatus.PLANNED] * 5)
+
+        response = list_page(db_session, org["user"], limit=2)
+        assert len(orjson.loads(response.body)) == 2
+        assert response.headers["X-Total-Count"] == "5"
+
+    def test_total_count_follows_filters(self, db_session, org):
+        add_decisions(db_session, org, [DecisionStatus.PLANNED] * 3 + [DecisionStatus.DONE] * 2)
+
+        response = list_page(db_session, org["user"], status=DecisionStatus.DONE, limit=1)
+        assert response.headers["X-Total-Count"] == "2"
+
+    def test_total_count_past_the_last_page(self, db_session, org):
+        add_decisions(db_session, org, [DecisionStatus.PLANNED] * 3)
+
+        response = list_page(db_session, org["user"], skip=10)
+        assert orjson.loads(response.body) == []
+        assert response.headers["X-Total-Count"] == "3"
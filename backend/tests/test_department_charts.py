@@ -0,0 +1,138 @@
+"""
+部署別のグラフ・今日のサマリー集計のテスト
+
+テスト対象:
+- daily_log_repository.get_department_daily_logs_for_chart(): 日付ごとの集計
+- daily_log_repository.get_all_departments_today_summary(): 部署ごとの今日の集計
+- 日次ログの作成・更新、API以外からの INSERT の直後に集計へ反映されること
+
+実行方法:
+  cd backend
+  TEST_DATABASE_URL=postgresql://... pytest tests/test_department_charts.py -v
+
+注意:
+- PostgreSQL が必要（TEST_DATABASE_URL 未設定ならスキップ）
+- 期待値は daily_logs を直接 COUNT/SUM した値と比較する
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.api.daily_logs import DailyLogCreate, DailyLogUpdate, create_daily_log, update_daily_log
+from app.models.user import User
+from app.repositories.daily_log_repository import (
+    get_all_departments_today_summary,
+    get_department_daily_logs_for_chart,
+)
+
+
+def make_user(session, org, email: str) -> User:
+    user = User(
+        email=email,
+        hashed_password="x",
+        full_name=email,
+        department_id=org["department"].id,
+        tenant_id=org["tenant"].id,
+    )
+    session.add(user)
+    session.flush()
+    return user
+
+
+def expected_totals(session, department_id: int, log_date: date) -> dict:
+    """daily_logs を直接集計した値"""
+    row = session.execute(
+        text(
+            "SELECT count(*), coalesce(sum(sales_amount), 0), "
+            "coalesce(sum(customers_count), 0), coalesce(sum(transaction_count), 0) "
+            "FROM daily_logs WHERE department_id = :department_id AND date = :log_date"
+        ),
+        {"department_id": department_id, "log_date": log_date},
+    ).one()
+    return {"log_count": row[0], "sales": row[1], "customers": row[2], "transactions": row[3]}
+
+
+def today_summary(session, department_id: int) -> dict:
+    for summary in get_all_departments_today_summary(session):
+        if summary["department_id"] == department_id:
+            return summary
+    return None
+
+
+# ============================================================
+# 集計のテスト
+# ============================================================
+
+class TestDepartmentCharts:
+    """部署別の集計が daily_logs の内容と一致することのテスト"""
+
+    def test_today_summary_follows_create_and_update(self, db_session, org):
+        department_id = org["department"].id
+        today = date.today()
+        staff = make_user(db_session, org, "chart-staff@example.com")
+
+        create_daily_log(
+            DailyLogCreate(date=today, sales_amount=1000, customers_count=10, transaction_count=8),
+            current_user=org["user"],
+            session=db_session,
+        )
+        log = create_daily_log(
+            DailyLogCreate(date=today, sales_amount=500, customers_count=5, transaction_count=4),
+            current_user=staff,
+            session=db_session,
+        )
+        update_daily_log(
+            log.id,
+            DailyLogUpdate(sales_amount=700),
+            current_user=staff,
+            session=db_session,
+        )
+
+        summary = today_summary(db_session, department_id)
+        expected = expected_totals(db_session, department_id, today)
+        assert expected == {"log_count": 2, "sales": 1700, "customers": 15, "transactions": 12}
+        assert {key: summary[key] for key in expected} == expected
+
+    def test_rows_inserted_outside_the_api_are_counted(self, db_session, org):
+        department_id = org["department"].id
+        today = date.today()
+        staff = make_user(db_session, org, "chart-import@example.com")
+
+        # 一括取り込みなど、APIを通らない INSERT
+        db_session.execute(
+            text(
+                "INSERT INTO daily_logs (date, department_id, user_id, sales_amount, "
+                "customers_count, transaction_count, reaction_count, created_at, updated_at) "
+                "VALUES (:log_date, :department_id, :user_id, 300, 3, 2, 0, now(), now())"
+            ),
+            {"log_date": today, "department_id": department_id, "user_id": staff.id},
+        )
+
+        summary = today_summary(db_session, department_id)
+        assert summary["log_count"] == 1
+        assert summary["sales"] == 300
+
+    def test_chart_matches_daily_totals(self, db_session, org):
+        department_id = org["department"].id
+        today = date.today()
+        yesterday = today - timedelta(days=1)
+        staff = make_user(db_session, org, "chart-daily@example.com")
+
+        for user, log_date, sales in [
+            (org["user"], yesterday, 100),
+            (staff, yesterday, 200),
+            (org["user"], today, 400),
+        ]:
+            create_daily_log(
+                DailyLogCreate(date=log_date, sales_amount=sales, customers_count=1, transaction_count=1),
+                current_user=user,
+                session=db_session,
+            )
+
+        chart = get_department_daily_logs_for_chart(db_session, department_id)
+        assert [row["date"] for row in chart] == [str(yesterday), str(today)]
+        for row in chart:
+            expected = expected_totals(db_session, department_id, date.fromisoformat(row["date"]))
+            assert row["sales"] == expected["sales"]
+            assert row["customers"] == expected["customers"]
+            assert row["transactions"] == expected["transactions"]
@@ -0,0 +1,122 @@
+"""
+ナレッジ一覧のページング・検索のテスト
+
+テスト対象:
+- knowledge._encode_cursor() / _decode_cursor(): カーソルの変換
+- knowledge.list_knowledge_items(): キーセットページング、X-Next-Cursor ヘッダー、部分一致検索
+
+実行方法:
+  cd backend
+  pytest tests/test_knowledge_list.py -v
+
+注意:
+- カーソル変換のテストは環境変数やDB接続は不要
+- 一覧のテストは PostgreSQL が必要（TEST_DATABASE_URL 未設定ならスキップ）
+"""
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.api.knowledge import _decode_cursor, _encode_cursor, list_knowledge_items
+from app.models.knowledge_item import KnowledgeItem
+
+
+def list_items(session, user, **params):
+    """クエリパラメータの既定値を補ってハンドラーを呼び出す"""
+    query = {"q": None, "business_unit_id": None, "tag": None, "skip": 0, "limit": 50, "cursor": None}
+    query.update(params)
+    return list_knowledge_items(**query, current_user=user, session=session)
+
+
+def ids_of(response) -> list:
+    return [item["id"] for item in orjson.loads(response.body)]
+
+
+def add_items(session, org, titles: list) -> list:
+    """作成日時が1秒ずつ新しくなるようにアイテムを追加し、IDを返す"""
+    base = datetime(2026, 1, 1, 9, 0, 0)
+    items = []
+    for i, title in enumerate(titles):
+        item = KnowledgeItem(
+            tenant_id=org["tenant"].id,
+            title=title,
+            content="本文",
+            created_by=org["user"].id,
+            created_at=base + timedelta(seconds=i),
+            updated_at=base + timedelta(seconds=i),
+        )
+        session.add(item)
+        items.append(item)
+    session.flush()
+    return [item.id for item in items]
+
+
+# ============================================================
+# カーソル変換のテスト
+# ============================================================
+
+class TestCursor:
+    """カーソルの作成・解析のテスト"""
+
+    def test_round_trip(self):
+        item = KnowledgeItem(id=42, created_at=datetime(2026, 3, 4, 5, 6, 7, 890123))
+        assert _decode_cursor(_encode_cursor(item)) == (datetime(2026, 3, 4, 5, 6, 7, 890123), 42)
+
+    @pytest.mark.parametrize("cursor", ["", "abc", "2026-03-04T05:06:07_x", "not-a-date_42"])
+    def test_malformed_cursor_is_400(self, cursor):
+        with pytest.raises(HTTPException) as exc_info:
+            _decode_cursor(cursor)
+        assert exc_info.value.status_code == 400
+
+
+# ============================================================
+# 一覧のテスト（DB接続が必要）
+# ============================================================
+
+class TestListKnowledgeItems:
+    """list_knowledge_items のテスト"""
+
+    def test_cursor_pages_are_disjoint_and_complete(self, db_session, org):
+        ids = add_items(db_session, org, [f"item {i}" for i in range(7)])
+
+        seen = []
+        cursor = None
+        while True:
+            response = list_items(db_session, org["user"], limit=3, cursor=cursor)
+            page = ids_of(response)
+            seen.extend(page)
+            if len(seen) == 3:
+                # まだ読んでいない最も古いアイテムを編集しても、並び順（作成日時）は変わらない
+                edited = db_session.get(KnowledgeItem, ids[0])
+                edited.updated_at = datetime(2030, 1, 1)
+                db_session.add(edited)
+                db_session.flush()
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert seen == list(reversed(ids))
+
+    def test_next_cursor_header(self, db_session, org):
+        add_items(db_session, org, ["a", "b", "c"])
+
+        full_page = list_items(db_session, org["user"], limit=2)
+        assert "X-Next-Cursor" in full_page.headers
+
+        last_page = list_items(db_session, org["user"], limit=2, cursor=full_page.headers["X-Next-Cursor"])
+        assert len(ids_of(last_page)) == 1
+        assert "X-Next-Cursor" not in last_page.headers
+
+    def test_malformed_cursor_is_400(self, db_session, org):
+        with pytest.raises(HTTPException) as exc_info:
+            list_items(db_session, org["user"], cursor="bad")
+        assert exc_info.value.status_code == 400
+
+    def test_search_treats_wildcards_literally(self, db_session, org):
+        percent_id, plain_id = add_items(db_session, org, ["割引 100%_off", "割引 1000円"])
+
+        assert ids_of(list_items(db_session, org["user"], q="100%_")) == [percent_id]
+        assert ids_of(list_items(db_session, org["user"], q="10_")) == []
+        assert set(ids_of(list_items(db_session, org["user"], q="割引"))) == {percent_id, plain_id}
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { useAuthStore } from '../stores/authStore'
 import { useTenantSettings } from '../stores/tenantStore'
-import api from '../utils/api'
+import api, { postEventStream } from '../utils/api'
 import Layout from '../components/Layout'
 
 interface Conversation {
@@ -34,6 +34,7 @@ const AIChat = () => {
   const { primaryColor, displayName, businessUnitLabel, settings } = useTenantSettings()
   const [message, setMessage] = useState('')
   const [isLoading, setIsLoading] = useState(false)
+  const [streamingReply, setStreamingReply] = useState('')
   const [conversations, setConversations] = useState<Conversation[]>([])
   const [currentConversationId, setCurrentConversationId] = useState<number | null>(null)
   const [messages, setMessages] = useState<Message[]>([])
@@ -110,32 +111,46 @@ const AIChat = () => {
       // スタッフ・マネージャーの場合はスタッフQAモードを使用
       const mode = (user?.role === 'staff' || user?.role === 'manager') ? 'staff_qa' : undefined
       
-      const response = await api.post('/api/ai/chat', {
-        message: message.trim(),
+      const question = message.trim()
+      const sentAt = new Date().toISOString()
+      const baseMessages: Message[] = [
+        ...messages,
+        { id: -Date.now(), role: 'user', content: question, created_at: sentAt }
+      ]
+      setMessages(baseMessages)
+      setMessage('')
+
+      // 応答はSSEで差分ごとに届くので、届いた分から表示する
+      let reply = ''
+      await postEventStream('/api/ai/chat/stream', {
+        message: question,
         conversation_id: currentConversationId,
         business_unit_id: selectedBusinessUnitId,
         mode: mode  // スタッフQAモードを指定
+      }, (event) => {
+        if (event.delta) {
+          reply += event.delta
+          setStreamingReply(reply)
+        } else if (event.done) {
+          setMessages([
+            ...baseMessages,
+            { id: event.message_id, role: 'assistant', content: reply, created_at: new Date().toISOString() }
+          ])
+          // 会話IDを更新
+          if (!currentConversationId) {
+            setCurrentConversationId(event.conversation_id)
+          }
+        } else if (event.error_code) {
+          setError(event.message || '送信に失敗しました')
+        }
       })
-
-      // 会話IDを更新
-      if (!currentConversationId) {
-        setCurrentConversationId(response.data.conversation_id)
-      }
-
-      // メッセージを追加
-      setMessages([
-        ...messages,
-        { id: 0, role: 'user', content: message.trim(), created_at: new Date().toISOString() },
-        { id: response.data.message_id, role: 'assistant', content: response.data.reply, created_at: new Date().toISOString() }
-      ])
-
-      setMessage('')
       
       // 会話一覧を更新
       fetchConversations()
     } catch (error: any) {
       setError(error.response?.data?.detail || '送信に失敗しました')
     } finally {
+      setStreamingReply('')
       setIsLoading(false)
     }
   }
@@ -299,7 +314,14 @@ const AIChat = () => {
                     </div>
                   ))
                 )}
-                {isLoading && (
+                {streamingReply && (
+                  <div className="flex justify-start">
+                    <div className="max-w-[80%] rounded-lg p-4" style={{ backgroundColor: '#f3f4f6', color: '#1f2937' }}>
+                      <div className="whitespace-pre-wrap">{streamingReply}</div>
+                    </div>
+                  </div>
+                )}
+                {isLoading && !streamingReply && (
                   <div className="flex justify-start">
                     <div className="bg-gray-100 rounded-lg p-4">
                       <div className="flex items-center gap-2">
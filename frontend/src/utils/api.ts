@@ -35,5 +35,56 @@ api.interceptors.response.use(
   }
 )
 
+/**
+ * Server-Sent Events を返すエンドポイントにPOSTし、受信したイベントを順に通知する
+ * （axiosはレスポンスのストリーミング読み取りに対応していないためfetchを使用）
+ */
+export const postEventStream = async (
+  path: string,
+  body: unknown,
+  onEvent: (data: any) => void
+): Promise<void> => {
+  const token = localStorage.getItem('access_token')
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'text/event-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify(body),
+  })
+
+  if (!response.ok || !response.body) {
+    if (response.status === 401) {
+      localStorage.removeItem('access_token')
+      window.location.href = '/login'
+    }
+    const data = await response.json().catch(() => null)
+    throw { response: { status: response.status, data } }
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    // イベントは空行区切り
+    let boundary = buffer.indexOf('\n\n')
+    while (boundary !== -1) {
+      const event = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      for (const line of event.split('\n')) {
+        if (line.startsWith('data:')) {
+          onEvent(JSON.parse(line.slice(5)))
+        }
+      }
+      boundary = buffer.indexOf('\n\n')
+    }
+  }
+}
+
 export default api
 
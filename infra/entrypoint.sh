@@ -54,7 +54,15 @@ echo "Starting FastAPI app on port ${PORT} ..."
 
 # uvicorn を起動（PID 1 として exec で実行）
 # Cloud Run のヘルスチェックは PORT 環境変数で指定されたポートで listen する必要がある
+# - イベントループ/HTTPパーサーは uvloop・httptools を明示（未導入時に純Python実装へ落ちないようにする）
+# - keep-alive は Cloud Run / ロードバランサーのアイドルタイムアウトより長くする
+# - ワーカー数は WEB_CONCURRENCY で指定（キャッシュはプロセスごとに独立するため既定は1）
 exec uvicorn app.main:app \
   --host 0.0.0.0 \
-  --port "${PORT}"
+  --port "${PORT}" \
+  --workers "${WEB_CONCURRENCY:-1}" \
+  --loop uvloop \
+  --http httptools \
+  --timeout-keep-alive 75 \
+  --backlog 2048
 